@@ -0,0 +1,82 @@
+"""
+caching.py
+==========
+Small caching helpers shared by the dashboard, the download page and the
+PowerPoint generator:
+  1. fingerprint() — stable content hash of frames, arrays and plain values
+  2. memoize()     — bounded in-process memo keyed by argument fingerprints
+  3. ARTIFACT_DIR  — root of the on-disk caches (fitted models, decks, ...)
+"""
+
+import functools
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+ARTIFACT_DIR = os.environ.get("SALARY_ARTIFACT_DIR", ".artifacts")
+
+
+# ============================================================
+# FINGERPRINTS
+# ============================================================
+def _feed(h, obj):
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        h.update(type(obj).__name__.encode())
+        if isinstance(obj, pd.DataFrame):
+            h.update(repr(list(obj.columns)).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(str(obj.dtype).encode())
+        h.update(repr(obj.shape).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        for k in sorted(obj, key=repr):
+            _feed(h, k)
+            _feed(h, obj[k])
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}{len(obj)}".encode())
+        for item in obj:
+            _feed(h, item)
+    else:
+        h.update(repr(obj).encode())
+
+
+def fingerprint(*objs):
+    """Return a short hex digest identifying the content of ``objs``."""
+    h = hashlib.blake2b(digest_size=16)
+    for obj in objs:
+        _feed(h, obj)
+    return h.hexdigest()
+
+
+# ============================================================
+# IN-PROCESS MEMO
+# ============================================================
+def memoize(maxsize=128):
+    """Memoize a function on the fingerprint of its arguments.
+
+    Unlike functools.lru_cache this accepts DataFrames and arrays, which is
+    what every analysis helper in this project takes.
+    """
+    def decorator(func):
+        cache = OrderedDict()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = fingerprint(args, kwargs)
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+            result = func(*args, **kwargs)
+            cache[key] = result
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+            return result
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
@@ -0,0 +1,67 @@
+"""
+design_matrix.py
+================
+Hybrid regression designs: numeric columns (experience, hours, log company
+size, 0/1 flags) stay in a dense block, categorical dummies (industry,
+education, region, work function, project size) go into a scipy CSR block.
+
+The dummy columns are named and ordered exactly like
+`pd.get_dummies(s, drop_first=True, prefix=...)`, so fitted coefficients
+keep the labels the dashboard has always shown.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def sparse_dummies(values, prefix=None, drop_first=True):
+    """CSR one-hot encoding of ``values`` → (matrix, column names).
+
+    Categories are the sorted non-null values (as in get_dummies); missing
+    values encode as an all-zero row.
+    """
+    cat = pd.Categorical(values)
+    codes = cat.codes.astype(np.int64)
+    categories = list(cat.categories)
+    first = 1 if drop_first else 0
+
+    names = [f"{prefix}_{c}" if prefix else c for c in categories[first:]]
+    rows = np.flatnonzero(codes >= first)
+    matrix = sparse.csr_matrix(
+        (np.ones(rows.size), (rows, codes[rows] - first)),
+        shape=(len(codes), len(names)),
+    )
+    return matrix, names
+
+
+class HybridDesign:
+    """Dense numeric block + sparse dummy block + response, row-aligned.
+
+    ``levels`` optionally maps a dummy prefix to all of its categories
+    (baseline first), so new data can be encoded the same way.
+    """
+
+    def __init__(self, dense, y, blocks=(), levels=None):
+        self.dense = dense.astype(float)
+        self.y = pd.Series(y, index=dense.index).astype(float)
+        mats = [m for m, _ in blocks]
+        self.sparse = sparse.hstack(mats, format="csr") if mats else sparse.csr_matrix((len(dense), 0))
+        self.sparse_names = [name for _, names in blocks for name in names]
+        self.levels = dict(levels or {})
+
+    @property
+    def columns(self):
+        return list(self.dense.columns) + self.sparse_names
+
+    @property
+    def index(self):
+        return self.dense.index
+
+    def __len__(self):
+        return len(self.dense)
+
+    def to_frame(self):
+        """Materialize the dense equivalent of the design (X only)."""
+        dummies = pd.DataFrame(self.sparse.toarray(), index=self.index, columns=self.sparse_names)
+        return pd.concat([self.dense, dummies], axis=1)
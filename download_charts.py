@@ -0,0 +1,405 @@
+"""
+download_charts.py
+==================
+The standalone charts of the Download Center (white background) and their
+bulk export:
+  1. chart_*()       — one chart of a survey frame as image bytes
+  2. CHARTS          — (title, file name, generator) of every chart
+  3. export_charts() — every chart, for the whole survey and/or any number of
+     segments, rendered in parallel and streamed into a zip on disk
+
+Charts are rendered at a quality tier (RENDER_TIERS): a cheap low-DPI
+"preview" for the page, and the 200-dpi "png" or vector "pdf" only for
+downloads and exports.
+
+Export workers write each PNG to a scratch file and the zip copies it in
+chunks, so memory stays bounded by one chart per worker however many charts
+and segments are exported.
+"""
+
+import io
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from model_registry import data_snapshot, fitted_model
+from resampling import process_context
+from salary_models import KEY_IMPACT_SPEC
+from survey_segments import DATA_FILE, segment_label, segment_rows
+
+RENDER_TIERS = {
+    "preview": {"format": "png", "dpi": 72},
+    "png": {"format": "png", "dpi": 200, "bbox_inches": "tight"},
+    "pdf": {"format": "pdf", "bbox_inches": "tight"},
+}
+
+_worker = {}
+
+
+# ============================================================
+# CHART GENERATORS
+# ============================================================
+def _render(fig, tier):
+    buf = io.BytesIO()
+    fig.savefig(buf, facecolor="white", edgecolor="none", **RENDER_TIERS[tier])
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def tier_filename(filename, tier):
+    """``filename`` with the extension of ``tier``'s format."""
+    return f"{os.path.splitext(filename)[0]}.{RENDER_TIERS[tier]['format']}"
+
+
+def chart_salary_histogram(df, tier="png"):
+    salaries = df["SalaryUSD"].dropna()
+    salaries = salaries[salaries.between(5000, 500000)]
+    bucket = 5000
+    bins = np.arange(0, salaries.max() + bucket, bucket)
+
+    fig, ax = plt.subplots(figsize=(12, 5))
+    ax.hist(salaries, bins=bins, color="steelblue", edgecolor="white", alpha=0.85)
+    ax.axvline(salaries.mean(), color="red", linewidth=2, linestyle="--",
+               label=f"Mean: ${salaries.mean():,.0f}")
+    ax.axvline(salaries.median(), color="orange", linewidth=2, linestyle="-.",
+               label=f"Median: ${salaries.median():,.0f}")
+
+    ax.set_xlabel("Salary (USD)")
+    ax.set_ylabel("Count")
+    ax.set_title("Salary Distribution — All Respondents")
+    ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"${x/1000:.0f}K"))
+    ax.legend()
+    ax.grid(axis="y", linestyle="--", alpha=0.4)
+    plt.tight_layout()
+    return _render(fig, tier)
+
+
+def chart_membership(df, tier="png"):
+    data = {
+        "Members": df[df["IsMember"]]["SalaryUSD"].mean(),
+        "Non-Members": df[~df["IsMember"]]["SalaryUSD"].mean(),
+    }
+    fig, ax = plt.subplots(figsize=(7, 4.5))
+    bars = ax.bar(data.keys(), data.values(), color=["#00BCD4", "#FF5722"], width=0.5)
+    for b in bars:
+        ax.text(b.get_x() + b.get_width()/2, b.get_height() + 800,
+                f"${b.get_height():,.0f}", ha="center", fontsize=10)
+    ax.set_ylabel("Avg Salary (USD)")
+    ax.set_title("AACE Membership Effect on Salary")
+    ax.grid(axis="y", linestyle="--", alpha=0.4)
+    ax.set_ylim(0, max(data.values()) * 1.15)
+    plt.tight_layout()
+    return _render(fig, tier)
+
+
+def chart_certification(df, tier="png"):
+    data = {
+        "Certified": df[df["IsCertified"]]["SalaryUSD"].mean(),
+        "Non-Certified": df[~df["IsCertified"]]["SalaryUSD"].mean(),
+    }
+    fig, ax = plt.subplots(figsize=(7, 4.5))
+    bars = ax.bar(data.keys(), data.values(), color=["#4CAF50", "#9E9E9E"], width=0.5)
+    for b in bars:
+        ax.text(b.get_x() + b.get_width()/2, b.get_height() + 800,
+                f"${b.get_height():,.0f}", ha="center", fontsize=10)
+    ax.set_ylabel("Avg Salary (USD)")
+    ax.set_title("AACE Certification Effect on Salary")
+    ax.grid(axis="y", linestyle="--", alpha=0.4)
+    ax.set_ylim(0, max(data.values()) * 1.15)
+    plt.tight_layout()
+    return _render(fig, tier)
+
+
+def chart_gender_gap(df, tier="png"):
+    men = df[~df["IsFemale"]]["SalaryUSD"].dropna()
+    women = df[df["IsFemale"]]["SalaryUSD"].dropna()
+    gap_pct = ((men.mean() - women.mean()) / men.mean()) * 100
+
+    fig, ax = plt.subplots(figsize=(7, 4.5))
+    bars = ax.bar(["Men", "Women"], [men.mean(), women.mean()],
+                  color=["#3A86FF", "#FF006E"], width=0.5)
+    for b in bars:
+        ax.text(b.get_x() + b.get_width()/2, b.get_height() + 800,
+                f"${b.get_height():,.0f}", ha="center", fontsize=10)
+    ax.set_ylabel("Avg Salary (USD)")
+    ax.set_title(f"Gender Pay Gap ({gap_pct:.1f}% lower for women)")
+    ax.grid(axis="y", linestyle="--", alpha=0.4)
+    ax.set_ylim(0, max(men.mean(), women.mean()) * 1.15)
+    plt.tight_layout()
+    return _render(fig, tier)
+
+
+def chart_gender_by_education(df, tier="png"):
+    df_g = df.dropna(subset=["SalaryUSD", "LevelOfEducation"]).copy()
+    df_g["LevelOfEducation"] = df_g["LevelOfEducation"].str.strip().str.lower()
+    df_g["LevelOfEducation"] = df_g["LevelOfEducation"].replace({
+        "undergraduate/bachelor\u2019s degree": "bachelors",
+        "undergraduate/bachelor's degree": "bachelors",
+        "undergraduate or bachelor's degree": "bachelors",
+        "graduate/master\u2019s degree": "masters",
+        "graduate/master's degree": "masters",
+        "graduate/doctoral degree": "doctoral",
+        "graduate - masters degree": "masters",
+        "graduate - doctoral degree": "doctoral",
+        "undergraduate or bachelors degree": "bachelors",
+        "associate degree": "associate",
+        "high school": "high school",
+    })
+
+    edu_order = ["high school", "associate", "bachelors", "masters", "doctoral"]
+    labels = ["High School", "Associate", "Bachelor's", "Master's", "Doctoral"]
+
+    gender_edu = df_g.groupby(["LevelOfEducation", "IsFemale"])["SalaryUSD"].mean().unstack()
+    gender_edu.columns = ["Men", "Women"]
+    gender_edu = gender_edu.reindex([e for e in edu_order if e in gender_edu.index])
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    x = np.arange(len(gender_edu))
+    w = 0.35
+    ax.bar(x - w/2, gender_edu["Men"], w, color="#3A86FF", label="Men")
+    ax.bar(x + w/2, gender_edu["Women"], w, color="#FF006E", label="Women")
+
+    disp = [labels[edu_order.index(e)] if e in edu_order else e.title()
+            for e in gender_edu.index]
+    ax.set_xticks(x)
+    ax.set_xticklabels(disp)
+    ax.set_ylabel("Avg Salary (USD)")
+    ax.set_title("Gender Pay Gap by Education Level")
+    ax.legend()
+    ax.grid(axis="y", linestyle="--", alpha=0.4)
+
+    for i, (m, wv) in enumerate(zip(gender_edu["Men"], gender_edu["Women"])):
+        ax.text(i - 0.175, m + 800, f"${m:,.0f}", ha="center", fontsize=7)
+        ax.text(i + 0.175, wv + 800, f"${wv:,.0f}", ha="center", fontsize=7)
+
+    plt.tight_layout()
+    return _render(fig, tier)
+
+
+def chart_satisfaction(df, tier="png"):
+    df_s = df.dropna(subset=["JobSatisfaction", "SalaryUSD"]).copy()
+    df_s["JobSatisfaction"] = df_s["JobSatisfaction"].str.strip().str.lower()
+    order = ["very dissatisfied", "somewhat dissatisfied",
+             "somewhat satisfied", "very satisfied"]
+    labels = ["Very\nDissatisfied", "Somewhat\nDissatisfied",
+              "Somewhat\nSatisfied", "Very\nSatisfied"]
+
+    dist = df_s["JobSatisfaction"].value_counts(normalize=True) * 100
+    dist = dist.reindex(order).fillna(0)
+
+    fig, ax = plt.subplots(figsize=(8, 4.5))
+    colors_bar = ["#F44336", "#FF9800", "#8BC34A", "#4CAF50"]
+    bars = ax.bar(range(len(dist)), dist.values, color=colors_bar, width=0.6)
+    ax.set_xticks(range(len(dist)))
+    ax.set_xticklabels(labels)
+    for b in bars:
+        ax.text(b.get_x() + b.get_width()/2, b.get_height() + 0.5,
+                f"{b.get_height():.1f}%", ha="center", fontsize=9)
+    ax.set_ylabel("% of Respondents")
+    ax.set_title("Job Satisfaction Distribution")
+    ax.grid(axis="y", linestyle="--", alpha=0.4)
+    plt.tight_layout()
+    return _render(fig, tier)
+
+
+def chart_industry_gap(df, tier="png"):
+    df_ind = df.dropna(subset=["SalaryUSD", "Industry"]).copy()
+    df_ind["Industry"] = df_ind["Industry"].str.strip().str.lower()
+    top = df_ind["Industry"].value_counts().head(6).index
+    df_ind = df_ind[df_ind["Industry"].isin(top)]
+
+    gender_ind = df_ind.groupby(["Industry", "IsFemale"])["SalaryUSD"].mean().unstack()
+    gender_ind.columns = ["Men", "Women"]
+    gender_ind["Gap %"] = ((gender_ind["Men"] - gender_ind["Women"]) / gender_ind["Men"]) * 100
+    gender_ind = gender_ind.sort_values("Gap %", ascending=True)
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    ax.barh(gender_ind.index.str.title(), gender_ind["Gap %"], color="#FF006E", height=0.5)
+    for i, v in enumerate(gender_ind["Gap %"]):
+        ax.text(v + 0.3, i, f"{v:.1f}%", va="center", fontsize=9)
+    ax.set_xlabel("Gender Pay Gap (%)")
+    ax.set_title("Gender Pay Gap by Industry")
+    ax.grid(axis="x", linestyle="--", alpha=0.4)
+    plt.tight_layout()
+    return _render(fig, tier)
+
+
+def chart_consulting(df, tier="png"):
+    df_c = df.dropna(subset=["SalaryUSD", "Consult"]).copy()
+    df_c["IsConsultant"] = df_c["Consult"].astype(str).str.contains("Yes", case=False, na=False)
+    data = {
+        "Consultant": df_c[df_c["IsConsultant"]]["SalaryUSD"].mean(),
+        "Non-Consultant": df_c[~df_c["IsConsultant"]]["SalaryUSD"].mean(),
+    }
+    premium = data["Consultant"] - data["Non-Consultant"]
+
+    fig, ax = plt.subplots(figsize=(7, 4.5))
+    bars = ax.bar(data.keys(), data.values(), color=["#FFC107", "#607D8B"], width=0.5)
+    for b in bars:
+        ax.text(b.get_x() + b.get_width()/2, b.get_height() + 800,
+                f"${b.get_height():,.0f}", ha="center", fontsize=10)
+    ax.set_ylabel("Avg Salary (USD)")
+    ax.set_title(f"Consultant Premium (+${premium:,.0f})")
+    ax.grid(axis="y", linestyle="--", alpha=0.4)
+    ax.set_ylim(0, max(data.values()) * 1.15)
+    plt.tight_layout()
+    return _render(fig, tier)
+
+
+def chart_ols_impact(df, segment=None, tier="png", snapshot=None):
+    # Same stored fit as the deck's regression slide (of the same segment);
+    # ``snapshot`` identifies the file df was loaded from (default: DATA_FILE)
+    if snapshot is None:
+        snapshot = data_snapshot(DATA_FILE)
+    model = fitted_model(KEY_IMPACT_SPEC, df, snapshot, segment)
+
+    coefs = model.params.drop("const")
+    pvals = model.pvalues.drop("const")
+    coef_df = pd.DataFrame({"Coefficient": coefs, "p": pvals})
+    coef_df["AbsImpact"] = coef_df["Coefficient"].abs()
+    coef_df = coef_df.sort_values("AbsImpact", ascending=True)
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    colors = ["#4CAF50" if p < 0.05 else "#9E9E9E" for p in coef_df["p"]]
+    ax.barh(coef_df.index, coef_df["Coefficient"], color=colors, height=0.5)
+    for i, (v, p) in enumerate(zip(coef_df["Coefficient"], coef_df["p"])):
+        label = f"${v:,.0f}" + (" *" if p < 0.05 else "")
+        ax.text(v, i, label, va="center", fontsize=9)
+
+    ax.axvline(0, color="gray", linewidth=0.5, alpha=0.5)
+    ax.set_xlabel("Impact on Salary (USD)")
+    ax.set_title(f"OLS Key Impact Factors (R² = {model.rsquared:.3f})")
+    ax.grid(axis="x", linestyle="--", alpha=0.4)
+    plt.tight_layout()
+    return _render(fig, tier)
+
+
+def chart_year_comparison(df, tier="png"):
+    df_2015 = df[df["SurveyYear"] == 2015]["SalaryUSD"].dropna()
+    df_2023 = df[df["SurveyYear"] == 2023]["SalaryUSD"].dropna()
+
+    fig, ax = plt.subplots(figsize=(8, 4.5))
+    data = {
+        "Mean": [df_2015.mean(), df_2023.mean()],
+        "Median": [df_2015.median(), df_2023.median()],
+    }
+    x = np.arange(2)
+    w = 0.3
+    bars1 = ax.bar(x - w/2, data["Mean"], w, color="#00BCD4", label="Mean")
+    bars2 = ax.bar(x + w/2, data["Median"], w, color="#FFC107", label="Median")
+    ax.set_xticks(x)
+    ax.set_xticklabels(["2015", "2023"])
+    for b in list(bars1) + list(bars2):
+        ax.text(b.get_x() + b.get_width()/2, b.get_height() + 800,
+                f"${b.get_height():,.0f}", ha="center", fontsize=9)
+    ax.set_ylabel("Salary (USD)")
+    ax.set_title("Salary Comparison: 2015 vs 2023")
+    ax.legend()
+    ax.grid(axis="y", linestyle="--", alpha=0.4)
+    plt.tight_layout()
+    return _render(fig, tier)
+
+
+# ============================================================
+# CHART REGISTRY
+# ============================================================
+CHARTS = [
+    ("Salary Distribution — All Respondents", "salary_distribution.png", chart_salary_histogram),
+    ("2015 vs 2023 Comparison", "year_comparison.png", chart_year_comparison),
+    ("AACE Membership Effect", "membership_effect.png", chart_membership),
+    ("AACE Certification Effect", "certification_effect.png", chart_certification),
+    ("Gender Pay Gap — Overall", "gender_gap_overall.png", chart_gender_gap),
+    ("Gender Pay Gap by Education", "gender_gap_education.png", chart_gender_by_education),
+    ("Gender Pay Gap by Industry", "gender_gap_industry.png", chart_industry_gap),
+    ("Job Satisfaction Distribution", "satisfaction_distribution.png", chart_satisfaction),
+    ("Consulting Premium", "consulting_premium.png", chart_consulting),
+    ("OLS Key Impact Factors", "ols_impact_factors.png", chart_ols_impact),
+]
+
+
+# ============================================================
+# BULK EXPORT
+# ============================================================
+def _folder(segment):
+    if not segment:
+        return "all_respondents"
+    return re.sub(r"[^A-Za-z0-9]+", "_", segment_label(segment)).strip("_")
+
+
+def _init_worker(df, snapshot, scratch, tier):
+    _worker["df"] = df
+    _worker["snapshot"] = snapshot
+    _worker["scratch"] = scratch
+    _worker["tier"] = tier
+
+
+def _export_one(index, segment):
+    # One chart of one segment, written to a scratch file (never held by the parent)
+    func, tier = CHARTS[index][2], _worker["tier"]
+    df = segment_rows(_worker["df"], segment) if segment else _worker["df"]
+    if func is chart_ols_impact:
+        image = func(df, segment, tier=tier, snapshot=_worker["snapshot"])
+    else:
+        image = func(df, tier=tier)
+    fd, path = tempfile.mkstemp(dir=_worker["scratch"])
+    with os.fdopen(fd, "wb") as f:
+        f.write(image)
+    return path
+
+
+def export_charts(df, snapshot, path, segment_list=(None,), tier="png", workers=None, progress=None):
+    """Write every chart of every segment in ``segment_list`` into a zip at ``path``.
+
+    ``snapshot`` is the data_snapshot of the file ``df`` was loaded from (it
+    keys the stored regression fits). ``None`` in ``segment_list`` stands for
+    all respondents; charts of a segment go into its own folder of the zip,
+    rendered at ``tier``.
+    ``progress(done, total, label)`` is called after each chart. Returns ``path``.
+    """
+    tasks = [(i, segment) for segment in segment_list for i in range(len(CHARTS))]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(tasks)))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        with tempfile.TemporaryDirectory(dir=directory) as scratch, \
+                zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_STORED) as zf:
+            def _add(done, task, image_path):
+                i, segment = task
+                name = f"{_folder(segment)}/{tier_filename(CHARTS[i][1], tier)}"
+                # PNG and PDF are already compressed; copy in chunks instead of reading whole
+                with open(image_path, "rb") as src, zf.open(name, "w") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(image_path)
+                if progress is not None:
+                    progress(done, len(tasks), name)
+
+            if workers == 1:
+                _init_worker(df, snapshot, scratch, tier)
+                for done, task in enumerate(tasks, 1):
+                    _add(done, task, _export_one(*task))
+            else:
+                with ProcessPoolExecutor(max_workers=workers, mp_context=process_context(),
+                                         initializer=_init_worker,
+                                         initargs=(df, snapshot, scratch, tier)) as pool:
+                    futures = {pool.submit(_export_one, *task): task for task in tasks}
+                    for done, future in enumerate(as_completed(futures), 1):
+                        _add(done, futures[future], future.result())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return path
@@ -1,7 +1,13 @@
 """
 generate_ppt.py - Premium PowerPoint generator for Salary Analysis
+
+The deck is built section by section (SLIDES). Chart images are cached on disk
+under a fingerprint of everything they are drawn from (the data columns they
+use, text/labels, CHART_STYLE), and the headline numbers per content of their
+columns, so a rebuild only re-renders the charts whose inputs changed.
 """
-import io, numpy as np, pandas as pd, matplotlib
+import io, os, tempfile, numpy as np, pandas as pd, matplotlib
+from types import SimpleNamespace
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 from scipy import stats as sp_stats
@@ -11,6 +17,12 @@ from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
 
+from caching import ARTIFACT_DIR, fingerprint
+from model_registry import data_snapshot, fitted_model, load_model, save_model
+from resampling import gap_bootstrap, permutation_test
+from salary_models import KEY_IMPACT_SPEC
+from survey_segments import DATA_FILE, add_segment_columns, segment_label, segment_rows
+
 # COLOR PALETTE - Modern blue/teal
 WHITE = RGBColor(0xFF, 0xFF, 0xFF)
 BLACK = RGBColor(0x1A, 0x1A, 0x2E)
@@ -25,7 +37,10 @@ ACCENT_RED = RGBColor(0xE7, 0x4C, 0x3C)
 ACCENT_PURPLE = RGBColor(0x9B, 0x59, 0xB6)
 GRAY = RGBColor(0x7F, 0x8C, 0x8D)
 SLIDE_W, SLIDE_H = Inches(13.333), Inches(7.5)
-DATA_FILE = "salary_usd_cleaned.csv"
+SLIDE_COUNT = 20
+CHART_DIR = os.path.join(ARTIFACT_DIR, "charts")
+CHART_STYLE = 1  # bump when _fig_img, _style_ax or a chart's drawing code changes
+DECK_VALUES_VERSION = 1
 
 def _bg(slide, color=WHITE):
     fill = slide.background.fill; fill.solid(); fill.fore_color.rgb = color
@@ -71,6 +86,12 @@ def _kpi_card(slide, l, t, w, h, label, value, accent_color):
     _box(slide, l + Inches(0.2), t + Inches(0.75), w - Inches(0.4), Inches(0.4),
          label, sz=11, color=GRAY, align=PP_ALIGN.CENTER)
 
+def _fmt_p(p):
+    return "p < 0.001" if p < 0.001 else f"p = {p:.3f}"
+
+def _signif_word(p, alpha=0.05):
+    return "significant" if p < alpha else "non-significant"
+
 def _numbered_circle(slide, l, t, num, color):
     c = _circle(slide, l, t, Inches(0.55), color)
     c.text_frame.paragraphs[0].text = str(num)
@@ -85,6 +106,20 @@ def _fig_img(fig, bg="white"):
     fig.savefig(buf, format="png", dpi=200, bbox_inches="tight", facecolor=bg, edgecolor="none")
     plt.close(fig); buf.seek(0); return buf
 
+def _chart(render, *inputs):
+    # PNG of render(*inputs), from the chart cache when none of the inputs changed
+    path = os.path.join(CHART_DIR, f"{render.__name__}-{fingerprint(CHART_STYLE, inputs)}.png")
+    try:
+        with open(path, "rb") as f: return io.BytesIO(f.read())
+    except OSError:
+        pass
+    img = render(*inputs)
+    os.makedirs(CHART_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=CHART_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f: f.write(img.getvalue())
+    os.replace(tmp, path)
+    return img
+
 def _section_slide(prs, title, subtitle=""):
     s = prs.slides.add_slide(prs.slide_layouts[6])
     _bg(s, DARK_BLUE)
@@ -101,8 +136,8 @@ def _section_slide(prs, title, subtitle=""):
     return s
 
 # CHART FUNCTIONS
-def _load():
-    df = pd.read_csv(DATA_FILE)
+def _load(data_file=None):
+    df = pd.read_csv(data_file or DATA_FILE)
     df["YearsOfExperience"] = pd.to_numeric(df["YearsOfExperience"], errors="coerce")
     df["SalaryUSD"] = pd.to_numeric(df["Salary_USD"], errors="coerce")
     df["Age"] = pd.to_numeric(df["Age"], errors="coerce")
@@ -110,7 +145,7 @@ def _load():
     df["IsMember"] = df["Member"].astype(str).str.contains("Yes", case=False, na=False)
     df["IsFemale"] = df["Sex"].astype(str).str.contains("Female", case=False, na=False)
     df["EmploymentStatus"] = df["EmploymentStatus"].astype(str).str.strip().str.lower().replace({"employed full-time": "full-time"})
-    return df
+    return add_segment_columns(df)
 
 def _style_ax(ax, title="", xlabel="", ylabel=""):
     ax.set_facecolor("#F7F9FC"); ax.set_title(title, fontsize=13, fontweight="bold", color="#1A1A2E", pad=12)
@@ -212,16 +247,8 @@ def _chart_consulting(df):
     _style_ax(ax, f"Consultant Premium (+${v1-v2:,.0f})", "", "Avg Salary (USD)"); ax.set_ylim(0, max(v1,v2)*1.18); plt.tight_layout()
     return _fig_img(fig)
 
-def _chart_ols(df):
-    import statsmodels.api as sm
-    dr = df.dropna(subset=["SalaryUSD","YearsOfExperience","Age"]).copy()
-    dr["IsManager"] = dr["ManagerialDuties"].astype(str).str.contains("Yes", case=False, na=False).astype(int)
-    dr["IsConsult"] = dr["Consult"].astype(str).str.contains("Yes", case=False, na=False).astype(int)
-    for c in ["IsCertified","IsMember","IsFemale"]: dr[c] = dr[c].astype(int)
-    X = dr[["YearsOfExperience","IsCertified","IsMember","IsFemale","IsManager","IsConsult"]].astype(float)
-    X = sm.add_constant(X); y = dr["SalaryUSD"].astype(float)
-    model = sm.OLS(y, X).fit()
-    coefs = model.params.drop("const"); pvals = model.pvalues.drop("const")
+def _chart_ols(params, pvalues, rsquared):
+    coefs = params.drop("const"); pvals = pvalues.drop("const")
     cd = pd.DataFrame({"Coefficient":coefs,"p":pvals})
     cd["Abs"] = cd["Coefficient"].abs(); cd = cd.sort_values("Abs", ascending=True)
     fig, ax = plt.subplots(figsize=(9, 4.5)); fig.patch.set_facecolor("white")
@@ -230,8 +257,8 @@ def _chart_ols(df):
     for i,(v,p) in enumerate(zip(cd["Coefficient"],cd["p"])):
         ax.text(v, i, f"${v:,.0f}"+(" *" if p<0.05 else ""), va="center", fontsize=9, fontweight="bold")
     ax.axvline(0, color="#ddd", lw=1)
-    _style_ax(ax, f"OLS Key Impact Factors (R\u00b2 = {model.rsquared:.3f})", "Impact on Salary (USD)", ""); plt.tight_layout()
-    return _fig_img(fig), model
+    _style_ax(ax, f"OLS Key Impact Factors (R\u00b2 = {rsquared:.3f})", "Impact on Salary (USD)", ""); plt.tight_layout()
+    return _fig_img(fig)
 
 def _chart_year(df):
     d15, d23 = df[df["SurveyYear"]==2015]["SalaryUSD"].dropna(), df[df["SurveyYear"]==2023]["SalaryUSD"].dropna()
@@ -246,18 +273,37 @@ def _chart_year(df):
     return _fig_img(fig)
 
 # ==================== MAIN BUILDER ====================
-def generate_presentation(data_file=DATA_FILE):
-    global DATA_FILE; DATA_FILE = data_file
-    df = _load()
-    n_total, n_15, n_23 = len(df), len(df[df["SurveyYear"]==2015]), len(df[df["SurveyYear"]==2023])
+def _deck_values(df, workers=None):
+    # Headline numbers of the text slides, stored per content of the columns they use
+    cols = ["SalaryUSD", "SurveyYear", "IsFemale", "IsCertified", "IsMember", "Consult"]
+    key = f"deck-values-{fingerprint(DECK_VALUES_VERSION, df[cols])}"
+    values = load_model(key)
+    if values is not None: return values
     men_m, women_m = df[~df["IsFemale"]]["SalaryUSD"].dropna().mean(), df[df["IsFemale"]]["SalaryUSD"].dropna().mean()
-    gap_pct = ((men_m - women_m)/men_m)*100
-    cert_prem = df[df["IsCertified"]]["SalaryUSD"].mean() - df[~df["IsCertified"]]["SalaryUSD"].mean()
-    mem_prem = df[df["IsMember"]]["SalaryUSD"].mean() - df[~df["IsMember"]]["SalaryUSD"].mean()
-
-    prs = Presentation(); prs.slide_width = SLIDE_W; prs.slide_height = SLIDE_H
-
-    # === SLIDE 1: TITLE ===
+    # Bootstrap CI of the gap (reported as "women earn X% less", hence the sign flip)
+    gap_ci = gap_bootstrap(df[["SalaryUSD", "IsFemale", "SurveyYear"]], workers=workers).iloc[0]
+    # Permutation-test p-values (labels shuffled within survey year)
+    dp = df[["SalaryUSD", "SurveyYear", "IsMember", "IsCertified"]].assign(
+        IsCon=df["Consult"].astype(str).str.contains("Yes", case=False, na=False).where(df["Consult"].notna()))
+    mem_p, cert_p, con_p = (permutation_test(dp[["SalaryUSD", "SurveyYear", c]], c, workers=workers)["p-value"].iloc[-1]
+                            for c in ["IsMember", "IsCertified", "IsCon"])
+    values = {
+        "n_total": len(df), "n_15": len(df[df["SurveyYear"]==2015]), "n_23": len(df[df["SurveyYear"]==2023]),
+        "gap_pct": ((men_m - women_m)/men_m)*100,
+        "gap_lo": -gap_ci["95% CI High (BCa)"], "gap_hi": -gap_ci["95% CI Low (BCa)"],
+        "cert_prem": df[df["IsCertified"]]["SalaryUSD"].mean() - df[~df["IsCertified"]]["SalaryUSD"].mean(),
+        "mem_prem": df[df["IsMember"]]["SalaryUSD"].mean() - df[~df["IsMember"]]["SalaryUSD"].mean(),
+        "mem_p": mem_p, "cert_p": cert_p, "con_p": con_p,
+    }
+    save_model(key, values)
+    return values
+
+# ==================== SLIDES ====================
+# Each builder appends its slide(s) from the survey rows and the headline values;
+# charts come through _chart(), so only slides whose inputs changed are re-rendered.
+
+# === SLIDE 1: TITLE ===
+def _slide_title(prs, df, v):
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _bar(s, Inches(0), Inches(0), SLIDE_W, Inches(0.08), BLUE)
     _circle(s, Inches(9.5), Inches(-1.5), Inches(5), SOFT_BG)
@@ -270,9 +316,13 @@ def generate_presentation(data_file=DATA_FILE):
          "Comparative Study  |  2015 vs 2023\nDrivers of Salary, Gender Equity & Professional Development", sz=18, color=GRAY)
     _box(s, Inches(1.2), Inches(5.5), Inches(6), Inches(0.5),
          "Prepared for Management Review  |  February 2026", sz=13, color=BLUE)
+    if v.segment:
+        _box(s, Inches(1.2), Inches(4.6), Inches(8), Inches(0.6),
+             f"Segment: {segment_label(v.segment)}", sz=18, bold=True, color=TEAL)
     _footer(s)
 
-    # === SLIDE 2: AGENDA ===
+# === SLIDE 2: AGENDA ===
+def _slide_agenda(prs, df, v):
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _bar(s, Inches(0), Inches(0), SLIDE_W, Inches(0.08), BLUE)
     _box(s, Inches(0.8), Inches(0.5), Inches(5), Inches(0.8), "AGENDA", sz=32, bold=True, color=DARK_BLUE)
@@ -288,27 +338,29 @@ def generate_presentation(data_file=DATA_FILE):
         _box(s, x_off + Inches(0.75), y_off + Inches(0.05), Inches(3), Inches(0.5), item, sz=15, bold=True, color=BLACK)
     _footer(s)
 
-    # === SLIDE 3: EXECUTIVE SUMMARY ===
+# === SLIDE 3: EXECUTIVE SUMMARY ===
+def _slide_summary(prs, df, v):
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _bar(s, Inches(0), Inches(0), SLIDE_W, Inches(0.08), BLUE)
     _box(s, Inches(0.8), Inches(0.5), Inches(8), Inches(0.8), "Executive Summary", sz=32, bold=True, color=DARK_BLUE)
     _bar(s, Inches(0.8), Inches(1.2), Inches(1), Inches(0.05), TEAL)
     # KPI cards row
-    _kpi_card(s, Inches(0.6), Inches(1.6), Inches(2.8), Inches(1.2), "Total Professionals", f"{n_total:,}", BLUE)
-    _kpi_card(s, Inches(3.7), Inches(1.6), Inches(2.8), Inches(1.2), "Gender Pay Gap", f"{gap_pct:.1f}%", ACCENT_RED)
-    _kpi_card(s, Inches(6.8), Inches(1.6), Inches(2.8), Inches(1.2), "Certification Premium", f"${cert_prem:,.0f}", ACCENT_GREEN)
-    _kpi_card(s, Inches(9.9), Inches(1.6), Inches(2.8), Inches(1.2), "Membership Premium", f"${mem_prem:,.0f}", TEAL)
+    _kpi_card(s, Inches(0.6), Inches(1.6), Inches(2.8), Inches(1.2), "Total Professionals", f"{v.n_total:,}", BLUE)
+    _kpi_card(s, Inches(3.7), Inches(1.6), Inches(2.8), Inches(1.2), f"Gender Pay Gap (95% CI {v.gap_lo:.1f}–{v.gap_hi:.1f}%)", f"{v.gap_pct:.1f}%", ACCENT_RED)
+    _kpi_card(s, Inches(6.8), Inches(1.6), Inches(2.8), Inches(1.2), "Certification Premium", f"${v.cert_prem:,.0f}", ACCENT_GREEN)
+    _kpi_card(s, Inches(9.9), Inches(1.6), Inches(2.8), Inches(1.2), "Membership Premium", f"${v.mem_prem:,.0f}", TEAL)
     _bullets(s, Inches(1), Inches(3.3), Inches(11), Inches(3.5), [
-        f"Dataset spans {n_total:,} professionals across 2015 (n={n_15:,}) and 2023 (n={n_23:,})",
-        f"Women earn {gap_pct:.1f}% less than men on average across all segments",
-        f"AACE Certification adds ~${cert_prem:,.0f} and Membership adds ~${mem_prem:,.0f} to salary",
-        "Consulting professionals command a significant salary premium",
+        f"Dataset spans {v.n_total:,} professionals across 2015 (n={v.n_15:,}) and 2023 (n={v.n_23:,})",
+        f"Women earn {v.gap_pct:.1f}% less than men on average across all segments (95% CI {v.gap_lo:.1f}–{v.gap_hi:.1f}%)",
+        f"AACE Certification adds ~${v.cert_prem:,.0f} and Membership adds ~${v.mem_prem:,.0f} to salary",
+        f"Consulting professionals command a {_signif_word(v.con_p)} salary premium ({_fmt_p(v.con_p)})",
         "OLS regression confirms experience & consulting status as top salary drivers",
         "Enhanced model with additional controls strengthens causal claims",
     ], sz=15, color=BLACK)
     _footer(s)
 
-    # === SLIDE 4: DATA OVERVIEW ===
+# === SLIDE 4: DATA OVERVIEW ===
+def _slide_overview(prs, df, v):
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _bar(s, Inches(0), Inches(0), SLIDE_W, Inches(0.08), BLUE)
     _box(s, Inches(0.8), Inches(0.5), Inches(8), Inches(0.8), "Data Overview", sz=32, bold=True, color=DARK_BLUE)
@@ -316,24 +368,25 @@ def generate_presentation(data_file=DATA_FILE):
     _bullets(s, Inches(1), Inches(1.6), Inches(5.5), Inches(5), [
         "Source: AACE International Salary Surveys",
         "Survey Years: 2015 and 2023",
-        f"Total Records: {n_total:,}",
-        f"  2015 Survey: {n_15:,} respondents",
-        f"  2023 Survey: {n_23:,} respondents",
+        f"Total Records: {v.n_total:,}",
+        f"  2015 Survey: {v.n_15:,} respondents",
+        f"  2023 Survey: {v.n_23:,} respondents",
         "All salaries converted to USD using FX rates",
         "Outlier filtering: $10K-$500K with 3-sigma limits",
         "Variables: experience, education, gender,",
         "  certification, membership, industry, consulting",
     ], sz=14)
-    img = _chart_year(df)
+    img = _chart(_chart_year, df[["SurveyYear", "SalaryUSD"]])
     s.shapes.add_picture(img, Inches(6.8), Inches(1.5), Inches(5.8))
     _footer(s)
 
-    # === SLIDE 5-6: SALARY DISTRIBUTION ===
+# === SLIDE 5-6: SALARY DISTRIBUTION ===
+def _slides_distribution(prs, df, v):
     _section_slide(prs, "Salary Distribution", "Understanding the shape and spread of compensation")
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _bar(s, Inches(0), Inches(0), SLIDE_W, Inches(0.08), BLUE)
     _box(s, Inches(0.8), Inches(0.3), Inches(8), Inches(0.8), "Overall Salary Distribution", sz=28, bold=True, color=DARK_BLUE)
-    img = _chart_hist(df)
+    img = _chart(_chart_hist, df[["SalaryUSD"]])
     s.shapes.add_picture(img, Inches(0.3), Inches(1.1), Inches(8.8))
     sal = df["SalaryUSD"].dropna(); sal = sal[sal.between(5000,500000)]
     skew = sp_stats.skew(sal); kurt = sp_stats.kurtosis(sal)
@@ -348,50 +401,54 @@ def generate_presentation(data_file=DATA_FILE):
     ], sz=12, color=GRAY)
     _footer(s)
 
-    # === SLIDE 7-8: MEMBERSHIP & CERTIFICATION ===
+# === SLIDE 7-8: MEMBERSHIP & CERTIFICATION ===
+def _slides_credentials(prs, df, v):
     _section_slide(prs, "Membership & Certification", "Do professional credentials translate to higher pay?")
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _bar(s, Inches(0), Inches(0), SLIDE_W, Inches(0.08), BLUE)
     _box(s, Inches(0.8), Inches(0.3), Inches(8), Inches(0.8), "Credential Effects on Salary", sz=28, bold=True, color=DARK_BLUE)
-    img_m = _chart_bars(df, "IsMember", "Members", "Non-Members", "AACE Membership Effect", "#0072CE", "#E0E0E0")
-    img_c = _chart_bars(df, "IsCertified", "Certified", "Non-Certified", "AACE Certification Effect", "#2ECC71", "#E0E0E0")
+    img_m = _chart(_chart_bars, df[["IsMember", "SalaryUSD"]], "IsMember", "Members", "Non-Members", "AACE Membership Effect", "#0072CE", "#E0E0E0")
+    img_c = _chart(_chart_bars, df[["IsCertified", "SalaryUSD"]], "IsCertified", "Certified", "Non-Certified", "AACE Certification Effect", "#2ECC71", "#E0E0E0")
     s.shapes.add_picture(img_m, Inches(0.3), Inches(1.2), Inches(6))
     s.shapes.add_picture(img_c, Inches(6.5), Inches(1.2), Inches(6))
     _rect(s, Inches(0.5), Inches(5.5), Inches(12.3), Inches(1.2), SOFT_BG)
     _bullets(s, Inches(0.8), Inches(5.65), Inches(11.5), Inches(1), [
-        f"AACE members earn ~${mem_prem:,.0f} more  |  Certified professionals earn ~${cert_prem:,.0f} more",
-        "Both effects are statistically significant in the multivariate model (p < 0.05)",
+        f"AACE members earn ~${v.mem_prem:,.0f} more  |  Certified professionals earn ~${v.cert_prem:,.0f} more",
+        f"Permutation tests (within survey year): membership {_fmt_p(v.mem_p)}, certification {_fmt_p(v.cert_p)}",
     ], sz=14, color=DARK_BLUE)
     _footer(s)
 
-    # === SLIDE 9-10: GENDER ===
+# === SLIDE 9-10: GENDER ===
+def _slides_gender(prs, df, v):
     _section_slide(prs, "Gender Pay Gap Analysis", "Examining equity across education, role, and industry")
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _bar(s, Inches(0), Inches(0), SLIDE_W, Inches(0.08), BLUE)
     _box(s, Inches(0.8), Inches(0.3), Inches(11), Inches(0.7), "Gender Pay Gap - Overall & by Education", sz=28, bold=True, color=DARK_BLUE)
-    img_g = _chart_gender(df); img_e = _chart_gender_edu(df)
+    img_g = _chart(_chart_gender, df[["IsFemale", "SalaryUSD"]]); img_e = _chart(_chart_gender_edu, df[["LevelOfEducation", "IsFemale", "SalaryUSD"]])
     s.shapes.add_picture(img_g, Inches(0.2), Inches(1.1), Inches(5))
     s.shapes.add_picture(img_e, Inches(5.3), Inches(1.1), Inches(7.8))
     _rect(s, Inches(0.5), Inches(5.5), Inches(12.3), Inches(1.2), RGBColor(0xFD, 0xED, 0xED))
     _bullets(s, Inches(0.8), Inches(5.65), Inches(11.5), Inches(1), [
-        f"Women earn {gap_pct:.1f}% less than men on average across all education levels",
+        f"Women earn {v.gap_pct:.1f}% less than men on average across all education levels",
         "The gap persists even at graduate/doctoral levels, suggesting systemic factors beyond education",
     ], sz=14, color=ACCENT_RED)
     _footer(s)
 
-    # === SLIDE 11: INDUSTRY ===
+# === SLIDE 11: INDUSTRY ===
+def _slide_industry(prs, df, v):
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _bar(s, Inches(0), Inches(0), SLIDE_W, Inches(0.08), BLUE)
     _box(s, Inches(0.8), Inches(0.3), Inches(11), Inches(0.7), "Gender Pay Gap by Industry", sz=28, bold=True, color=DARK_BLUE)
-    img_i = _chart_industry(df)
+    img_i = _chart(_chart_industry, df[["Industry", "IsFemale", "SalaryUSD"]])
     s.shapes.add_picture(img_i, Inches(1.5), Inches(1.1), Inches(10))
     _footer(s)
 
-    # === SLIDE 12: SATISFACTION ===
+# === SLIDE 12: SATISFACTION ===
+def _slide_satisfaction(prs, df, v):
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _bar(s, Inches(0), Inches(0), SLIDE_W, Inches(0.08), BLUE)
     _box(s, Inches(0.8), Inches(0.3), Inches(8), Inches(0.7), "Job Satisfaction", sz=28, bold=True, color=DARK_BLUE)
-    img_sat = _chart_satisfaction(df)
+    img_sat = _chart(_chart_satisfaction, df[["JobSatisfaction", "SalaryUSD"]])
     s.shapes.add_picture(img_sat, Inches(0.3), Inches(1.1), Inches(7.5))
     ds = df.dropna(subset=["JobSatisfaction","SalaryUSD"]).copy()
     ds["JobSatisfaction"] = ds["JobSatisfaction"].str.strip().str.lower()
@@ -407,16 +464,17 @@ def generate_presentation(data_file=DATA_FILE):
     ], sz=13, color=GRAY)
     _footer(s)
 
-    # === SLIDE 13: CONSULTING ===
+# === SLIDE 13: CONSULTING ===
+def _slide_consulting(prs, df, v):
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _bar(s, Inches(0), Inches(0), SLIDE_W, Inches(0.08), BLUE)
     _box(s, Inches(0.8), Inches(0.3), Inches(8), Inches(0.7), "Consulting Premium", sz=28, bold=True, color=DARK_BLUE)
-    img_con = _chart_consulting(df)
+    img_con = _chart(_chart_consulting, df[["Consult", "SalaryUSD"]])
     s.shapes.add_picture(img_con, Inches(0.3), Inches(1.2), Inches(5.8))
     _rect(s, Inches(6.5), Inches(1.3), Inches(6.2), Inches(4.8), SOFT_BG)
     _bullets(s, Inches(6.8), Inches(1.6), Inches(5.5), Inches(4.5), [
-        "Consultants command a significant",
-        "salary premium over non-consultants", "",
+        f"Consultants command a {_signif_word(v.con_p)}",
+        f"salary premium over non-consultants ({_fmt_p(v.con_p)})", "",
         "Key question: Is the certification",
         "premium real, or driven by consultant",
         "overrepresentation?", "",
@@ -425,12 +483,14 @@ def generate_presentation(data_file=DATA_FILE):
     ], sz=14, color=DARK_BLUE)
     _footer(s)
 
-    # === SLIDE 14-15: OLS ===
+# === SLIDE 14-15: OLS ===
+def _slides_regression(prs, df, v):
     _section_slide(prs, "Regression Analysis", "Identifying true salary drivers through multivariate modeling")
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _bar(s, Inches(0), Inches(0), SLIDE_W, Inches(0.08), BLUE)
     _box(s, Inches(0.8), Inches(0.3), Inches(8), Inches(0.7), "OLS Model - Key Impact Factors", sz=28, bold=True, color=DARK_BLUE)
-    img_ols, mdl = _chart_ols(df)
+    mdl = fitted_model(KEY_IMPACT_SPEC, df, v.snapshot, v.segment)
+    img_ols = _chart(_chart_ols, mdl.params, mdl.pvalues, mdl.rsquared)
     s.shapes.add_picture(img_ols, Inches(0.2), Inches(1.1), Inches(8.5))
     _rect(s, Inches(8.9), Inches(1.3), Inches(4), Inches(4.5), SOFT_BG)
     _box(s, Inches(9.1), Inches(1.5), Inches(3.6), Inches(0.5), "Model Summary", sz=16, bold=True, color=DARK_BLUE)
@@ -443,7 +503,8 @@ def generate_presentation(data_file=DATA_FILE):
     ], sz=12, color=GRAY)
     _footer(s)
 
-    # === SLIDE 16: MODEL EVOLUTION ===
+# === SLIDE 16: MODEL EVOLUTION ===
+def _slide_evolution(prs, df, v):
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _bar(s, Inches(0), Inches(0), SLIDE_W, Inches(0.08), BLUE)
     _box(s, Inches(0.8), Inches(0.3), Inches(11), Inches(0.7), "Model Evolution", sz=28, bold=True, color=DARK_BLUE)
@@ -466,7 +527,8 @@ def generate_presentation(data_file=DATA_FILE):
     _bar(s, Inches(8.7), Inches(3.6), Inches(0.3), Inches(0.06), TEAL)
     _footer(s)
 
-    # === SLIDE 17: HYPOTHESIS ===
+# === SLIDE 17: HYPOTHESIS ===
+def _slide_hypothesis(prs, df, v):
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _bar(s, Inches(0), Inches(0), SLIDE_W, Inches(0.08), BLUE)
     _box(s, Inches(0.8), Inches(0.3), Inches(11), Inches(0.7), "Consultant Hypothesis Test", sz=28, bold=True, color=DARK_BLUE)
@@ -483,7 +545,8 @@ def generate_presentation(data_file=DATA_FILE):
         _bullets(s, x + Inches(0.3), Inches(2.5), Inches(3.3), Inches(3), desc.split("\n"), sz=13, color=GRAY)
     _footer(s)
 
-    # === SLIDE 18: KEY TAKEAWAYS ===
+# === SLIDE 18: KEY TAKEAWAYS ===
+def _slide_takeaways(prs, df, v):
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _bar(s, Inches(0), Inches(0), SLIDE_W, Inches(0.08), BLUE)
     _box(s, Inches(0.8), Inches(0.5), Inches(8), Inches(0.8), "Key Takeaways", sz=32, bold=True, color=DARK_BLUE)
@@ -491,8 +554,8 @@ def generate_presentation(data_file=DATA_FILE):
     takeaways = [
         ("Experience is the #1 salary driver across all models", BLUE),
         ("Consultants command a premium even after controlling for confounders", ACCENT_ORANGE),
-        (f"Certification (+${cert_prem:,.0f}) and Membership (+${mem_prem:,.0f}) both boost salary", ACCENT_GREEN),
-        (f"Gender pay gap ({gap_pct:.1f}%) persists across education & industries", ACCENT_RED),
+        (f"Certification (+${v.cert_prem:,.0f}) and Membership (+${v.mem_prem:,.0f}) both boost salary", ACCENT_GREEN),
+        (f"Gender pay gap ({v.gap_pct:.1f}%) persists across education & industries", ACCENT_RED),
         ("Salary distributions are right-skewed by high earners", ACCENT_PURPLE),
         ("Enhanced Model provides the strongest causal evidence", TEAL),
     ]
@@ -502,7 +565,8 @@ def generate_presentation(data_file=DATA_FILE):
         _box(s, Inches(1.8), y + Inches(0.05), Inches(10), Inches(0.5), txt, sz=16, color=BLACK)
     _footer(s)
 
-    # === SLIDE 19: RECOMMENDATIONS ===
+# === SLIDE 19: RECOMMENDATIONS ===
+def _slide_recommendations(prs, df, v):
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _bar(s, Inches(0), Inches(0), SLIDE_W, Inches(0.08), BLUE)
     _box(s, Inches(0.8), Inches(0.3), Inches(8), Inches(0.8), "Recommendations", sz=32, bold=True, color=DARK_BLUE)
@@ -523,7 +587,8 @@ def generate_presentation(data_file=DATA_FILE):
         _bullets(s, x + Inches(0.4), y + Inches(0.9), Inches(5), Inches(1.5), desc.split("\n"), sz=14, color=GRAY)
     _footer(s)
 
-    # === SLIDE 20: THANK YOU ===
+# === SLIDE 20: THANK YOU ===
+def _slide_thanks(prs, df, v):
     s = prs.slides.add_slide(prs.slide_layouts[6]); _bg(s, WHITE)
     _circle(s, Inches(-1), Inches(-1), Inches(4), RGBColor(0xE3, 0xF2, 0xFD))
     _circle(s, Inches(10), Inches(4.5), Inches(5), RGBColor(0xE8, 0xF5, 0xE9))
@@ -536,6 +601,48 @@ def generate_presentation(data_file=DATA_FILE):
     _box(s, Inches(1), Inches(5.2), Inches(11), Inches(0.6),
          "AACE Salary Survey Analysis  |  February 2026", sz=14, color=BLUE, align=PP_ALIGN.CENTER)
 
+SLIDES = [
+    ("Title", _slide_title),
+    ("Agenda", _slide_agenda),
+    ("Executive summary", _slide_summary),
+    ("Data overview", _slide_overview),
+    ("Salary distribution", _slides_distribution),
+    ("Membership & certification", _slides_credentials),
+    ("Gender pay gap", _slides_gender),
+    ("Gap by industry", _slide_industry),
+    ("Job satisfaction", _slide_satisfaction),
+    ("Consulting", _slide_consulting),
+    ("Regression", _slides_regression),
+    ("Model evolution", _slide_evolution),
+    ("Hypothesis test", _slide_hypothesis),
+    ("Key takeaways", _slide_takeaways),
+    ("Recommendations", _slide_recommendations),
+    ("Thank you", _slide_thanks),
+]
+
+def generate_presentation(data_file=DATA_FILE, progress=None, segment=None, df=None, workers=None):
+    """Build the deck; ``progress(done, total, label)`` is called before each section.
+
+    ``segment`` restricts the deck to one {column: value} segment (see
+    segment_rows); ``df`` is the survey as returned by _load(data_file), for
+    callers building many decks from one load; ``workers`` goes to the
+    resampling tests.
+    """
+    prs = Presentation(); prs.slide_width = SLIDE_W; prs.slide_height = SLIDE_H
+    def _step(label):
+        if progress is not None: progress(len(prs.slides), SLIDE_COUNT, label)
+    _step("Statistics")
+    if df is None: df = _load(data_file)
+    if segment: df = segment_rows(df, segment)
+    if df.empty: raise ValueError(f"No respondents in segment {segment_label(segment or {})}")
+    # Slides that load fitted models key them on the snapshot of data_file
+    v = SimpleNamespace(**_deck_values(df, workers), segment=segment, snapshot=data_snapshot(data_file))
+
+    for label, build in SLIDES:
+        _step(label)
+        build(prs, df, v)
+
+    _step("Saving")
     out = io.BytesIO(); prs.save(out); out.seek(0); return out
 
 if __name__ == "__main__":
@@ -0,0 +1,198 @@
+"""
+group_stats.py
+==============
+Group-fit service behind the Overview control charts (`plot_group`).
+
+For a respondent group it computes, once per group/filter fingerprint:
+  1. Welford running statistics of salary  → mean, std, UCL/LCL (±3σ)
+  2. Power sums Σu^k (k ≤ 2·degree) and Σu^k·y (k ≤ degree) of the
+     trimmed (≤ UCL) points, u being experience rescaled to [-1, 1]
+  3. The polynomial trend as a tiny normal-equation solve on those sums
+  4. Correlation / R² from the same sums
+
+Results are memoized, so re-rendering a chart only costs the scatter draw.
+thin_points() bounds that draw for very large groups. shape_stats() gives the
+Histograms tab its skewness / kurtosis without importing scipy.stats.
+"""
+
+import numpy as np
+
+from caching import memoize
+
+
+# ============================================================
+# WELFORD RUNNING STATISTICS
+# ============================================================
+class RunningStats:
+    """Welford/Chan running count, mean and sum of squared deviations."""
+
+    def __init__(self, n=0, mean=0.0, m2=0.0):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return self
+        batch_mean = values.mean()
+        batch_m2 = ((values - batch_mean) ** 2).sum()
+        return self.merge(RunningStats(values.size, batch_mean, batch_m2))
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta ** 2 * self.n * other.n / n
+        self.n = n
+        return self
+
+    @property
+    def std(self):
+        # ddof=1, same as pandas .std()
+        return np.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else np.nan
+
+
+# ============================================================
+# GROUP FIT
+# ============================================================
+class GroupFit:
+    """Control limits, trimmed plot points and polynomial trend of a group."""
+
+    def __init__(self, n, mean, std, x, y, coeffs, corr):
+        self.n = n
+        self.mean = mean
+        self.std = std
+        self.ucl = mean + 3 * std
+        self.lcl = mean - 3 * std
+        self.x = x
+        self.y = y
+        self.coeffs = coeffs
+        self.corr = corr
+        self.r2 = corr ** 2
+
+    def trend(self, num=200):
+        """Return (x_grid, y_fit); y_fit is None when there is no fit."""
+        x_grid = np.linspace(self.x.min(), self.x.max(), num)
+        if self.coeffs is None:
+            return x_grid, None
+        return x_grid, np.polyval(self.coeffs, x_grid)
+
+
+def _power_sums(x, y, degree, center, scale, y_shift):
+    u = (x - center) / scale
+    powers = u[:, None] ** np.arange(2 * degree + 1)
+    yc = y - y_shift
+    s_u = powers.sum(axis=0)
+    s_uy = powers[:, :degree + 1].T @ yc
+    return s_u, s_uy, yc @ yc
+
+
+def _solve_trend(s_u, s_uy, degree, center, scale, y_shift):
+    # Hankel normal equations in the rescaled basis, then map back to x
+    idx = np.arange(degree + 1)
+    hankel = s_u[idx[:, None] + idx[None, :]]
+    a = np.linalg.lstsq(hankel, s_uy, rcond=None)[0]
+    a[0] += y_shift
+    poly_x = np.polynomial.Polynomial(a)(np.polynomial.Polynomial([-center / scale, 1 / scale]))
+    coeffs = np.zeros(degree + 1)
+    coeffs[:len(poly_x.coef)] = poly_x.coef
+    return coeffs[::-1]
+
+
+def _corr(s_u, s_uy, s_yy):
+    n = s_u[0]
+    cov = s_uy[1] - s_u[1] * s_uy[0] / n
+    var_u = s_u[2] - s_u[1] ** 2 / n
+    var_y = s_yy - s_uy[0] ** 2 / n
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return cov / np.sqrt(var_u * var_y)
+
+
+@memoize(maxsize=256)
+def group_fit(x, y, lower=10000, upper=500000, degree=3, min_fit_points=6):
+    """Fit the control chart statistics for one group.
+
+    ``x``/``y`` are the group's YearsOfExperience and SalaryUSD. Rows with a
+    missing value or a salary outside [lower, upper] are ignored, matching
+    the approved `plot_group` filtering.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    keep = ~np.isnan(x) & ~np.isnan(y) & (y >= lower) & (y <= upper)
+    x, y = x[keep], y[keep]
+
+    stats = RunningStats().update(y)
+    ucl = stats.mean + 3 * stats.std
+    in_limits = y <= ucl
+    x_plot, y_plot = x[in_limits], y[in_limits]
+
+    coeffs, corr = None, np.nan
+    if x_plot.size > 1:
+        center = (x_plot.max() + x_plot.min()) / 2
+        scale = (x_plot.max() - x_plot.min()) / 2 or 1.0
+        s_u, s_uy, s_yy = _power_sums(x_plot, y_plot, degree, center, scale, stats.mean)
+        corr = _corr(s_u, s_uy, s_yy)
+        if x_plot.size >= min_fit_points:
+            coeffs = _solve_trend(s_u, s_uy, degree, center, scale, stats.mean)
+
+    return GroupFit(stats.n, stats.mean, stats.std, x_plot, y_plot, coeffs, corr)
+
+
+# ============================================================
+# SHAPE STATISTICS
+# ============================================================
+def shape_stats(values):
+    """(skewness, excess kurtosis) of the non-missing ``values``.
+
+    The biased moment estimators, same as scipy.stats.skew / kurtosis with
+    nan_policy="omit"; NaN for fewer than two distinct values.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return np.nan, np.nan
+    mean = values.mean()
+    dev = values - mean
+    m2 = (dev ** 2).mean()
+    if m2 <= (np.finfo(float).eps * abs(mean)) ** 2:
+        return np.nan, np.nan
+    return (dev ** 3).mean() / m2 ** 1.5, (dev ** 4).mean() / m2 ** 2 - 3.0
+
+
+# ============================================================
+# SCATTER THINNING
+# ============================================================
+def thin_points(x, y, lcl, ucl, max_points, bins=20, seed=0):
+    """Stratified downsample of (x, y) to about ``max_points`` points.
+
+    Points outside [lcl, ucl] and the two x extremes are always kept; the
+    remaining budget is spread over equal-width experience bins in
+    proportion to their counts. The draw is seeded so the chart is stable
+    across reruns.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x.size <= max_points:
+        return x, y
+
+    keep = (y < lcl) | (y > ucl)
+    keep[np.argmin(x)] = keep[np.argmax(x)] = True
+    budget = max(max_points - int(keep.sum()), 0)
+
+    rest = np.flatnonzero(~keep)
+    edges = np.linspace(x.min(), x.max(), bins + 1)
+    bin_of = np.clip(np.searchsorted(edges, x[rest], side="right") - 1, 0, bins - 1)
+    counts = np.bincount(bin_of, minlength=bins)
+    quota = np.minimum(counts, np.ceil(counts * budget / max(rest.size, 1)).astype(int))
+
+    rng = np.random.default_rng(seed)
+    chosen = [
+        rng.choice(rest[bin_of == b], size=quota[b], replace=False)
+        for b in np.flatnonzero(quota)
+    ]
+    if chosen:
+        keep[np.concatenate(chosen)] = True
+    return x[keep], y[keep]
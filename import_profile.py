@@ -0,0 +1,162 @@
+"""
+import_profile.py
+=================
+Import-time profile of the Streamlit pages, built on ``python -X importtime``:
+  1. page_imports()  — the import statements a page runs at the top (cold
+     start) and inside each section (tab, button) on its first use
+  2. import_times()  — self / cumulative seconds of every module a set of
+     import statements loads, in a fresh interpreter
+  3. page_profile()  — cold start of a page and the extra import time of each
+     of its sections, optionally next to the same page at another git revision
+
+Usage:
+    python import_profile.py                        # main.py and download_page.py
+    python import_profile.py main.py --rev HEAD~1   # compare with an older tree
+    python import_profile.py --top 20 --repeat 5
+
+Times are the sum of the ``self`` column, i.e. the time spent importing
+modules beyond a bare interpreter; each run takes the fastest of ``--repeat``
+fresh interpreters.
+"""
+
+import argparse
+import ast
+import io
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+import pandas as pd
+
+PAGES = ("main.py", "download_page.py")
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+# ============================================================
+# IMPORT STATEMENTS
+# ============================================================
+def _section_label(node, parents):
+    # The tab (``if tab_x.open:``) or button (``if st.button("..."):``) guarding an import
+    while node in parents:
+        node = parents[node]
+        if isinstance(node, ast.If):
+            for n in ast.walk(node.test):
+                if isinstance(n, ast.Attribute) and n.attr == "open" and isinstance(n.value, ast.Name):
+                    return n.value.id
+                if isinstance(n, ast.Call) and n.args and isinstance(n.args[0], ast.Constant):
+                    return str(n.args[0].value)
+            return f"line {node.lineno}"
+    return f"line {node.lineno}"
+
+
+def page_imports(path):
+    """(top-level import statements, {section: import statements}) of a page."""
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    parents = {child: node for node in ast.walk(tree) for child in ast.iter_child_nodes(node)}
+
+    top, sections = [], {}
+    for stmt in tree.body:
+        if isinstance(stmt, (ast.Import, ast.ImportFrom)):
+            top.append(ast.unparse(stmt))
+            continue
+        for node in ast.walk(stmt):
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                sections.setdefault(_section_label(node, parents), []).append(ast.unparse(node))
+    return top, sections
+
+
+# ============================================================
+# IMPORT TIMES
+# ============================================================
+def _parse(stderr):
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({
+            "Module": name.strip(),
+            "Depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "Self (s)": int(self_us) / 1e6,
+            "Cumulative (s)": int(cumulative_us) / 1e6,
+        })
+    return pd.DataFrame(rows, columns=["Module", "Depth", "Self (s)", "Cumulative (s)"])
+
+
+def import_times(statements, cwd=ROOT, repeat=3):
+    """Modules loaded by ``statements`` (beyond a bare interpreter), fastest of ``repeat`` runs."""
+    def run(code):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                              cwd=cwd, capture_output=True, text=True)
+        if proc.returncode:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+        return _parse(proc.stderr)
+
+    baseline = set(run("pass")["Module"])
+    runs = [run("\n".join(statements)) for _ in range(repeat)]
+    best = min(runs, key=lambda t: t["Self (s)"].sum())
+    return best[~best["Module"].isin(baseline)].reset_index(drop=True)
+
+
+# ============================================================
+# PAGE PROFILE
+# ============================================================
+def _checkout(rev, directory):
+    # The .py files of ``rev`` only: importing a page needs no data files
+    archive = subprocess.run(["git", "archive", rev, "--", "*.py"], cwd=ROOT,
+                             capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory, filter="data")
+
+
+def page_profile(page, cwd=ROOT, repeat=3):
+    """One row for the page's cold start and one per section: extra import
+    time, modules loaded and the slowest top-level packages among them."""
+    top, sections = page_imports(os.path.join(cwd, page))
+    cold = import_times(top, cwd, repeat)
+    rows = [("cold start", cold)]
+    for label, statements in sections.items():
+        extra = import_times(top + statements, cwd, repeat)
+        rows.append((label, extra[~extra["Module"].isin(cold["Module"])]))
+
+    out = []
+    for label, t in rows:
+        slowest = t[t["Depth"] == 0].nlargest(3, "Cumulative (s)")
+        out.append({
+            "Section": label,
+            "Import (s)": round(t["Self (s)"].sum(), 3),
+            "Modules": len(t),
+            "Slowest": ", ".join(f"{m} {s:.2f}" for m, s in zip(slowest["Module"], slowest["Cumulative (s)"])),
+        })
+    return pd.DataFrame(out), cold
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("pages", nargs="*", default=list(PAGES))
+    parser.add_argument("--rev", help="also profile the pages at this git revision")
+    parser.add_argument("--top", type=int, default=10, help="slowest cold-start modules to list")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as old_tree:
+        if args.rev:
+            _checkout(args.rev, old_tree)
+        for page in args.pages:
+            report, cold = page_profile(page, repeat=args.repeat)
+            print(f"\n{page}\n{'=' * len(page)}")
+            if args.rev:
+                old, _ = page_profile(page, old_tree, args.repeat)
+                before = old.set_index("Section")["Import (s)"]
+                report.insert(1, f"{args.rev} (s)", report["Section"].map(before))
+            print(report.to_string(index=False))
+            print("\nSlowest modules at cold start (cumulative):")
+            print(cold.nlargest(args.top, "Cumulative (s)")[["Module", "Self (s)", "Cumulative (s)"]]
+                  .round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,22 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import statsmodels.api as sm
-from statsmodels.stats.stattools import omni_normtest, jarque_bera, durbin_watson
-from statsmodels.stats.outliers_influence import variance_inflation_factor
-from scipy import stats
+
+# The analysis modules of the other tabs (scipy.stats, statsmodels, sklearn,
+# ...) are imported inside those tabs, so only the open tab pays for them
+from group_stats import group_fit, shape_stats, thin_points
+from model_registry import cv_scores, data_snapshot, diagnostics_future, fitted_model, ready_diagnostics
+from resampling import gap_bootstrap, permutation_test
+from salary_models import ORIGINAL_SPEC, ENHANCED_SPEC, ENHANCED_CATEGORICAL, assign_region, enhanced_frame, enhanced_core_columns
 
 # =========================
 # FILE (LOCAL ONLY)
 # =========================
 DATA_FILE = "salary_usd_cleaned.csv"
 
+# Above this many points per chart, plot_group switches to a dense mode
+SCATTER_MAX_POINTS = 5000
+
 # =========================
 # LOAD DATA
 # =========================
@@ -41,38 +47,40 @@ def load_data():
 
 # =========================
 # APPROVED PLOT FUNCTION
-# DO NOT MODIFY
+# DO NOT MODIFY THE CHART OUTPUT
+# (statistics come from group_stats.group_fit)
 # =========================
-def plot_group(df, group_filter, title):
-    df_group = df[group_filter].dropna(subset=["YearsOfExperience", "SalaryUSD"])
-    df_group = df_group[df_group["SalaryUSD"].between(10000, 500000)]
+def plot_group(df, group_filter, title, max_points=SCATTER_MAX_POINTS, dense_mode="hexbin"):
+    df_group = df[group_filter]
+    fit = group_fit(df_group["YearsOfExperience"], df_group["SalaryUSD"])
 
-    if len(df_group) < 10:
+    if fit.n < 10:
         st.write("Not enough data for", title)
         return
 
-    base_mean = df_group["SalaryUSD"].mean()
-    base_std = df_group["SalaryUSD"].std()
+    base_mean = fit.mean
+    base_std = fit.std
 
-    UCL = base_mean + 3 * base_std
-    LCL = base_mean - 3 * base_std
+    UCL = fit.ucl
+    LCL = fit.lcl
 
-    df_plot = df_group[df_group["SalaryUSD"] <= UCL]
+    x = fit.x
+    y = fit.y
 
-    x = df_plot["YearsOfExperience"]
-    y = df_plot["SalaryUSD"]
-
-    if len(x) > 5:
-        z = np.polyfit(x, y, 3)
-        p = np.poly1d(z)
-        x_sorted = np.linspace(x.min(), x.max(), 200)
-        y_fit = p(x_sorted)
-    else:
-        x_sorted = np.linspace(x.min(), x.max(), 200)
-        y_fit = None
+    x_sorted, y_fit = fit.trend(200)
 
     fig, ax = plt.subplots(figsize=(5.6, 3.4))
-    ax.scatter(x, y, alpha=0.35, s=14)
+
+    # Lines and trend always use the full group; only the points are thinned
+    if len(x) <= max_points:
+        ax.scatter(x, y, alpha=0.35, s=14)
+    elif dense_mode == "hexbin":
+        ax.hexbin(x, y, gridsize=40, mincnt=1, cmap="Blues")
+        outside = y < LCL
+        ax.scatter(x[outside], y[outside], alpha=0.35, s=14)
+    else:
+        x_thin, y_thin = thin_points(x, y, LCL, UCL, max_points)
+        ax.scatter(x_thin, y_thin, alpha=0.35, s=14)
 
     if y_fit is not None:
         ax.plot(x_sorted, y_fit, color="fuchsia", linewidth=3)
@@ -117,8 +125,8 @@ def plot_group(df, group_filter, title):
     plt.close(fig)
 
 
-    corr = df_plot["YearsOfExperience"].corr(df_plot["SalaryUSD"])
-    r2 = corr ** 2
+    corr = fit.corr
+    r2 = fit.r2
 
     st.markdown(
     f"""
@@ -133,6 +141,69 @@ def plot_group(df, group_filter, title):
 
 
 
+# =========================
+# RESIDUAL DIAGNOSTICS (ON REQUEST)
+# =========================
+def diagnostics(spec, wait=False):
+    """Residual diagnostics of ``spec`` on the current filters. Computed (and
+    waited for) only when ``wait``; otherwise None unless already available."""
+    if wait:
+        return diagnostics_future(spec, df, snapshot, active_filters).result()
+    return ready_diagnostics(spec, snapshot, active_filters)
+
+
+def diag_value(diag, name):
+    return round(diag[name], 3) if diag is not None else "pending"
+
+
+def diag_table(table):
+    # "pending" cells turn a numeric column into text; convert it up front for Arrow
+    return table.astype(str) if table.isin(["pending"]).any().any() else table
+
+
+# =========================
+# ORIGINAL MODEL + VIF SCREEN
+# (shared by the Original Model and Causation tabs)
+# =========================
+main_vars = [
+    "YearsOfExperience",
+    "Age",
+    "IsCertified",
+    "IsMember",
+    "IsFemale",
+    "IsManager",
+    "IsConsult"
+]
+
+
+def vif_flag(v):
+    if v > 10:
+        return "🔴 High"
+    elif v >= 5:
+        return "⚠️ Moderate"
+    else:
+        return "✅ OK"
+
+
+def original_model():
+    """Original model on the current filters, its VIF table (sorted, flagged)
+    and the core variables with high (> 10) and moderate (5–10) VIF."""
+    # Fits are loaded from the on-disk model registry (fitted once per
+    # data snapshot + filters); the Fixed model reuses the same design
+    model = fitted_model(ORIGINAL_SPEC, df, snapshot, active_filters)
+
+    # All VIFs at once from the inverse predictor correlation matrix
+    vif_report = model.vif
+    vif_data = vif_report.table.sort_values("VIF", ascending=False).reset_index(drop=True)
+    vif_data["Status"] = vif_data["VIF"].apply(vif_flag)
+    vif_data["VIF"] = vif_data["VIF"].round(2)
+
+    core = vif_data["Variable"].isin(main_vars)
+    high_vif_vars = vif_data[(vif_data["VIF"] > 10) & core]["Variable"].tolist()
+    moderate_vif_vars = vif_data[(vif_data["VIF"] >= 5) & (vif_data["VIF"] <= 10) & core]["Variable"].tolist()
+    return model, vif_report, vif_data, high_vif_vars, moderate_vif_vars
+
+
 # =========================
 # APP
 # =========================
@@ -170,6 +241,27 @@ df = df[
 
 st.write("Filtered records:", len(df))
 
+# Fitted models are cached on disk per (data snapshot, filters)
+snapshot = data_snapshot(DATA_FILE)
+active_filters = {"EmploymentStatus": selected_employment, "LocationWork": selected_location}
+
+# Chart rendering
+st.sidebar.header("Chart Rendering")
+
+render_opts = {
+    "max_points": st.sidebar.number_input(
+        "Max scatter points per chart",
+        min_value=100,
+        value=SCATTER_MAX_POINTS,
+        step=500
+    ),
+    "dense_mode": st.sidebar.radio(
+        "Above the limit, draw",
+        ["hexbin", "sample"],
+        format_func=lambda m: "Density (hexbin)" if m == "hexbin" else "Stratified sample"
+    )
+}
+
 df_2015 = df[df["SurveyYear"] == 2015]
 df_2023 = df[df["SurveyYear"] == 2023]
 
@@ -178,621 +270,563 @@ df_2023 = df[df["SurveyYear"] == 2023]
 # =========================
 # TAB NAVIGATION
 # =========================
-tab_overview, tab_histogram, tab_satisfaction, tab_gender, tab_certification, tab_regression, tab_causation = st.tabs([
+tab_overview, tab_histogram, tab_satisfaction, tab_gender, tab_certification, tab_regression, tab_causation, tab_boosting, tab_predict = st.tabs([
     "Overview",
     "Histograms",
     "Job Satisfaction",
     "Gender Gap",
     "Certification",
     "Original Model",
-    "Causation Analysis"
-])
-
-with tab_overview:
-    # =========================
-    # MEMBERSHIP
-    # =========================
-    st.header("Members vs Non-Members")
-
-    c1, c2 = st.columns(2)
-
-    with c1:
-        plot_group(df_2015, df_2015["IsMember"], "Members (2015)")
-        plot_group(df_2015, ~df_2015["IsMember"], "Non-Members (2015)")
-
-    with c2:
-        plot_group(df_2023, df_2023["IsMember"], "Members (2023)")
-        plot_group(df_2023, ~df_2023["IsMember"], "Non-Members (2023)")
-
-    # =========================
-    # CERTIFICATION
-    # =========================
-    st.header("Certification Effect")
-
-    c1, c2 = st.columns(2)
-
-    with c1:
-        plot_group(df_2015, df_2015["IsCertified"], "Certified (2015)")
-        plot_group(df_2015, ~df_2015["IsCertified"], "Non-Certified (2015)")
-
-    with c2:
-        plot_group(df_2023, df_2023["IsCertified"], "Certified (2023)")
-        plot_group(df_2023, ~df_2023["IsCertified"], "Non-Certified (2023)")
-
-    # =========================
-    # GENDER
-    # =========================
-    st.header("Gender Comparison")
-
-    c1, c2 = st.columns(2)
-
-    with c1:
-        plot_group(df_2015, df_2015["IsFemale"], "Women (2015)")
-        plot_group(df_2015, ~df_2015["IsFemale"], "Men (2015)")
-
-    with c2:
-        plot_group(df_2023, df_2023["IsFemale"], "Women (2023)")
-        plot_group(df_2023, ~df_2023["IsFemale"], "Men (2023)")
-
-    # =========================
-
-with tab_histogram:
-    # =========================
-    # HISTOGRAM ANALYSIS
-    # =========================
-    st.header("Salary Distribution — Histogram Analysis")
-    st.markdown("Salary histograms in **$5,000 buckets** to visualize the shape, spread, and kurtosis of the dataset. Includes **mean, median, and mode** lines.")
-
-    def plot_histogram(df_input, title, color="steelblue", bucket_size=5000):
-        """Plot a salary histogram with mean, median, mode lines."""
-        df_plot = df_input.dropna(subset=["SalaryUSD"]).copy()
-        df_plot = df_plot[df_plot["SalaryUSD"].between(5000, 500000)]
-
-        if len(df_plot) < 10:
-            st.warning(f"Not enough data for: {title}")
-            return
-
-        salaries = df_plot["SalaryUSD"]
-
-        mean_sal = salaries.mean()
-        median_sal = salaries.median()
-        std_sal = salaries.std()
-        skewness = stats.skew(salaries, nan_policy="omit")
-        kurt = stats.kurtosis(salaries, nan_policy="omit")
-        n = len(salaries)
-
-        # Mode: midpoint of most frequent bin
-        bin_min_pre = int(np.floor(salaries.min() / bucket_size) * bucket_size)
-        bin_max_pre = int(np.ceil(salaries.max() / bucket_size) * bucket_size) + bucket_size
-        bins_pre = np.arange(bin_min_pre, bin_max_pre, bucket_size)
-        counts_pre, edges_pre = np.histogram(salaries, bins=bins_pre)
-        mode_bin_idx = np.argmax(counts_pre)
-        mode_sal = (edges_pre[mode_bin_idx] + edges_pre[mode_bin_idx + 1]) / 2
-
-        bins = np.arange(bin_min_pre, bin_max_pre, bucket_size)
-
-        fig, ax = plt.subplots(figsize=(12, 5))
-        counts, edges, patches = ax.hist(salaries, bins=bins, color=color, edgecolor="white", alpha=0.85, linewidth=0.6)
-
-        ax.axvline(mean_sal, color="red", linewidth=2, linestyle="--", label=f"Mean: ${mean_sal:,.0f}")
-        ax.axvline(median_sal, color="orange", linewidth=2, linestyle="-.", label=f"Median: ${median_sal:,.0f}")
-        ax.axvline(mode_sal, color="green", linewidth=2, linestyle=":", label=f"Mode: ${mode_sal:,.0f}")
-        ax.axvspan(mean_sal - std_sal, mean_sal + std_sal, alpha=0.08, color="red",
-                   label=f"\u00b11\u03c3 (${mean_sal - std_sal:,.0f} \u2013 ${mean_sal + std_sal:,.0f})")
-
-        ax.set_xlabel("Salary (USD)", fontsize=11)
-        ax.set_ylabel("Number of Respondents", fontsize=11)
-        ax.set_title(title, fontsize=13, fontweight="bold")
-        ax.ticklabel_format(style="plain", axis="x")
-        ax.grid(axis="y", linestyle="--", alpha=0.4)
-        ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"${x/1000:.0f}K"))
-        ax.legend(loc="upper right", fontsize=9)
-        plt.tight_layout()
-        st.pyplot(fig)
-        plt.close(fig)
+    "Causation Analysis",
+    "Non-Linear Model",
+    "Salary Predictor"
+], key="main_tab", on_change="rerun")
 
-        stats_data = pd.DataFrame({
-            "Metric": ["N (Count)", "Mean Salary", "Median Salary", "Mode Salary (bin midpoint)",
-                       "Std Deviation", "Skewness", "Excess Kurtosis", "Min Salary", "Max Salary",
-                       "25th Percentile (Q1)", "75th Percentile (Q3)", "IQR"],
-            "Value": [f"{n:,}", f"${mean_sal:,.0f}", f"${median_sal:,.0f}", f"${mode_sal:,.0f}",
-                      f"${std_sal:,.0f}", f"{skewness:.4f}", f"{kurt:.4f}",
-                      f"${salaries.min():,.0f}", f"${salaries.max():,.0f}",
-                      f"${salaries.quantile(0.25):,.0f}", f"${salaries.quantile(0.75):,.0f}",
-                      f"${salaries.quantile(0.75) - salaries.quantile(0.25):,.0f}"]
-        })
-        st.dataframe(stats_data, hide_index=True)
 
-        if skewness > 0.5:
-            skew_text = "**Right-skewed** (positively skewed) — a tail of high earners pulls the distribution rightward."
-        elif skewness < -0.5:
-            skew_text = "**Left-skewed** (negatively skewed) — a concentration at higher salaries with a tail of lower earners."
-        else:
-            skew_text = "**Approximately symmetric** — salaries are fairly evenly distributed around the center."
+if tab_overview.open:
+    with tab_overview:
+        # =========================
+        # MEMBERSHIP
+        # =========================
+        st.header("Members vs Non-Members")
 
-        if kurt > 1:
-            kurt_text = "**Leptokurtic** (heavy tails) — more extreme salary values than a normal distribution."
-        elif kurt < -1:
-            kurt_text = "**Platykurtic** (light tails) — fewer extreme salary values than a normal distribution."
-        else:
-            kurt_text = "**Mesokurtic** (near-normal) — the tail behavior is similar to a normal distribution."
+        c1, c2 = st.columns(2)
 
-        st.markdown(f"""
-    **Shape Analysis:**
-    - Skewness ({skewness:.4f}): {skew_text}
-    - Kurtosis ({kurt:.4f}): {kurt_text}
-    """)
+        with c1:
+            plot_group(df_2015, df_2015["IsMember"], "Members (2015)", **render_opts)
+            plot_group(df_2015, ~df_2015["IsMember"], "Non-Members (2015)", **render_opts)
 
-    # --- All Respondents ---
-    st.subheader("All Respondents")
-    plot_histogram(df, "Salary Distribution — All Respondents", color="steelblue")
-
-    # --- Men vs Women ---
-    st.subheader("Men vs Women")
-    df_hist_men = df[~df["IsFemale"]]
-    df_hist_women = df[df["IsFemale"]]
-
-    c1, c2 = st.columns(2)
-    with c1:
-        plot_histogram(df_hist_men, "Salary Distribution — Men", color="#3A86FF")
-    with c2:
-        plot_histogram(df_hist_women, "Salary Distribution — Women", color="#FF006E")
-
-    # --- 2015 vs 2023 ---
-    st.subheader("Year-over-Year Comparison (2015 vs 2023)")
-
-    c1, c2 = st.columns(2)
-    with c1:
-        plot_histogram(df_2015, "All Respondents — 2015", color="#457B9D")
-    with c2:
-        plot_histogram(df_2023, "All Respondents — 2023", color="#E63946")
-
-    # --- Overlay: Men vs Women ---
-    st.subheader("Overlay: Men vs Women")
-
-    df_men_sal = df_hist_men["SalaryUSD"].dropna()
-    df_women_sal = df_hist_women["SalaryUSD"].dropna()
-    df_men_sal = df_men_sal[df_men_sal.between(5000, 500000)]
-    df_women_sal = df_women_sal[df_women_sal.between(5000, 500000)]
-
-    if len(df_men_sal) > 10 and len(df_women_sal) > 10:
-        bucket_size = 5000
-        all_salaries = pd.concat([df_men_sal, df_women_sal])
-        bin_min = int(np.floor(all_salaries.min() / bucket_size) * bucket_size)
-        bin_max = int(np.ceil(all_salaries.max() / bucket_size) * bucket_size) + bucket_size
-        bins = np.arange(bin_min, bin_max, bucket_size)
-
-        fig, ax = plt.subplots(figsize=(14, 5))
-        ax.hist(df_men_sal, bins=bins, alpha=0.55, color="#3A86FF", edgecolor="white", linewidth=0.5, label=f"Men (n={len(df_men_sal):,})")
-        ax.hist(df_women_sal, bins=bins, alpha=0.55, color="#FF006E", edgecolor="white", linewidth=0.5, label=f"Women (n={len(df_women_sal):,})")
-
-        men_counts, men_edges = np.histogram(df_men_sal, bins=bins)
-        men_mode_idx = np.argmax(men_counts)
-        men_mode = (men_edges[men_mode_idx] + men_edges[men_mode_idx + 1]) / 2
-
-        women_counts, women_edges = np.histogram(df_women_sal, bins=bins)
-        women_mode_idx = np.argmax(women_counts)
-        women_mode = (women_edges[women_mode_idx] + women_edges[women_mode_idx + 1]) / 2
-
-        ax.axvline(df_men_sal.mean(), color="#3A86FF", linewidth=2, linestyle="--", label=f"Men Mean: ${df_men_sal.mean():,.0f}")
-        ax.axvline(df_women_sal.mean(), color="#FF006E", linewidth=2, linestyle="--", label=f"Women Mean: ${df_women_sal.mean():,.0f}")
-        ax.axvline(df_men_sal.median(), color="#3A86FF", linewidth=2, linestyle="-.", label=f"Men Median: ${df_men_sal.median():,.0f}")
-        ax.axvline(df_women_sal.median(), color="#FF006E", linewidth=2, linestyle="-.", label=f"Women Median: ${df_women_sal.median():,.0f}")
-        ax.axvline(men_mode, color="#3A86FF", linewidth=2, linestyle=":", label=f"Men Mode: ${men_mode:,.0f}")
-        ax.axvline(women_mode, color="#FF006E", linewidth=2, linestyle=":", label=f"Women Mode: ${women_mode:,.0f}")
-
-        ax.set_xlabel("Salary (USD)", fontsize=11)
-        ax.set_ylabel("Number of Respondents", fontsize=11)
-        ax.set_title("Overlaid Salary Distribution — Men vs Women", fontsize=13, fontweight="bold")
-        ax.ticklabel_format(style="plain", axis="x")
-        ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"${x/1000:.0f}K"))
-        ax.grid(axis="y", linestyle="--", alpha=0.4)
-        ax.legend(loc="upper right", fontsize=8, ncol=2)
-        plt.tight_layout()
-        st.pyplot(fig)
-        plt.close(fig)
+        with c2:
+            plot_group(df_2023, df_2023["IsMember"], "Members (2023)", **render_opts)
+            plot_group(df_2023, ~df_2023["IsMember"], "Non-Members (2023)", **render_opts)
 
-        gap = df_men_sal.mean() - df_women_sal.mean()
-        gap_pct = (gap / df_men_sal.mean()) * 100
-
-        summary = pd.DataFrame({
-            "Metric": ["Count", "Mean", "Median", "Mode (bin midpoint)", "Std Dev", "Skewness", "Excess Kurtosis"],
-            "Men": [f"{len(df_men_sal):,}", f"${df_men_sal.mean():,.0f}", f"${df_men_sal.median():,.0f}",
-                    f"${men_mode:,.0f}", f"${df_men_sal.std():,.0f}",
-                    f"{stats.skew(df_men_sal):.4f}", f"{stats.kurtosis(df_men_sal):.4f}"],
-            "Women": [f"{len(df_women_sal):,}", f"${df_women_sal.mean():,.0f}", f"${df_women_sal.median():,.0f}",
-                      f"${women_mode:,.0f}", f"${df_women_sal.std():,.0f}",
-                      f"{stats.skew(df_women_sal):.4f}", f"{stats.kurtosis(df_women_sal):.4f}"]
-        })
-        st.dataframe(summary, hide_index=True)
+        # =========================
+        # CERTIFICATION
+        # =========================
+        st.header("Certification Effect")
 
-        st.markdown(f"""
-    **Gender Pay Gap Summary:**
-    - Mean salary gap: **${gap:,.0f}** ({gap_pct:.1f}% lower for women)
-    - Men mean: ${df_men_sal.mean():,.0f} | Women mean: ${df_women_sal.mean():,.0f}
-    """)
-    else:
-        st.warning("Not enough data for Men or Women to create the overlay chart.")
-
-
-with tab_satisfaction:
-    # =========================
-    # JOB SATISFACTION
-    # =========================
-    st.header("Job Satisfaction Analysis")
-
-    df_sat = df.dropna(subset=["JobSatisfaction", "SalaryUSD"]).copy()
-
-    # Clean formatting
-    df_sat["JobSatisfaction"] = df_sat["JobSatisfaction"].str.strip().str.lower()
-
-    # Logical satisfaction order
-    order = [
-        "very dissatisfied",
-        "somewhat dissatisfied",
-        "somewhat satisfied",
-        "very satisfied"
-    ]
-
-    # Display labels (two lines)
-    display_labels = [
-        "Very\nDissatisfied",
-        "Somewhat\nDissatisfied",
-        "Somewhat\nSatisfied",
-        "Very\nSatisfied"
-    ]
-
-    # Define satisfied group
-    df_sat["IsSatisfied"] = df_sat["JobSatisfaction"].isin(
-        ["very satisfied", "somewhat satisfied"]
-    )
+        c1, c2 = st.columns(2)
 
-    pct_satisfied = df_sat["IsSatisfied"].mean() * 100
-    st.write(f"Overall Percentage Satisfied: {pct_satisfied:.1f}%")
-
-    # -------------------------
-    # 1. Satisfaction Distribution (2015 vs 2023)
-    # -------------------------
-    st.subheader("Job Satisfaction Distribution (2015 vs 2023)")
-
-    dist_2015 = (
-        df_sat[df_sat["SurveyYear"] == 2015]["JobSatisfaction"]
-        .value_counts(normalize=True) * 100
-    )
-
-    dist_2023 = (
-        df_sat[df_sat["SurveyYear"] == 2023]["JobSatisfaction"]
-        .value_counts(normalize=True) * 100
-    )
+        with c1:
+            plot_group(df_2015, df_2015["IsCertified"], "Certified (2015)", **render_opts)
+            plot_group(df_2015, ~df_2015["IsCertified"], "Non-Certified (2015)", **render_opts)
 
-    dist_compare = pd.concat([dist_2015, dist_2023], axis=1)
-    dist_compare.columns = ["2015 (%)", "2023 (%)"]
-    dist_compare = dist_compare.reindex(order)
-    dist_compare = dist_compare.fillna(0)
+        with c2:
+            plot_group(df_2023, df_2023["IsCertified"], "Certified (2023)", **render_opts)
+            plot_group(df_2023, ~df_2023["IsCertified"], "Non-Certified (2023)", **render_opts)
 
-    fig, ax = plt.subplots(figsize=(8, 4))
-    dist_compare.plot(kind="bar", ax=ax)
+        # =========================
+        # GENDER
+        # =========================
+        st.header("Gender Comparison")
 
-    ax.set_ylabel("Percentage of Participants")
-    ax.set_xlabel("Satisfaction Level")
-    ax.set_title("Job Satisfaction Comparison (2015 vs 2023)")
-    ax.grid(axis="y", linestyle="--", alpha=0.6)
+        c1, c2 = st.columns(2)
 
-    ax.set_xticklabels(display_labels, rotation=0)
-    ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
+        with c1:
+            plot_group(df_2015, df_2015["IsFemale"], "Women (2015)", **render_opts)
+            plot_group(df_2015, ~df_2015["IsFemale"], "Men (2015)", **render_opts)
 
-    # Smaller percentage labels
-    for container in ax.containers:
-        ax.bar_label(container, fmt="%.1f%%", padding=2, fontsize=8)
+        with c2:
+            plot_group(df_2023, df_2023["IsFemale"], "Women (2023)", **render_opts)
+            plot_group(df_2023, ~df_2023["IsFemale"], "Men (2023)", **render_opts)
 
-    plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
-
-    st.dataframe(dist_compare.round(2))
-
-
-    # -------------------------
-    # 2. Salary by Satisfaction (2015 vs 2023)
-    # -------------------------
-    st.subheader("Average Salary by Satisfaction Level")
+        # =========================
+        # SIGNIFICANCE OF SEGMENT DIFFERENCES
+        # =========================
+        st.header("Are the Differences Significant? (Permutation Tests)")
+        st.markdown("""
+    Average salary difference of each group versus everyone else, with a **permutation test**
+    (5,000 label shuffles within segment × survey year). A p-value below 0.05 means a gap this
+    large would rarely appear if group membership were unrelated to salary.
+    """)
 
-    salary_2015 = (
-        df_sat[df_sat["SurveyYear"] == 2015]
-        .groupby("JobSatisfaction")["SalaryUSD"]
-        .mean()
-    )
+        df_perm = df[["SalaryUSD", "SurveyYear", "IsMember", "IsCertified"]].copy()
+        df_perm["IsConsultant"] = (
+            df["Consult"].astype(str).str.contains("Yes", case=False, na=False)
+            .where(df["Consult"].notna())
+        )
+        df_perm["Region"] = df["LocationWork"].apply(assign_region)
+        df_perm["Industry"] = df["Industry"].str.strip().str.lower()
+        top_perm_industries = df_perm["Industry"].value_counts().head(8).index
+        # Smaller industries pool into "other"; a missing industry is its own level
+        df_perm["Industry"] = (
+            df_perm["Industry"].where(df_perm["Industry"].isin(top_perm_industries), "other")
+            .where(df_perm["Industry"].notna(), "unknown")
+        )
 
-    salary_2023 = (
-        df_sat[df_sat["SurveyYear"] == 2023]
-        .groupby("JobSatisfaction")["SalaryUSD"]
-        .mean()
-    )
+        perm_segments = {
+            "Survey Year": ["SurveyYear"],
+            "Industry (Top 8 + Other)": ["Industry"],
+            "Region": ["Region"],
+        }
+        perm_by = perm_segments[st.selectbox("Segment by", list(perm_segments), key="perm_segment_by")]
+
+        perm_tables = []
+        for label, col in [("Members", "IsMember"), ("Certified", "IsCertified"), ("Consultants", "IsConsultant")]:
+            perm_cols = list(dict.fromkeys(["SalaryUSD", "SurveyYear", col] + perm_by))
+            res = permutation_test(df_perm[perm_cols], col, by=perm_by).copy()
+            res.insert(0, "Comparison", f"{label} vs Others")
+            perm_tables.append(res)
+
+        perm_results = pd.concat(perm_tables, ignore_index=True)
+        perm_results["Segment"] = perm_results["Segment"].astype(str)
+        perm_results["Significant"] = perm_results["p-value"].apply(
+            lambda x: "✅" if x < 0.05 else "❌"
+        )
+        perm_results["Difference (USD)"] = perm_results["Difference (USD)"].round(0)
+        perm_results["p-value"] = perm_results["p-value"].round(4)
+        st.dataframe(perm_results, hide_index=True)
+
+
+if tab_histogram.open:
+    with tab_histogram:
+        # =========================
+        # HISTOGRAM ANALYSIS
+        # =========================
+        st.header("Salary Distribution — Histogram Analysis")
+        st.markdown("Salary histograms in **$5,000 buckets** to visualize the shape, spread, and kurtosis of the dataset. Includes **mean, median, and mode** lines.")
+
+        def plot_histogram(df_input, title, color="steelblue", bucket_size=5000):
+            """Plot a salary histogram with mean, median, mode lines."""
+            df_plot = df_input.dropna(subset=["SalaryUSD"]).copy()
+            df_plot = df_plot[df_plot["SalaryUSD"].between(5000, 500000)]
+
+            if len(df_plot) < 10:
+                st.warning(f"Not enough data for: {title}")
+                return
+
+            salaries = df_plot["SalaryUSD"]
+
+            mean_sal = salaries.mean()
+            median_sal = salaries.median()
+            std_sal = salaries.std()
+            skewness, kurt = shape_stats(salaries)
+            n = len(salaries)
+
+            # Mode: midpoint of most frequent bin
+            bin_min_pre = int(np.floor(salaries.min() / bucket_size) * bucket_size)
+            bin_max_pre = int(np.ceil(salaries.max() / bucket_size) * bucket_size) + bucket_size
+            bins_pre = np.arange(bin_min_pre, bin_max_pre, bucket_size)
+            counts_pre, edges_pre = np.histogram(salaries, bins=bins_pre)
+            mode_bin_idx = np.argmax(counts_pre)
+            mode_sal = (edges_pre[mode_bin_idx] + edges_pre[mode_bin_idx + 1]) / 2
+
+            bins = np.arange(bin_min_pre, bin_max_pre, bucket_size)
+
+            fig, ax = plt.subplots(figsize=(12, 5))
+            counts, edges, patches = ax.hist(salaries, bins=bins, color=color, edgecolor="white", alpha=0.85, linewidth=0.6)
+
+            ax.axvline(mean_sal, color="red", linewidth=2, linestyle="--", label=f"Mean: ${mean_sal:,.0f}")
+            ax.axvline(median_sal, color="orange", linewidth=2, linestyle="-.", label=f"Median: ${median_sal:,.0f}")
+            ax.axvline(mode_sal, color="green", linewidth=2, linestyle=":", label=f"Mode: ${mode_sal:,.0f}")
+            ax.axvspan(mean_sal - std_sal, mean_sal + std_sal, alpha=0.08, color="red",
+                       label=f"\u00b11\u03c3 (${mean_sal - std_sal:,.0f} \u2013 ${mean_sal + std_sal:,.0f})")
+
+            ax.set_xlabel("Salary (USD)", fontsize=11)
+            ax.set_ylabel("Number of Respondents", fontsize=11)
+            ax.set_title(title, fontsize=13, fontweight="bold")
+            ax.ticklabel_format(style="plain", axis="x")
+            ax.grid(axis="y", linestyle="--", alpha=0.4)
+            ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"${x/1000:.0f}K"))
+            ax.legend(loc="upper right", fontsize=9)
+            plt.tight_layout()
+            st.pyplot(fig)
+            plt.close(fig)
+
+            stats_data = pd.DataFrame({
+                "Metric": ["N (Count)", "Mean Salary", "Median Salary", "Mode Salary (bin midpoint)",
+                           "Std Deviation", "Skewness", "Excess Kurtosis", "Min Salary", "Max Salary",
+                           "25th Percentile (Q1)", "75th Percentile (Q3)", "IQR"],
+                "Value": [f"{n:,}", f"${mean_sal:,.0f}", f"${median_sal:,.0f}", f"${mode_sal:,.0f}",
+                          f"${std_sal:,.0f}", f"{skewness:.4f}", f"{kurt:.4f}",
+                          f"${salaries.min():,.0f}", f"${salaries.max():,.0f}",
+                          f"${salaries.quantile(0.25):,.0f}", f"${salaries.quantile(0.75):,.0f}",
+                          f"${salaries.quantile(0.75) - salaries.quantile(0.25):,.0f}"]
+            })
+            st.dataframe(stats_data, hide_index=True)
+
+            if skewness > 0.5:
+                skew_text = "**Right-skewed** (positively skewed) — a tail of high earners pulls the distribution rightward."
+            elif skewness < -0.5:
+                skew_text = "**Left-skewed** (negatively skewed) — a concentration at higher salaries with a tail of lower earners."
+            else:
+                skew_text = "**Approximately symmetric** — salaries are fairly evenly distributed around the center."
 
-    salary_compare = pd.concat([salary_2015, salary_2023], axis=1)
-    salary_compare.columns = ["2015 Avg Salary", "2023 Avg Salary"]
-    salary_compare = salary_compare.reindex(order)
-    salary_compare = salary_compare.fillna(0)
+            if kurt > 1:
+                kurt_text = "**Leptokurtic** (heavy tails) — more extreme salary values than a normal distribution."
+            elif kurt < -1:
+                kurt_text = "**Platykurtic** (light tails) — fewer extreme salary values than a normal distribution."
+            else:
+                kurt_text = "**Mesokurtic** (near-normal) — the tail behavior is similar to a normal distribution."
 
-    fig2, ax2 = plt.subplots(figsize=(8, 4))
-    salary_compare.plot(kind="bar", ax=ax2)
+            st.markdown(f"""
+    **Shape Analysis:**
+    - Skewness ({skewness:.4f}): {skew_text}
+    - Kurtosis ({kurt:.4f}): {kurt_text}
+    """)
 
-    ax2.set_ylabel("Average Salary (USD)")
-    ax2.set_xlabel("Satisfaction Level")
-    ax2.set_title("Salary by Job Satisfaction (2015 vs 2023)")
-    ax2.grid(axis="y", linestyle="--", alpha=0.6)
+        # --- All Respondents ---
+        st.subheader("All Respondents")
+        plot_histogram(df, "Salary Distribution — All Respondents", color="steelblue")
+
+        # --- Men vs Women ---
+        st.subheader("Men vs Women")
+        df_hist_men = df[~df["IsFemale"]]
+        df_hist_women = df[df["IsFemale"]]
+
+        c1, c2 = st.columns(2)
+        with c1:
+            plot_histogram(df_hist_men, "Salary Distribution — Men", color="#3A86FF")
+        with c2:
+            plot_histogram(df_hist_women, "Salary Distribution — Women", color="#FF006E")
+
+        # --- 2015 vs 2023 ---
+        st.subheader("Year-over-Year Comparison (2015 vs 2023)")
+
+        c1, c2 = st.columns(2)
+        with c1:
+            plot_histogram(df_2015, "All Respondents — 2015", color="#457B9D")
+        with c2:
+            plot_histogram(df_2023, "All Respondents — 2023", color="#E63946")
+
+        # --- Overlay: Men vs Women ---
+        st.subheader("Overlay: Men vs Women")
+
+        df_men_sal = df_hist_men["SalaryUSD"].dropna()
+        df_women_sal = df_hist_women["SalaryUSD"].dropna()
+        df_men_sal = df_men_sal[df_men_sal.between(5000, 500000)]
+        df_women_sal = df_women_sal[df_women_sal.between(5000, 500000)]
+
+        if len(df_men_sal) > 10 and len(df_women_sal) > 10:
+            bucket_size = 5000
+            all_salaries = pd.concat([df_men_sal, df_women_sal])
+            bin_min = int(np.floor(all_salaries.min() / bucket_size) * bucket_size)
+            bin_max = int(np.ceil(all_salaries.max() / bucket_size) * bucket_size) + bucket_size
+            bins = np.arange(bin_min, bin_max, bucket_size)
+
+            fig, ax = plt.subplots(figsize=(14, 5))
+            ax.hist(df_men_sal, bins=bins, alpha=0.55, color="#3A86FF", edgecolor="white", linewidth=0.5, label=f"Men (n={len(df_men_sal):,})")
+            ax.hist(df_women_sal, bins=bins, alpha=0.55, color="#FF006E", edgecolor="white", linewidth=0.5, label=f"Women (n={len(df_women_sal):,})")
+
+            men_counts, men_edges = np.histogram(df_men_sal, bins=bins)
+            men_mode_idx = np.argmax(men_counts)
+            men_mode = (men_edges[men_mode_idx] + men_edges[men_mode_idx + 1]) / 2
+
+            women_counts, women_edges = np.histogram(df_women_sal, bins=bins)
+            women_mode_idx = np.argmax(women_counts)
+            women_mode = (women_edges[women_mode_idx] + women_edges[women_mode_idx + 1]) / 2
+
+            ax.axvline(df_men_sal.mean(), color="#3A86FF", linewidth=2, linestyle="--", label=f"Men Mean: ${df_men_sal.mean():,.0f}")
+            ax.axvline(df_women_sal.mean(), color="#FF006E", linewidth=2, linestyle="--", label=f"Women Mean: ${df_women_sal.mean():,.0f}")
+            ax.axvline(df_men_sal.median(), color="#3A86FF", linewidth=2, linestyle="-.", label=f"Men Median: ${df_men_sal.median():,.0f}")
+            ax.axvline(df_women_sal.median(), color="#FF006E", linewidth=2, linestyle="-.", label=f"Women Median: ${df_women_sal.median():,.0f}")
+            ax.axvline(men_mode, color="#3A86FF", linewidth=2, linestyle=":", label=f"Men Mode: ${men_mode:,.0f}")
+            ax.axvline(women_mode, color="#FF006E", linewidth=2, linestyle=":", label=f"Women Mode: ${women_mode:,.0f}")
+
+            ax.set_xlabel("Salary (USD)", fontsize=11)
+            ax.set_ylabel("Number of Respondents", fontsize=11)
+            ax.set_title("Overlaid Salary Distribution — Men vs Women", fontsize=13, fontweight="bold")
+            ax.ticklabel_format(style="plain", axis="x")
+            ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"${x/1000:.0f}K"))
+            ax.grid(axis="y", linestyle="--", alpha=0.4)
+            ax.legend(loc="upper right", fontsize=8, ncol=2)
+            plt.tight_layout()
+            st.pyplot(fig)
+            plt.close(fig)
+
+            gap = df_men_sal.mean() - df_women_sal.mean()
+            gap_pct = (gap / df_men_sal.mean()) * 100
+            men_skew, men_kurt = shape_stats(df_men_sal)
+            women_skew, women_kurt = shape_stats(df_women_sal)
+
+            summary = pd.DataFrame({
+                "Metric": ["Count", "Mean", "Median", "Mode (bin midpoint)", "Std Dev", "Skewness", "Excess Kurtosis"],
+                "Men": [f"{len(df_men_sal):,}", f"${df_men_sal.mean():,.0f}", f"${df_men_sal.median():,.0f}",
+                        f"${men_mode:,.0f}", f"${df_men_sal.std():,.0f}",
+                        f"{men_skew:.4f}", f"{men_kurt:.4f}"],
+                "Women": [f"{len(df_women_sal):,}", f"${df_women_sal.mean():,.0f}", f"${df_women_sal.median():,.0f}",
+                          f"${women_mode:,.0f}", f"${df_women_sal.std():,.0f}",
+                          f"{women_skew:.4f}", f"{women_kurt:.4f}"]
+            })
+            st.dataframe(summary, hide_index=True)
+
+            st.markdown(f"""
+    **Gender Pay Gap Summary:**
+    - Mean salary gap: **${gap:,.0f}** ({gap_pct:.1f}% lower for women)
+    - Men mean: ${df_men_sal.mean():,.0f} | Women mean: ${df_women_sal.mean():,.0f}
+    """)
+        else:
+            st.warning("Not enough data for Men or Women to create the overlay chart.")
 
-    # Set Y-axis range for cleaner look
-    ax2.set_ylim(55000, 145000)
 
-    ax2.set_xticklabels(display_labels, rotation=0)
-    ax2.legend(loc="upper left", bbox_to_anchor=(1, 1))
+if tab_satisfaction.open:
+    with tab_satisfaction:
+        # =========================
+        # JOB SATISFACTION
+        # =========================
+        st.header("Job Satisfaction Analysis")
 
-    # Smaller salary labels
-    for container in ax2.containers:
-        ax2.bar_label(container, fmt="%.0f", padding=2, fontsize=8)
+        df_sat = df.dropna(subset=["JobSatisfaction", "SalaryUSD"]).copy()
 
-    plt.tight_layout()
-    st.pyplot(fig2)
-    plt.close(fig2)
+        # Clean formatting
+        df_sat["JobSatisfaction"] = df_sat["JobSatisfaction"].str.strip().str.lower()
 
-    st.dataframe(salary_compare.round(0))
+        # Logical satisfaction order
+        order = [
+            "very dissatisfied",
+            "somewhat dissatisfied",
+            "somewhat satisfied",
+            "very satisfied"
+        ]
 
-    # -------------------------
-    # 3. Salary by Satisfaction and Gender (2015 vs 2023)
-    # -------------------------
-    st.subheader("Salary by Satisfaction and Gender (2015 vs 2023)")
+        # Display labels (two lines)
+        display_labels = [
+            "Very\nDissatisfied",
+            "Somewhat\nDissatisfied",
+            "Somewhat\nSatisfied",
+            "Very\nSatisfied"
+        ]
 
-    c1, c2 = st.columns(2)
+        # Define satisfied group
+        df_sat["IsSatisfied"] = df_sat["JobSatisfaction"].isin(
+            ["very satisfied", "somewhat satisfied"]
+        )
 
-    def plot_sat_gender(year, container):
+        pct_satisfied = df_sat["IsSatisfied"].mean() * 100
+        st.write(f"Overall Percentage Satisfied: {pct_satisfied:.1f}%")
 
-        df_year = df_sat[df_sat["SurveyYear"] == year]
+        # -------------------------
+        # 1. Satisfaction Distribution (2015 vs 2023)
+        # -------------------------
+        st.subheader("Job Satisfaction Distribution (2015 vs 2023)")
 
-        gender_sat = (
-            df_year
-            .groupby(["JobSatisfaction", "IsFemale"])["SalaryUSD"]
-            .mean()
-            .unstack()
+        dist_2015 = (
+            df_sat[df_sat["SurveyYear"] == 2015]["JobSatisfaction"]
+            .value_counts(normalize=True) * 100
         )
 
-        gender_sat.columns = ["Men Avg Salary", "Women Avg Salary"]
-        gender_sat = gender_sat.reindex(order)
+        dist_2023 = (
+            df_sat[df_sat["SurveyYear"] == 2023]["JobSatisfaction"]
+            .value_counts(normalize=True) * 100
+        )
 
-        fig, ax = plt.subplots(figsize=(6.5, 3.8))
+        dist_compare = pd.concat([dist_2015, dist_2023], axis=1)
+        dist_compare.columns = ["2015 (%)", "2023 (%)"]
+        dist_compare = dist_compare.reindex(order)
+        dist_compare = dist_compare.fillna(0)
 
-        gender_sat.plot(kind="bar", ax=ax)
+        fig, ax = plt.subplots(figsize=(8, 4))
+        dist_compare.plot(kind="bar", ax=ax)
 
-        ax.set_ylabel("Average Salary (USD)")
+        ax.set_ylabel("Percentage of Participants")
         ax.set_xlabel("Satisfaction Level")
-        ax.set_title(f"{year}")
+        ax.set_title("Job Satisfaction Comparison (2015 vs 2023)")
         ax.grid(axis="y", linestyle="--", alpha=0.6)
 
         ax.set_xticklabels(display_labels, rotation=0)
         ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
 
-        for container_bar in ax.containers:
-            ax.bar_label(container_bar, fmt="%.0f", padding=2, fontsize=7)
+        # Smaller percentage labels
+        for container in ax.containers:
+            ax.bar_label(container, fmt="%.1f%%", padding=2, fontsize=8)
 
         plt.tight_layout()
-        container.pyplot(fig)
+        st.pyplot(fig)
+        plt.close(fig)
 
+        st.dataframe(dist_compare.round(2))
 
-    with c1:
-        plot_sat_gender(2015, st)
 
-    with c2:
-        plot_sat_gender(2023, st)
+        # -------------------------
+        # 2. Salary by Satisfaction (2015 vs 2023)
+        # -------------------------
+        st.subheader("Average Salary by Satisfaction Level")
 
+        salary_2015 = (
+            df_sat[df_sat["SurveyYear"] == 2015]
+            .groupby("JobSatisfaction")["SalaryUSD"]
+            .mean()
+        )
 
-    # =========================
+        salary_2023 = (
+            df_sat[df_sat["SurveyYear"] == 2023]
+            .groupby("JobSatisfaction")["SalaryUSD"]
+            .mean()
+        )
 
-with tab_gender:
-    # =========================
-    # GENDER GAP BY EDUCATION
-    # =========================
-    st.header("Gender Salary Gap by Education Level")
+        salary_compare = pd.concat([salary_2015, salary_2023], axis=1)
+        salary_compare.columns = ["2015 Avg Salary", "2023 Avg Salary"]
+        salary_compare = salary_compare.reindex(order)
+        salary_compare = salary_compare.fillna(0)
 
-    df_gender = df.dropna(subset=["SalaryUSD", "LevelOfEducation"]).copy()
+        fig2, ax2 = plt.subplots(figsize=(8, 4))
+        salary_compare.plot(kind="bar", ax=ax2)
 
-    # -------------------------
-    # CLEAN & STANDARDIZE EDUCATION LEVELS
-    # -------------------------
-    df_gender["LevelOfEducation"] = (
-        df_gender["LevelOfEducation"]
-        .str.strip()
-        .str.lower()
-    )
+        ax2.set_ylabel("Average Salary (USD)")
+        ax2.set_xlabel("Satisfaction Level")
+        ax2.set_title("Salary by Job Satisfaction (2015 vs 2023)")
+        ax2.grid(axis="y", linestyle="--", alpha=0.6)
 
-    # Fix encoding issues and duplicates
-    df_gender["LevelOfEducation"] = df_gender["LevelOfEducation"].replace({
-        "undergraduate/bachelor���s degree": "undergraduate or bachelors degree",
-        "undergraduate/bachelor's degree": "undergraduate or bachelors degree",
-        "undergraduate or bachelor’s degree": "undergraduate or bachelors degree",
-        "graduate/master���s degree": "graduate - masters degree",
-        "graduate/master's degree": "graduate - masters degree",
-        "graduate/doctoral degree": "graduate - doctoral degree"
-    })
+        # Set Y-axis range for cleaner look
+        ax2.set_ylim(55000, 145000)
 
-    # -------------------------
-    # DEFINE LOGICAL EDUCATION ORDER
-    # -------------------------
-    edu_order = [
-        "high school",
-        "associate degree",
-        "undergraduate or bachelors degree",
-        "graduate - masters degree",
-        "graduate - doctoral degree"
-    ]
+        ax2.set_xticklabels(display_labels, rotation=0)
+        ax2.legend(loc="upper left", bbox_to_anchor=(1, 1))
 
-    # -------------------------
-    # CALCULATE AVERAGES
-    # -------------------------
-    gender_edu = (
-        df_gender
-        .groupby(["LevelOfEducation", "IsFemale"])["SalaryUSD"]
-        .mean()
-        .unstack()
-    )
+        # Smaller salary labels
+        for container in ax2.containers:
+            ax2.bar_label(container, fmt="%.0f", padding=2, fontsize=8)
 
-    gender_edu.columns = ["Men Avg Salary", "Women Avg Salary"]
+        plt.tight_layout()
+        st.pyplot(fig2)
+        plt.close(fig2)
 
-    # Reorder properly
-    gender_edu = gender_edu.reindex(edu_order)
+        st.dataframe(salary_compare.round(0))
 
-    # Calculate % gap
-    gender_edu["Gap % (Women vs Men)"] = (
-        (gender_edu["Women Avg Salary"] - gender_edu["Men Avg Salary"])
-        / gender_edu["Men Avg Salary"]
-    ) * 100
+        # -------------------------
+        # 3. Salary by Satisfaction and Gender (2015 vs 2023)
+        # -------------------------
+        st.subheader("Salary by Satisfaction and Gender (2015 vs 2023)")
 
-    st.dataframe(gender_edu.round(2))
+        c1, c2 = st.columns(2)
 
-    # -------------------------
-    # MULTI-LINE DISPLAY LABELS
-    # -------------------------
-    display_labels = [
-        "High\nSchool",
-        "Associate\nDegree",
-        "Undergraduate\nBachelor's",
-        "Graduate\nMaster's",
-        "Graduate\nDoctoral"
-    ]
+        def plot_sat_gender(year, container):
 
-    # -------------------------
-    # BAR CHART
-    # -------------------------
-    fig, ax = plt.subplots(figsize=(10, 4))
+            df_year = df_sat[df_sat["SurveyYear"] == year]
 
-    gender_edu[["Men Avg Salary", "Women Avg Salary"]].plot(
-        kind="bar",
-        ax=ax
-    )
+            gender_sat = (
+                df_year
+                .groupby(["JobSatisfaction", "IsFemale"])["SalaryUSD"]
+                .mean()
+                .unstack()
+            )
 
-    ax.set_ylabel("Average Salary (USD)")
-    ax.set_xlabel("Education Level")
-    ax.set_title("Average Salary by Gender and Education")
-    ax.grid(axis="y", linestyle="--", alpha=0.6)
+            gender_sat.columns = ["Men Avg Salary", "Women Avg Salary"]
+            gender_sat = gender_sat.reindex(order)
 
-    # Replace x-axis labels
-    ax.set_xticklabels(display_labels, rotation=0)
+            fig, ax = plt.subplots(figsize=(6.5, 3.8))
 
-    # Legend outside
-    ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
+            gender_sat.plot(kind="bar", ax=ax)
 
-    # Smaller data labels
-    for container in ax.containers:
-        ax.bar_label(container, fmt="%.0f", padding=2, fontsize=8)
+            ax.set_ylabel("Average Salary (USD)")
+            ax.set_xlabel("Satisfaction Level")
+            ax.set_title(f"{year}")
+            ax.grid(axis="y", linestyle="--", alpha=0.6)
 
-    plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
-
-    # =========================
-    # GENDER GAP BY MANAGERIAL ROLE
-    # =========================
-    st.header("Gender Salary Gap by Managerial Role")
-
-    df_mgr = df.dropna(subset=["SalaryUSD", "ManagerialDuties"]).copy()
-
-    gender_mgr = (
-        df_mgr
-        .groupby(["ManagerialDuties", "IsFemale"])["SalaryUSD"]
-        .mean()
-        .unstack()
-    )
-
-    gender_mgr.columns = ["Men Avg Salary", "Women Avg Salary"]
+            ax.set_xticklabels(display_labels, rotation=0)
+            ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
 
-    gender_mgr["Gap %"] = (
-        (gender_mgr["Women Avg Salary"] - gender_mgr["Men Avg Salary"])
-        / gender_mgr["Men Avg Salary"]
-    ) * 100
+            for container_bar in ax.containers:
+                ax.bar_label(container_bar, fmt="%.0f", padding=2, fontsize=7)
 
-    st.dataframe(gender_mgr.round(2))
+            plt.tight_layout()
+            container.pyplot(fig)
 
-    # =========================
-    # GENDER GAP BY EDUCATION + MANAGERIAL (2015 vs 2023)
-    # =========================
-    st.header("Gender Salary Gap by Education and Managerial Duties (2015 vs 2023)")
 
-    df_mgr = df.dropna(subset=["SalaryUSD", "LevelOfEducation", "ManagerialDuties"]).copy()
+        with c1:
+            plot_sat_gender(2015, st)
 
-    # Clean education text (same standardization you used earlier)
-    df_mgr["LevelOfEducation"] = (
-        df_mgr["LevelOfEducation"]
-        .str.strip()
-        .str.lower()
-    )
+        with c2:
+            plot_sat_gender(2023, st)
 
-    df_mgr["LevelOfEducation"] = df_mgr["LevelOfEducation"].replace({
-        "undergraduate/bachelor���s degree": "undergraduate or bachelors degree",
-        "undergraduate/bachelor's degree": "undergraduate or bachelors degree",
-        "undergraduate or bachelor’s degree": "undergraduate or bachelors degree",
-        "graduate/master���s degree": "graduate - masters degree",
-        "graduate/master's degree": "graduate - masters degree",
-        "graduate/doctoral degree": "graduate - doctoral degree"
-    })
 
-    edu_order = [
-        "high school",
-        "associate degree",
-        "undergraduate or bachelors degree",
-        "graduate - masters degree",
-        "graduate - doctoral degree"
-    ]
+if tab_gender.open:
+    from oaxaca import oaxaca_blinder
 
-    display_labels = [
-        "High\nSchool",
-        "Associate\nDegree",
-        "Undergraduate\nBachelor's",
-        "Graduate\nMaster's",
-        "Graduate\nDoctoral"
-    ]
+    with tab_gender:
+        # =========================
+        # GENDER GAP BY EDUCATION
+        # =========================
+        st.header("Gender Salary Gap by Education Level")
 
-    # Convert managerial to boolean
-    df_mgr["IsManager"] = df_mgr["ManagerialDuties"].astype(str).str.contains("Yes", case=False, na=False)
+        df_gender = df.dropna(subset=["SalaryUSD", "LevelOfEducation"]).copy()
 
-    # Function to build chart per year
-    def plot_mgr_year(year):
+        # -------------------------
+        # CLEAN & STANDARDIZE EDUCATION LEVELS
+        # -------------------------
+        df_gender["LevelOfEducation"] = (
+            df_gender["LevelOfEducation"]
+            .str.strip()
+            .str.lower()
+        )
 
-        st.subheader(f"{year} – Managers Only")
+        # Fix encoding issues and duplicates
+        df_gender["LevelOfEducation"] = df_gender["LevelOfEducation"].replace({
+            "undergraduate/bachelor���s degree": "undergraduate or bachelors degree",
+            "undergraduate/bachelor's degree": "undergraduate or bachelors degree",
+            "undergraduate or bachelor’s degree": "undergraduate or bachelors degree",
+            "graduate/master���s degree": "graduate - masters degree",
+            "graduate/master's degree": "graduate - masters degree",
+            "graduate/doctoral degree": "graduate - doctoral degree"
+        })
 
-        df_year = df_mgr[(df_mgr["SurveyYear"] == year) & (df_mgr["IsManager"] == True)]
+        # -------------------------
+        # DEFINE LOGICAL EDUCATION ORDER
+        # -------------------------
+        edu_order = [
+            "high school",
+            "associate degree",
+            "undergraduate or bachelors degree",
+            "graduate - masters degree",
+            "graduate - doctoral degree"
+        ]
 
-        gender_edu_mgr = (
-            df_year
+        # -------------------------
+        # CALCULATE AVERAGES
+        # -------------------------
+        gender_edu = (
+            df_gender
             .groupby(["LevelOfEducation", "IsFemale"])["SalaryUSD"]
             .mean()
             .unstack()
         )
 
-        gender_edu_mgr.columns = ["Men Avg Salary", "Women Avg Salary"]
+        gender_edu.columns = ["Men Avg Salary", "Women Avg Salary"]
 
-        gender_edu_mgr = gender_edu_mgr.reindex(edu_order)
+        # Reorder properly
+        gender_edu = gender_edu.reindex(edu_order)
 
-        gender_edu_mgr["Gap %"] = (
-            (gender_edu_mgr["Women Avg Salary"] - gender_edu_mgr["Men Avg Salary"])
-            / gender_edu_mgr["Men Avg Salary"]
+        # Calculate % gap
+        gender_edu["Gap % (Women vs Men)"] = (
+            (gender_edu["Women Avg Salary"] - gender_edu["Men Avg Salary"])
+            / gender_edu["Men Avg Salary"]
         ) * 100
 
-        st.dataframe(gender_edu_mgr.round(2))
+        st.dataframe(gender_edu.round(2))
+
+        # -------------------------
+        # MULTI-LINE DISPLAY LABELS
+        # -------------------------
+        display_labels = [
+            "High\nSchool",
+            "Associate\nDegree",
+            "Undergraduate\nBachelor's",
+            "Graduate\nMaster's",
+            "Graduate\nDoctoral"
+        ]
 
+        # -------------------------
+        # BAR CHART
+        # -------------------------
         fig, ax = plt.subplots(figsize=(10, 4))
 
-        gender_edu_mgr[["Men Avg Salary", "Women Avg Salary"]].plot(
+        gender_edu[["Men Avg Salary", "Women Avg Salary"]].plot(
             kind="bar",
             ax=ax
         )
 
         ax.set_ylabel("Average Salary (USD)")
         ax.set_xlabel("Education Level")
-        ax.set_title(f"Managers – Average Salary by Gender and Education ({year})")
+        ax.set_title("Average Salary by Gender and Education")
         ax.grid(axis="y", linestyle="--", alpha=0.6)
 
+        # Replace x-axis labels
         ax.set_xticklabels(display_labels, rotation=0)
+
+        # Legend outside
         ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
 
+        # Smaller data labels
         for container in ax.containers:
             ax.bar_label(container, fmt="%.0f", padding=2, fontsize=8)
 
@@ -800,1327 +834,1336 @@ with tab_gender:
         st.pyplot(fig)
         plt.close(fig)
 
-    # Plot for both years
-    plot_mgr_year(2015)
-    plot_mgr_year(2023)
+        # =========================
+        # GENDER GAP BY MANAGERIAL ROLE
+        # =========================
+        st.header("Gender Salary Gap by Managerial Role")
 
-    # =========================
-    # GENDER GAP BY CERTIFICATION
-    # =========================
-    st.header("Gender Salary Gap by Certification")
+        df_mgr = df.dropna(subset=["SalaryUSD", "ManagerialDuties"]).copy()
 
-    gender_cert = (
-        df
-        .groupby(["IsCertified", "IsFemale"])["SalaryUSD"]
-        .mean()
-        .unstack()
-    )
+        gender_mgr = (
+            df_mgr
+            .groupby(["ManagerialDuties", "IsFemale"])["SalaryUSD"]
+            .mean()
+            .unstack()
+        )
 
-    gender_cert.columns = ["Men Avg Salary", "Women Avg Salary"]
+        gender_mgr.columns = ["Men Avg Salary", "Women Avg Salary"]
 
-    gender_cert["Gap %"] = (
-        (gender_cert["Women Avg Salary"] - gender_cert["Men Avg Salary"])
-        / gender_cert["Men Avg Salary"]
-    ) * 100
+        gender_mgr["Gap %"] = (
+            (gender_mgr["Women Avg Salary"] - gender_mgr["Men Avg Salary"])
+            / gender_mgr["Men Avg Salary"]
+        ) * 100
 
-    st.dataframe(gender_cert.round(2))
+        st.dataframe(gender_mgr.round(2))
 
-    # =========================
-    # GENDER GAP BY EDUCATION + CERTIFICATION (2015 vs 2023)
-    # =========================
-    st.header("Gender Salary Gap by Education and Certification (2015 vs 2023)")
+        # =========================
+        # GENDER GAP BY EDUCATION + MANAGERIAL (2015 vs 2023)
+        # =========================
+        st.header("Gender Salary Gap by Education and Managerial Duties (2015 vs 2023)")
 
-    df_cert = df.dropna(subset=["SalaryUSD", "LevelOfEducation", "IsCertified"]).copy()
+        df_mgr = df.dropna(subset=["SalaryUSD", "LevelOfEducation", "ManagerialDuties"]).copy()
 
-    # Clean education text (same standardization)
-    df_cert["LevelOfEducation"] = (
-        df_cert["LevelOfEducation"]
-        .str.strip()
-        .str.lower()
-    )
+        # Clean education text (same standardization you used earlier)
+        df_mgr["LevelOfEducation"] = (
+            df_mgr["LevelOfEducation"]
+            .str.strip()
+            .str.lower()
+        )
 
-    df_cert["LevelOfEducation"] = df_cert["LevelOfEducation"].replace({
-        "undergraduate/bachelor���s degree": "undergraduate or bachelors degree",
-        "undergraduate/bachelor's degree": "undergraduate or bachelors degree",
-        "undergraduate or bachelor’s degree": "undergraduate or bachelors degree",
-        "graduate/master���s degree": "graduate - masters degree",
-        "graduate/master's degree": "graduate - masters degree",
-        "graduate/doctoral degree": "graduate - doctoral degree"
-    })
+        df_mgr["LevelOfEducation"] = df_mgr["LevelOfEducation"].replace({
+            "undergraduate/bachelor���s degree": "undergraduate or bachelors degree",
+            "undergraduate/bachelor's degree": "undergraduate or bachelors degree",
+            "undergraduate or bachelor’s degree": "undergraduate or bachelors degree",
+            "graduate/master���s degree": "graduate - masters degree",
+            "graduate/master's degree": "graduate - masters degree",
+            "graduate/doctoral degree": "graduate - doctoral degree"
+        })
 
-    edu_order = [
-        "high school",
-        "associate degree",
-        "undergraduate or bachelors degree",
-        "graduate - masters degree",
-        "graduate - doctoral degree"
-    ]
-
-    display_labels = [
-        "High\nSchool",
-        "Associate\nDegree",
-        "Undergraduate\nBachelor's",
-        "Graduate\nMaster's",
-        "Graduate\nDoctoral"
-    ]
-
-    # Function to build chart per year (Certified Only)
-    def plot_cert_year(year):
-
-        st.subheader(f"{year} – Certified Professionals Only")
-
-        df_year = df_cert[
-            (df_cert["SurveyYear"] == year) &
-            (df_cert["IsCertified"] == True)
+        edu_order = [
+            "high school",
+            "associate degree",
+            "undergraduate or bachelors degree",
+            "graduate - masters degree",
+            "graduate - doctoral degree"
         ]
 
-        gender_edu_cert = (
-            df_year
-            .groupby(["LevelOfEducation", "IsFemale"])["SalaryUSD"]
+        display_labels = [
+            "High\nSchool",
+            "Associate\nDegree",
+            "Undergraduate\nBachelor's",
+            "Graduate\nMaster's",
+            "Graduate\nDoctoral"
+        ]
+
+        # Convert managerial to boolean
+        df_mgr["IsManager"] = df_mgr["ManagerialDuties"].astype(str).str.contains("Yes", case=False, na=False)
+
+        # Function to build chart per year
+        def plot_mgr_year(year):
+
+            st.subheader(f"{year} – Managers Only")
+
+            df_year = df_mgr[(df_mgr["SurveyYear"] == year) & (df_mgr["IsManager"] == True)]
+
+            gender_edu_mgr = (
+                df_year
+                .groupby(["LevelOfEducation", "IsFemale"])["SalaryUSD"]
+                .mean()
+                .unstack()
+            )
+
+            gender_edu_mgr.columns = ["Men Avg Salary", "Women Avg Salary"]
+
+            gender_edu_mgr = gender_edu_mgr.reindex(edu_order)
+
+            gender_edu_mgr["Gap %"] = (
+                (gender_edu_mgr["Women Avg Salary"] - gender_edu_mgr["Men Avg Salary"])
+                / gender_edu_mgr["Men Avg Salary"]
+            ) * 100
+
+            st.dataframe(gender_edu_mgr.round(2))
+
+            fig, ax = plt.subplots(figsize=(10, 4))
+
+            gender_edu_mgr[["Men Avg Salary", "Women Avg Salary"]].plot(
+                kind="bar",
+                ax=ax
+            )
+
+            ax.set_ylabel("Average Salary (USD)")
+            ax.set_xlabel("Education Level")
+            ax.set_title(f"Managers – Average Salary by Gender and Education ({year})")
+            ax.grid(axis="y", linestyle="--", alpha=0.6)
+
+            ax.set_xticklabels(display_labels, rotation=0)
+            ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
+
+            for container in ax.containers:
+                ax.bar_label(container, fmt="%.0f", padding=2, fontsize=8)
+
+            plt.tight_layout()
+            st.pyplot(fig)
+            plt.close(fig)
+
+        # Plot for both years
+        plot_mgr_year(2015)
+        plot_mgr_year(2023)
+
+        # =========================
+        # GENDER GAP BY CERTIFICATION
+        # =========================
+        st.header("Gender Salary Gap by Certification")
+
+        gender_cert = (
+            df
+            .groupby(["IsCertified", "IsFemale"])["SalaryUSD"]
             .mean()
             .unstack()
         )
 
-        gender_edu_cert.columns = ["Men Avg Salary", "Women Avg Salary"]
-
-        gender_edu_cert = gender_edu_cert.reindex(edu_order)
+        gender_cert.columns = ["Men Avg Salary", "Women Avg Salary"]
 
-        gender_edu_cert["Gap %"] = (
-            (gender_edu_cert["Women Avg Salary"] - gender_edu_cert["Men Avg Salary"])
-            / gender_edu_cert["Men Avg Salary"]
+        gender_cert["Gap %"] = (
+            (gender_cert["Women Avg Salary"] - gender_cert["Men Avg Salary"])
+            / gender_cert["Men Avg Salary"]
         ) * 100
 
-        st.dataframe(gender_edu_cert.round(2))
+        st.dataframe(gender_cert.round(2))
 
-        fig, ax = plt.subplots(figsize=(10, 4))
+        # =========================
+        # GENDER GAP BY EDUCATION + CERTIFICATION (2015 vs 2023)
+        # =========================
+        st.header("Gender Salary Gap by Education and Certification (2015 vs 2023)")
 
-        gender_edu_cert[["Men Avg Salary", "Women Avg Salary"]].plot(
-            kind="bar",
-            ax=ax
+        df_cert = df.dropna(subset=["SalaryUSD", "LevelOfEducation", "IsCertified"]).copy()
+
+        # Clean education text (same standardization)
+        df_cert["LevelOfEducation"] = (
+            df_cert["LevelOfEducation"]
+            .str.strip()
+            .str.lower()
         )
 
-        ax.set_ylabel("Average Salary (USD)")
-        ax.set_xlabel("Education Level")
-        ax.set_title(f"Certified Professionals – Salary by Gender and Education ({year})")
-        ax.grid(axis="y", linestyle="--", alpha=0.6)
+        df_cert["LevelOfEducation"] = df_cert["LevelOfEducation"].replace({
+            "undergraduate/bachelor���s degree": "undergraduate or bachelors degree",
+            "undergraduate/bachelor's degree": "undergraduate or bachelors degree",
+            "undergraduate or bachelor’s degree": "undergraduate or bachelors degree",
+            "graduate/master���s degree": "graduate - masters degree",
+            "graduate/master's degree": "graduate - masters degree",
+            "graduate/doctoral degree": "graduate - doctoral degree"
+        })
 
-        ax.set_xticklabels(display_labels, rotation=0)
-        ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
+        edu_order = [
+            "high school",
+            "associate degree",
+            "undergraduate or bachelors degree",
+            "graduate - masters degree",
+            "graduate - doctoral degree"
+        ]
 
-        for container in ax.containers:
-            ax.bar_label(container, fmt="%.0f", padding=2, fontsize=8)
+        display_labels = [
+            "High\nSchool",
+            "Associate\nDegree",
+            "Undergraduate\nBachelor's",
+            "Graduate\nMaster's",
+            "Graduate\nDoctoral"
+        ]
 
-        plt.tight_layout()
-        st.pyplot(fig)
-        plt.close(fig)
+        # Function to build chart per year (Certified Only)
+        def plot_cert_year(year):
 
-    # Plot for both years
-    plot_cert_year(2015)
-    plot_cert_year(2023)
+            st.subheader(f"{year} – Certified Professionals Only")
 
-    # =========================
-    # GENDER GAP BY INDUSTRY (2015 vs 2023)
-    # =========================
-    st.header("Gender Salary Gap by Industry (2015 vs 2023)")
+            df_year = df_cert[
+                (df_cert["SurveyYear"] == year) &
+                (df_cert["IsCertified"] == True)
+            ]
 
-    # -------------------------
-    # CLEAN INDUSTRY NAMES
-    # -------------------------
-    df_ind = df.dropna(subset=["SalaryUSD", "Industry"]).copy()
+            gender_edu_cert = (
+                df_year
+                .groupby(["LevelOfEducation", "IsFemale"])["SalaryUSD"]
+                .mean()
+                .unstack()
+            )
 
-    df_ind["Industry"] = df_ind["Industry"].str.strip().str.lower()
+            gender_edu_cert.columns = ["Men Avg Salary", "Women Avg Salary"]
 
-    df_ind["Industry"] = df_ind["Industry"].replace({
-        "power generation/utilities": "power generation or utilities",
-        "oil/gas production": "oil or gas production",
-        "mining/minerals": "mining or minerals",
-        "enginer": "engineering",
-        "other (please specify)": "other"
-    })
+            gender_edu_cert = gender_edu_cert.reindex(edu_order)
 
-    # -------------------------
-    # KEEP TOP INDUSTRIES ONLY
-    # -------------------------
-    top_industries = df_ind["Industry"].value_counts().head(8).index
-    df_ind = df_ind[df_ind["Industry"].isin(top_industries)]
+            gender_edu_cert["Gap %"] = (
+                (gender_edu_cert["Women Avg Salary"] - gender_edu_cert["Men Avg Salary"])
+                / gender_edu_cert["Men Avg Salary"]
+            ) * 100
 
-    # -------------------------
-    # FUNCTION TO FORMAT LABELS
-    # -------------------------
-    def format_label(ind):
-        words = ind.title().split()
-        if len(words) > 2:
-            return " ".join(words[:2]) + "\n" + " ".join(words[2:])
-        elif len(words) == 2:
-            return words[0] + "\n" + words[1]
-        else:
-            return ind.title()
+            st.dataframe(gender_edu_cert.round(2))
 
-    # -------------------------
-    # FUNCTION TO PLOT PER YEAR
-    # -------------------------
-    def plot_industry_year(year):
+            fig, ax = plt.subplots(figsize=(10, 4))
 
-        st.subheader(f"{year}")
+            gender_edu_cert[["Men Avg Salary", "Women Avg Salary"]].plot(
+                kind="bar",
+                ax=ax
+            )
 
-        df_year = df_ind[df_ind["SurveyYear"] == year]
+            ax.set_ylabel("Average Salary (USD)")
+            ax.set_xlabel("Education Level")
+            ax.set_title(f"Certified Professionals – Salary by Gender and Education ({year})")
+            ax.grid(axis="y", linestyle="--", alpha=0.6)
 
-        gender_ind = (
-            df_year
-            .groupby(["Industry", "IsFemale"])["SalaryUSD"]
-            .mean()
-            .unstack()
-        )
+            ax.set_xticklabels(display_labels, rotation=0)
+            ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
 
-        gender_ind.columns = ["Men Avg Salary", "Women Avg Salary"]
+            for container in ax.containers:
+                ax.bar_label(container, fmt="%.0f", padding=2, fontsize=8)
 
-        gender_ind["Gap %"] = (
-            (gender_ind["Women Avg Salary"] - gender_ind["Men Avg Salary"])
-            / gender_ind["Men Avg Salary"]
-        ) * 100
+            plt.tight_layout()
+            st.pyplot(fig)
+            plt.close(fig)
 
-        st.dataframe(gender_ind.round(2))
+        # Plot for both years
+        plot_cert_year(2015)
+        plot_cert_year(2023)
 
-        fig, ax = plt.subplots(figsize=(11, 4))
+        # =========================
+        # GENDER GAP BY INDUSTRY (2015 vs 2023)
+        # =========================
+        st.header("Gender Salary Gap by Industry (2015 vs 2023)")
 
-        gender_ind[["Men Avg Salary", "Women Avg Salary"]].plot(
-            kind="bar",
-            ax=ax
-        )
+        # -------------------------
+        # CLEAN INDUSTRY NAMES
+        # -------------------------
+        df_ind = df.dropna(subset=["SalaryUSD", "Industry"]).copy()
 
-        ax.set_ylabel("Average Salary (USD)")
-        ax.set_xlabel("Industry")
-        ax.set_title(f"Average Salary by Gender and Industry ({year})")
-        ax.grid(axis="y", linestyle="--", alpha=0.6)
+        df_ind["Industry"] = df_ind["Industry"].str.strip().str.lower()
 
-        # Two-line formatted labels
-        formatted_labels = [format_label(ind) for ind in gender_ind.index]
-        ax.set_xticklabels(formatted_labels, rotation=0)
+        df_ind["Industry"] = df_ind["Industry"].replace({
+            "power generation/utilities": "power generation or utilities",
+            "oil/gas production": "oil or gas production",
+            "mining/minerals": "mining or minerals",
+            "enginer": "engineering",
+            "other (please specify)": "other"
+        })
 
-        # Legend outside
-        ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
+        # -------------------------
+        # KEEP TOP INDUSTRIES ONLY
+        # -------------------------
+        top_industries = df_ind["Industry"].value_counts().head(8).index
+        # The smaller industries pooled, for the bootstrap breakdown below
+        industry_top8 = df_ind["Industry"].where(df_ind["Industry"].isin(top_industries), "other")
+        df_ind = df_ind[df_ind["Industry"].isin(top_industries)]
+
+        # -------------------------
+        # FUNCTION TO FORMAT LABELS
+        # -------------------------
+        def format_label(ind):
+            words = ind.title().split()
+            if len(words) > 2:
+                return " ".join(words[:2]) + "\n" + " ".join(words[2:])
+            elif len(words) == 2:
+                return words[0] + "\n" + words[1]
+            else:
+                return ind.title()
 
-        # Data labels
-        for container in ax.containers:
-            ax.bar_label(container, fmt="%.0f", padding=2, fontsize=7)
+        # -------------------------
+        # FUNCTION TO PLOT PER YEAR
+        # -------------------------
+        def plot_industry_year(year):
 
-        plt.tight_layout()
-        st.pyplot(fig)
-        plt.close(fig)
+            st.subheader(f"{year}")
 
+            df_year = df_ind[df_ind["SurveyYear"] == year]
 
-    # -------------------------
-    # PLOT BOTH YEARS
-    # -------------------------
-    plot_industry_year(2015)
-    plot_industry_year(2023)
+            gender_ind = (
+                df_year
+                .groupby(["Industry", "IsFemale"])["SalaryUSD"]
+                .mean()
+                .unstack()
+            )
 
-    # =========================
-    # GENDER GAP BY CONSULTING STATUS (2015 vs 2023)
-    # =========================
-    st.header("Gender Salary Gap by Consulting Status (2015 vs 2023)")
+            gender_ind.columns = ["Men Avg Salary", "Women Avg Salary"]
 
-    # Clean consulting column
-    df_consult = df.dropna(subset=["SalaryUSD", "Consult"]).copy()
+            gender_ind["Gap %"] = (
+                (gender_ind["Women Avg Salary"] - gender_ind["Men Avg Salary"])
+                / gender_ind["Men Avg Salary"]
+            ) * 100
 
-    df_consult["IsConsultant"] = (
-        df_consult["Consult"]
-        .astype(str)
-        .str.contains("Yes", case=False, na=False)
-    )
+            st.dataframe(gender_ind.round(2))
 
-    def plot_consult_year(year):
+            fig, ax = plt.subplots(figsize=(11, 4))
 
-        st.subheader(f"{year}")
+            gender_ind[["Men Avg Salary", "Women Avg Salary"]].plot(
+                kind="bar",
+                ax=ax
+            )
 
-        df_year = df_consult[df_consult["SurveyYear"] == year]
+            ax.set_ylabel("Average Salary (USD)")
+            ax.set_xlabel("Industry")
+            ax.set_title(f"Average Salary by Gender and Industry ({year})")
+            ax.grid(axis="y", linestyle="--", alpha=0.6)
 
-        gender_consult = (
-            df_year
-            .groupby(["IsConsultant", "IsFemale"])["SalaryUSD"]
-            .mean()
-            .unstack()
-        )
+            # Two-line formatted labels
+            formatted_labels = [format_label(ind) for ind in gender_ind.index]
+            ax.set_xticklabels(formatted_labels, rotation=0)
 
-        gender_consult.columns = ["Men Avg Salary", "Women Avg Salary"]
+            # Legend outside
+            ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
 
-        gender_consult["Gap %"] = (
-            (gender_consult["Women Avg Salary"] - gender_consult["Men Avg Salary"])
-            / gender_consult["Men Avg Salary"]
-        ) * 100
+            # Data labels
+            for container in ax.containers:
+                ax.bar_label(container, fmt="%.0f", padding=2, fontsize=7)
 
-        # Rename index for display
-        gender_consult.index = ["Non-Consultant", "Consultant"]
+            plt.tight_layout()
+            st.pyplot(fig)
+            plt.close(fig)
 
-        st.dataframe(gender_consult.round(2))
 
-        fig, ax = plt.subplots(figsize=(8, 4))
+        # -------------------------
+        # PLOT BOTH YEARS
+        # -------------------------
+        plot_industry_year(2015)
+        plot_industry_year(2023)
 
-        gender_consult[["Men Avg Salary", "Women Avg Salary"]].plot(
-            kind="bar",
-            ax=ax
-        )
+        # =========================
+        # GENDER GAP BY CONSULTING STATUS (2015 vs 2023)
+        # =========================
+        st.header("Gender Salary Gap by Consulting Status (2015 vs 2023)")
 
-        ax.set_xticklabels(gender_consult.index, rotation=0)
+        # Clean consulting column
+        df_consult = df.dropna(subset=["SalaryUSD", "Consult"]).copy()
 
-        ax.set_ylabel("Average Salary (USD)")
-        ax.set_xlabel("Consulting Status")
-        ax.set_title(f"Average Salary by Gender and Consulting Status ({year})")
-        ax.grid(axis="y", linestyle="--", alpha=0.6)
+        df_consult["IsConsultant"] = (
+            df_consult["Consult"]
+            .astype(str)
+            .str.contains("Yes", case=False, na=False)
+        )
 
-        ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
+        def plot_consult_year(year):
 
-        for container in ax.containers:
-            ax.bar_label(container, fmt="%.0f", padding=2, fontsize=8)
+            st.subheader(f"{year}")
 
-        plt.tight_layout()
-        st.pyplot(fig)
-        plt.close(fig)
+            df_year = df_consult[df_consult["SurveyYear"] == year]
 
+            gender_consult = (
+                df_year
+                .groupby(["IsConsultant", "IsFemale"])["SalaryUSD"]
+                .mean()
+                .unstack()
+            )
 
-    plot_consult_year(2015)
-    plot_consult_year(2023)
+            gender_consult.columns = ["Men Avg Salary", "Women Avg Salary"]
 
+            gender_consult["Gap %"] = (
+                (gender_consult["Women Avg Salary"] - gender_consult["Men Avg Salary"])
+                / gender_consult["Men Avg Salary"]
+            ) * 100
 
-    # =========================
-    # GENDER GAP BY PROJECT TYPE (2015 vs 2023)
-    # =========================
-    st.header("Gender Salary Gap by Project Type (2015 vs 2023)")
+            # Rename index for display
+            gender_consult.index = ["Non-Consultant", "Consultant"]
 
-    project_cols = [
-        "ProjectType1","ProjectType2","ProjectType3","ProjectType4",
-        "ProjectType5","ProjectType6","ProjectType7","ProjectType8",
-        "ProjectType9","ProjectType10","ProjectType11","ProjectType12",
-        "ProjectType13","ProjectType14"
-    ]
+            st.dataframe(gender_consult.round(2))
 
-    df_proj = df.dropna(subset=["SalaryUSD"]).copy()
+            fig, ax = plt.subplots(figsize=(8, 4))
 
-    df_proj_long = df_proj.melt(
-        id_vars=["SalaryUSD", "IsFemale", "SurveyYear"],
-        value_vars=project_cols,
-        value_name="ProjectType"
-    )
+            gender_consult[["Men Avg Salary", "Women Avg Salary"]].plot(
+                kind="bar",
+                ax=ax
+            )
 
-    df_proj_long = df_proj_long.dropna(subset=["ProjectType"])
-    df_proj_long["ProjectType"] = df_proj_long["ProjectType"].str.strip()
+            ax.set_xticklabels(gender_consult.index, rotation=0)
 
-    # -------------------------
-    # Label formatting function (2 lines)
-    # -------------------------
-    def format_project_label(name):
-        words = name.split()
-        if len(words) > 2:
-            mid = len(words) // 2
-            return " ".join(words[:mid]) + "\n" + " ".join(words[mid:])
-        else:
-            return name
+            ax.set_ylabel("Average Salary (USD)")
+            ax.set_xlabel("Consulting Status")
+            ax.set_title(f"Average Salary by Gender and Consulting Status ({year})")
+            ax.grid(axis="y", linestyle="--", alpha=0.6)
 
-    # -------------------------
-    # Plot Function
-    # -------------------------
-    def plot_project_year(year):
+            ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
 
-        st.subheader(f"{year}")
+            for container in ax.containers:
+                ax.bar_label(container, fmt="%.0f", padding=2, fontsize=8)
 
-        df_year = df_proj_long[df_proj_long["SurveyYear"] == year]
+            plt.tight_layout()
+            st.pyplot(fig)
+            plt.close(fig)
 
-        gender_proj = (
-            df_year
-            .groupby(["ProjectType", "IsFemale"])["SalaryUSD"]
-            .mean()
-            .unstack()
-        )
 
-        gender_proj.columns = ["Men Avg Salary", "Women Avg Salary"]
+        plot_consult_year(2015)
+        plot_consult_year(2023)
 
-        gender_proj["Gap %"] = (
-            (gender_proj["Women Avg Salary"] - gender_proj["Men Avg Salary"])
-            / gender_proj["Men Avg Salary"]
-        ) * 100
 
-        st.dataframe(gender_proj.round(2))
+        # =========================
+        # GENDER GAP BY PROJECT TYPE (2015 vs 2023)
+        # =========================
+        st.header("Gender Salary Gap by Project Type (2015 vs 2023)")
 
-        fig, ax = plt.subplots(figsize=(16, 5))
+        project_cols = [
+            "ProjectType1","ProjectType2","ProjectType3","ProjectType4",
+            "ProjectType5","ProjectType6","ProjectType7","ProjectType8",
+            "ProjectType9","ProjectType10","ProjectType11","ProjectType12",
+            "ProjectType13","ProjectType14"
+        ]
 
-        gender_proj[["Men Avg Salary", "Women Avg Salary"]].plot(
-            kind="bar",
-            ax=ax
+        df_proj = df.dropna(subset=["SalaryUSD"]).copy()
+
+        df_proj_long = df_proj.melt(
+            id_vars=["SalaryUSD", "IsFemale", "SurveyYear"],
+            value_vars=project_cols,
+            value_name="ProjectType"
         )
 
-        ax.set_ylabel("Average Salary (USD)")
-        ax.set_xlabel("Project Type")
-        ax.set_title(f"Average Salary by Gender and Project Type ({year})")
-        ax.grid(axis="y", linestyle="--", alpha=0.6)
+        df_proj_long = df_proj_long.dropna(subset=["ProjectType"])
+        df_proj_long["ProjectType"] = df_proj_long["ProjectType"].str.strip()
+
+        # -------------------------
+        # Label formatting function (2 lines)
+        # -------------------------
+        def format_project_label(name):
+            words = name.split()
+            if len(words) > 2:
+                mid = len(words) // 2
+                return " ".join(words[:mid]) + "\n" + " ".join(words[mid:])
+            else:
+                return name
 
-        # Two-line labels
-        formatted_labels = [format_project_label(p) for p in gender_proj.index]
-        ax.set_xticklabels(formatted_labels, rotation=25, ha="right")
+        # -------------------------
+        # Plot Function
+        # -------------------------
+        def plot_project_year(year):
 
-        ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
+            st.subheader(f"{year}")
 
-        for container in ax.containers:
-            ax.bar_label(container, fmt="%.0f", padding=2, fontsize=7)
+            df_year = df_proj_long[df_proj_long["SurveyYear"] == year]
 
-        plt.tight_layout()
-        st.pyplot(fig)
-        plt.close(fig)
+            gender_proj = (
+                df_year
+                .groupby(["ProjectType", "IsFemale"])["SalaryUSD"]
+                .mean()
+                .unstack()
+            )
 
-    plot_project_year(2015)
-    plot_project_year(2023)
+            gender_proj.columns = ["Men Avg Salary", "Women Avg Salary"]
 
-    # =========================
+            gender_proj["Gap %"] = (
+                (gender_proj["Women Avg Salary"] - gender_proj["Men Avg Salary"])
+                / gender_proj["Men Avg Salary"]
+            ) * 100
 
-with tab_certification:
-    # =========================
-    # CLEAN CERTIFICATION TYPES
-    # =========================
+            st.dataframe(gender_proj.round(2))
 
-    cert_columns = [
-        "CertType1","CertType2","CertType3","CertType4",
-        "CertType5","CertType6","CertType7","CertType8"
-    ]
+            fig, ax = plt.subplots(figsize=(16, 5))
 
-    cert_codes = ["CCP","CCT","CEP","CFCC","CST","DRMP","EVP","PSP"]
+            gender_proj[["Men Avg Salary", "Women Avg Salary"]].plot(
+                kind="bar",
+                ax=ax
+            )
 
-    # Create clean indicator columns for each certification
-    for cert in cert_codes:
+            ax.set_ylabel("Average Salary (USD)")
+            ax.set_xlabel("Project Type")
+            ax.set_title(f"Average Salary by Gender and Project Type ({year})")
+            ax.grid(axis="y", linestyle="--", alpha=0.6)
 
-        mask = False
+            # Two-line labels
+            formatted_labels = [format_project_label(p) for p in gender_proj.index]
+            ax.set_xticklabels(formatted_labels, rotation=25, ha="right")
 
-        for col in cert_columns:
-            mask |= df[col].astype(str).str.upper().str.startswith(cert)
+            ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
 
-        df[f"Has_{cert}"] = mask
+            for container in ax.containers:
+                ax.bar_label(container, fmt="%.0f", padding=2, fontsize=7)
 
-    st.header("Salary by Certification Type (2015 vs 2023)")
+            plt.tight_layout()
+            st.pyplot(fig)
+            plt.close(fig)
 
-    def cert_salary_by_year(year):
+        plot_project_year(2015)
+        plot_project_year(2023)
 
-        df_year = df[df["SurveyYear"] == year]
+        # =========================
+        # GENDER GAP CONFIDENCE INTERVALS (BOOTSTRAP)
+        # =========================
+        st.header("Gender Gap Confidence Intervals (2015 vs 2023)")
+        st.markdown("""
+    Many of the cells above hold only a handful of women, so their gaps are noisy.
+    Each gap below comes with a **95% bootstrap interval** (2,000 resamples drawn within
+    survey year × sex). **BCa** corrects the plain percentile interval for bias and skew;
+    an interval that contains 0 means the gap is not distinguishable from no gap.
+    """)
 
-        result = {}
+        # Same cleaning as the sections above, aligned on the respondent index
+        df_gap = df.dropna(subset=["SalaryUSD"]).copy()
+        df_gap["Education"] = df_gender["LevelOfEducation"]
+        df_gap["IsManager"] = (
+            df_gap["ManagerialDuties"].astype(str).str.contains("Yes", case=False, na=False)
+            .where(df_gap["ManagerialDuties"].notna())
+        )
+        df_gap["Industry"] = industry_top8.reindex(df_gap.index, fill_value="unknown")
+        df_gap["IsConsultant"] = df_consult["IsConsultant"]
 
-        for cert in cert_codes:
-            cert_df = df_year[df_year[f"Has_{cert}"] == True]
+        gap_breakdowns = {
+            "Education": ["Education"],
+            "Managerial Role": ["IsManager"],
+            "Certification": ["IsCertified"],
+            "Industry (Top 8 + Other)": ["Industry"],
+            "Consulting Status": ["IsConsultant"],
+            "Education × Managerial Role × Industry": ["Education", "IsManager", "Industry"],
+        }
 
-            if len(cert_df) > 5:
-                result[cert] = cert_df["SalaryUSD"].mean()
+        gap_breakdown = st.selectbox("Breakdown", list(gap_breakdowns), key="gap_ci_breakdown")
+        gap_cells = gap_breakdowns[gap_breakdown] + ["SurveyYear"]
 
-        return pd.Series(result)
+        gap_ci = gap_bootstrap(df_gap[gap_cells + ["SalaryUSD", "IsFemale"]], cells=gap_cells)
+        st.dataframe(gap_ci.round(2))
 
+        # =========================
+        # OAXACA–BLINDER DECOMPOSITION
+        # =========================
+        st.header("Explained vs Unexplained Gender Gap (Oaxaca–Blinder, 2015 vs 2023)")
 
-    salary_2015 = cert_salary_by_year(2015)
-    salary_2023 = cert_salary_by_year(2023)
+        st.markdown("""
+    How much of the raw gap (men − women, USD) comes from men and women having **different
+    characteristics** (education, experience, managerial roles, certification, industry, region, …)
+    — the *explained* part — and how much remains for **equal characteristics** — the *unexplained*
+    part? The split depends on which salary structure is taken as the reference: men's, women's or
+    the pooled regression. The threefold version separates the interaction of both.
+    Standard errors: 500 bootstrap resamples within survey year × sex.
+    """)
 
-    salary_compare = pd.concat([salary_2015, salary_2023], axis=1)
-    salary_compare.columns = ["2015 Avg Salary", "2023 Avg Salary"]
+        oaxaca = oaxaca_blinder(df)
+        oaxaca_variants = [d for d in oaxaca["Decomposition"].unique() if d != "Raw gap"]
+        oaxaca_variant = st.selectbox("Decomposition", oaxaca_variants, index=2, key="oaxaca_variant")
 
-    st.dataframe(salary_compare.round(0))
+        oaxaca_totals = oaxaca[
+            (oaxaca["Factor"] == "Total")
+            & oaxaca["Decomposition"].isin(["Raw gap", oaxaca_variant])
+            & (oaxaca["Component"] != "Men Mean")
+            & (oaxaca["Component"] != "Women Mean")
+        ]
+        st.dataframe(
+            oaxaca_totals.drop(columns=["Decomposition", "Factor"]).round(0),
+            hide_index=True
+        )
 
-    fig, ax = plt.subplots(figsize=(10, 4))
-    salary_compare.plot(kind="bar", ax=ax)
+        oaxaca_detail = oaxaca[
+            (oaxaca["Decomposition"] == oaxaca_variant) & (oaxaca["Factor"] != "Total")
+        ]
+        oaxaca_pivot = oaxaca_detail.pivot_table(
+            index="Factor", columns=["Component", "SurveyYear"], values="Estimate", sort=False
+        ).sort_index(axis=1)
+        st.markdown("**Contribution of each factor (USD)**")
+        st.markdown("*The unexplained contributions of categorical factors depend on the omitted category; "
+                "only their sum with the constant is invariant.*")
+        st.dataframe(oaxaca_pivot.round(0))
+
+
+if tab_certification.open:
+    with tab_certification:
+        # =========================
+        # CLEAN CERTIFICATION TYPES
+        # =========================
+
+        cert_columns = [
+            "CertType1","CertType2","CertType3","CertType4",
+            "CertType5","CertType6","CertType7","CertType8"
+        ]
 
-    ax.set_ylabel("Average Salary (USD)")
-    ax.set_xlabel("Certification")
-    ax.set_title("Average Salary by Certification (2015 vs 2023)")
-    ax.grid(axis="y", linestyle="--", alpha=0.6)
-    ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
+        cert_codes = ["CCP","CCT","CEP","CFCC","CST","DRMP","EVP","PSP"]
 
-    for container in ax.containers:
-        ax.bar_label(container, fmt="%.0f", fontsize=8)
+        # Create clean indicator columns for each certification
+        for cert in cert_codes:
 
-    plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
+            mask = False
 
-    st.header("Salary by Certification and Gender (2015 vs 2023)")
+            for col in cert_columns:
+                mask |= df[col].astype(str).str.upper().str.startswith(cert)
 
-    def cert_gender_chart(year):
+            df[f"Has_{cert}"] = mask
 
-        st.subheader(f"{year}")
+        st.header("Salary by Certification Type (2015 vs 2023)")
 
-        df_year = df[df["SurveyYear"] == year]
+        def cert_salary_by_year(year):
 
-        results = []
+            df_year = df[df["SurveyYear"] == year]
 
-        for cert in cert_codes:
+            result = {}
 
-            cert_df = df_year[df_year[f"Has_{cert}"] == True]
+            for cert in cert_codes:
+                cert_df = df_year[df_year[f"Has_{cert}"] == True]
 
-            if len(cert_df) > 5:
+                if len(cert_df) > 5:
+                    result[cert] = cert_df["SalaryUSD"].mean()
 
-                grouped = cert_df.groupby("IsFemale")["SalaryUSD"].mean()
+            return pd.Series(result)
 
-                men_salary = grouped.get(False, 0)
-                women_salary = grouped.get(True, 0)
 
-                results.append([cert, men_salary, women_salary])
+        salary_2015 = cert_salary_by_year(2015)
+        salary_2023 = cert_salary_by_year(2023)
 
-        cert_gender_df = pd.DataFrame(
-            results,
-            columns=["Certification", "Men Avg Salary", "Women Avg Salary"]
-        )
+        salary_compare = pd.concat([salary_2015, salary_2023], axis=1)
+        salary_compare.columns = ["2015 Avg Salary", "2023 Avg Salary"]
 
-        st.dataframe(cert_gender_df.round(0))
+        st.dataframe(salary_compare.round(0))
 
         fig, ax = plt.subplots(figsize=(10, 4))
-
-        cert_gender_df.set_index("Certification")[
-            ["Men Avg Salary", "Women Avg Salary"]
-        ].plot(kind="bar", ax=ax)
+        salary_compare.plot(kind="bar", ax=ax)
 
         ax.set_ylabel("Average Salary (USD)")
         ax.set_xlabel("Certification")
-        ax.set_title(f"Salary by Certification and Gender ({year})")
+        ax.set_title("Average Salary by Certification (2015 vs 2023)")
         ax.grid(axis="y", linestyle="--", alpha=0.6)
         ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
 
         for container in ax.containers:
-            ax.bar_label(container, fmt="%.0f", fontsize=7)
+            ax.bar_label(container, fmt="%.0f", fontsize=8)
 
         plt.tight_layout()
         st.pyplot(fig)
         plt.close(fig)
 
+        st.header("Salary by Certification and Gender (2015 vs 2023)")
 
-    cert_gender_chart(2015)
-    cert_gender_chart(2023)
-
-    # =========================
-
-with tab_regression:
-    # =========================
-    # ADVANCED MULTIVARIATE MODEL (FULL SAFE VERSION)
-    # =========================
-    st.header("Advanced Multivariate Salary Model")
-
-    df_reg = df.dropna(subset=[
-        "SalaryUSD",
-        "YearsOfExperience",
-        "Age",
-        "LevelOfEducation",
-        "Industry"
-    ]).copy()
-
-    # Clean education
-    df_reg["LevelOfEducation"] = df_reg["LevelOfEducation"].astype(str).str.strip().str.lower()
-
-    # Manager flag
-    df_reg["IsManager"] = df_reg["ManagerialDuties"].astype(str).str.contains("Yes", case=False, na=False)
-
-    # Consultant flag
-    df_reg["IsConsult"] = df_reg["Consult"].astype(str).str.contains("Yes", case=False, na=False)
-
-    # Convert booleans to int explicitly
-    df_reg["IsCertified"] = df_reg["IsCertified"].astype(int)
-    df_reg["IsMember"] = df_reg["IsMember"].astype(int)
-    df_reg["IsFemale"] = df_reg["IsFemale"].astype(int)
-    df_reg["IsManager"] = df_reg["IsManager"].astype(int)
-    df_reg["IsConsult"] = df_reg["IsConsult"].astype(int)
-
-    # Build base X
-    X = df_reg[
-        [
-            "YearsOfExperience",
-            "Age",
-            "IsCertified",
-            "IsMember",
-            "IsFemale",
-            "IsManager",
-            "IsConsult"
-        ]
-    ].copy()
+        def cert_gender_chart(year):
 
-    # Convert numeric safely
-    X["YearsOfExperience"] = pd.to_numeric(X["YearsOfExperience"], errors="coerce")
-    X["Age"] = pd.to_numeric(X["Age"], errors="coerce")
+            st.subheader(f"{year}")
 
-    # Dummy variables (force numeric)
-    edu_dummies = pd.get_dummies(df_reg["LevelOfEducation"], drop_first=True).astype(int)
-    ind_dummies = pd.get_dummies(df_reg["Industry"], drop_first=True).astype(int)
+            df_year = df[df["SurveyYear"] == year]
 
-    # Combine everything
-    X = pd.concat([X, edu_dummies, ind_dummies], axis=1)
+            results = []
 
-    # Remove any leftover NaNs
-    X = X.dropna()
-    y = pd.to_numeric(df_reg.loc[X.index, "SalaryUSD"], errors="coerce")
+            for cert in cert_codes:
 
-    # Add constant
-    X = sm.add_constant(X)
+                cert_df = df_year[df_year[f"Has_{cert}"] == True]
 
-    # FINAL numeric check
-    X = X.astype(float)
-    y = y.astype(float)
+                if len(cert_df) > 5:
 
-    model = sm.OLS(y, X).fit()
-    r_squared = model.rsquared
-    adj_r_squared = model.rsquared_adj
-    f_stat = model.fvalue
-    f_pvalue = model.f_pvalue
+                    grouped = cert_df.groupby("IsFemale")["SalaryUSD"].mean()
 
-    # =========================
-    # MODEL PERFORMANCE METRICS
-    # =========================
-    st.subheader("Model Performance Summary")
+                    men_salary = grouped.get(False, 0)
+                    women_salary = grouped.get(True, 0)
 
-    col1, col2, col3, col4 = st.columns(4)
+                    results.append([cert, men_salary, women_salary])
 
-    col1.metric("R²", f"{r_squared:.3f}")
-    col2.metric("Adjusted R²", f"{adj_r_squared:.3f}")
-    col3.metric("F-Statistic", f"{f_stat:.1f}")
-    col4.metric("Model p-value", f"{f_pvalue:.4e}")
+            cert_gender_df = pd.DataFrame(
+                results,
+                columns=["Certification", "Men Avg Salary", "Women Avg Salary"]
+            )
 
-    # =========================
-    # VISUAL: MAIN IMPACT FACTORS ONLY
-    # =========================
-    st.subheader("Key Salary Impact Factors (Core Variables Only)")
+            st.dataframe(cert_gender_df.round(0))
 
-    coef_df = pd.DataFrame({
-        "Variable": model.params.index,
-        "Coefficient": model.params.values,
-        "p_value": model.pvalues.values
-    })
+            fig, ax = plt.subplots(figsize=(10, 4))
 
-    # Remove constant
-    coef_df = coef_df[coef_df["Variable"] != "const"]
+            cert_gender_df.set_index("Certification")[
+                ["Men Avg Salary", "Women Avg Salary"]
+            ].plot(kind="bar", ax=ax)
 
-    # Keep only main variables
-    main_vars = [
-        "YearsOfExperience",
-        "Age",
-        "IsCertified",
-        "IsMember",
-        "IsFemale",
-        "IsManager",
-        "IsConsult"
-    ]
+            ax.set_ylabel("Average Salary (USD)")
+            ax.set_xlabel("Certification")
+            ax.set_title(f"Salary by Certification and Gender ({year})")
+            ax.grid(axis="y", linestyle="--", alpha=0.6)
+            ax.legend(loc="upper left", bbox_to_anchor=(1, 1))
 
-    coef_df = coef_df[coef_df["Variable"].isin(main_vars)]
+            for container in ax.containers:
+                ax.bar_label(container, fmt="%.0f", fontsize=7)
 
-    # Sort by absolute impact
-    coef_df["AbsImpact"] = coef_df["Coefficient"].abs()
-    coef_df = coef_df.sort_values("AbsImpact", ascending=True)
+            plt.tight_layout()
+            st.pyplot(fig)
+            plt.close(fig)
 
-    fig, ax = plt.subplots(figsize=(8, 4))
 
-    ax.barh(coef_df["Variable"], coef_df["Coefficient"])
+        cert_gender_chart(2015)
+        cert_gender_chart(2023)
 
-    ax.set_title("Impact on Salary (Core Variables)")
-    ax.set_xlabel("Salary Impact (USD)")
-    ax.grid(axis="x", linestyle="--", alpha=0.5)
 
-    for i, v in enumerate(coef_df["Coefficient"]):
-        ax.text(v, i, f"{v:,.0f}", va='center', fontsize=8)
+if tab_regression.open:
+    with tab_regression:
+        # =========================
+        # ADVANCED MULTIVARIATE MODEL (FULL SAFE VERSION)
+        # =========================
+        st.header("Advanced Multivariate Salary Model")
 
-    plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
+        model, vif_report, vif_data, high_vif_vars, moderate_vif_vars = original_model()
+        r_squared = model.rsquared
+        adj_r_squared = model.rsquared_adj
+        f_stat = model.fvalue
+        f_pvalue = model.f_pvalue
 
-    # =========================
-    # REGRESSION RESULTS (RANKED BY COEFFICIENT)
-    # =========================
-    st.subheader("Regression Results")
+        # =========================
+        # MODEL PERFORMANCE METRICS
+        # =========================
+        st.subheader("Model Performance Summary")
 
-    results_df = pd.DataFrame({
-        "Variable": model.params.index,
-        "Coefficient (USD)": model.params.values,
-        "Std Error": model.bse.values,
-        "P-Value": model.pvalues.values
-    })
+        col1, col2, col3, col4 = st.columns(4)
 
-    # Remove constant
-    results_df = results_df[results_df["Variable"] != "const"]
-
-    # Keep only core variables
-    main_vars = [
-        "YearsOfExperience",
-        "Age",
-        "IsCertified",
-        "IsMember",
-        "IsFemale",
-        "IsManager",
-        "IsConsult"
-    ]
-
-    results_df = results_df[results_df["Variable"].isin(main_vars)]
-
-    # Add significance flag
-    results_df["Significant"] = results_df["P-Value"].apply(
-        lambda x: "✅" if x < 0.05 else "❌"
-    )
+        col1.metric("R²", f"{r_squared:.3f}")
+        col2.metric("Adjusted R²", f"{adj_r_squared:.3f}")
+        col3.metric("F-Statistic", f"{f_stat:.1f}")
+        col4.metric("Model p-value", f"{f_pvalue:.4e}")
 
-    # SORT BY COEFFICIENT (descending)
-    results_df = results_df.sort_values(
-        by="Coefficient (USD)",
-        ascending=False
-    )
+        # =========================
+        # VISUAL: MAIN IMPACT FACTORS ONLY
+        # =========================
+        st.subheader("Key Salary Impact Factors (Core Variables Only)")
 
-    # Clean formatting
-    results_df["Coefficient (USD)"] = results_df["Coefficient (USD)"].round(0)
-    results_df["Std Error"] = results_df["Std Error"].round(0)
-    results_df["P-Value"] = results_df["P-Value"].round(4)
-
-    st.dataframe(results_df)
-
-
-
-    # =========================
-    # MODEL DIAGNOSTICS
-    # =========================
-    st.subheader("Model Diagnostics")
-
-    # Residuals
-    residuals = model.resid
-
-    # Compute tests manually
-    omni_stat, omni_p = omni_normtest(residuals)
-    jb_stat, jb_p, skew, kurtosis = jarque_bera(residuals)
-    dw_stat = durbin_watson(residuals)
-
-    diagnostics_df = pd.DataFrame({
-        "Metric": [
-            "Omnibus",
-            "Prob(Omnibus)",
-            "Jarque-Bera",
-            "Prob(JB)",
-            "Skew",
-            "Kurtosis",
-            "Durbin-Watson",
-            "Condition Number"
-        ],
-        "Value": [
-            omni_stat,
-            omni_p,
-            jb_stat,
-            jb_p,
-            skew,
-            kurtosis,
-            dw_stat,
-            model.condition_number
-        ]
-    })
+        coef_df = pd.DataFrame({
+            "Variable": model.params.index,
+            "Coefficient": model.params.values,
+            "p_value": model.pvalues.values
+        })
 
-    st.dataframe(diagnostics_df.round(3))
+        # Remove constant
+        coef_df = coef_df[coef_df["Variable"] != "const"]
 
-    # =========================
-    # VIF ANALYSIS
-    # =========================
-    st.subheader("VIF (Variance Inflation Factor) Analysis")
-    st.markdown("""
-    **Why VIF?** The Condition Number of **{:.0f}** indicates severe multicollinearity.
-    VIF measures how much each variable's variance is inflated due to correlation with other predictors.
-    - **VIF < 5** → ✅ Acceptable
-    - **VIF 5–10** → ⚠️ Moderate concern
-    - **VIF > 10** → 🔴 High multicollinearity — action needed
-    """.format(model.condition_number))
+        # Keep only main variables
+        coef_df = coef_df[coef_df["Variable"].isin(main_vars)]
 
-    # Compute VIF for each predictor (skip constant at index 0)
-    vif_data = pd.DataFrame({
-        "Variable": X.columns,
-        "VIF": [variance_inflation_factor(X.values, i) for i in range(X.shape[1])]
-    })
+        # Sort by absolute impact
+        coef_df["AbsImpact"] = coef_df["Coefficient"].abs()
+        coef_df = coef_df.sort_values("AbsImpact", ascending=True)
 
-    # Remove constant row for display
-    vif_data = vif_data[vif_data["Variable"] != "const"]
+        fig, ax = plt.subplots(figsize=(8, 4))
 
-    # Sort by VIF descending
-    vif_data = vif_data.sort_values("VIF", ascending=False).reset_index(drop=True)
+        ax.barh(coef_df["Variable"], coef_df["Coefficient"])
 
-    # Add interpretation flag
-    def vif_flag(v):
-        if v > 10:
-            return "🔴 High"
-        elif v >= 5:
-            return "⚠️ Moderate"
-        else:
-            return "✅ OK"
+        ax.set_title("Impact on Salary (Core Variables)")
+        ax.set_xlabel("Salary Impact (USD)")
+        ax.grid(axis="x", linestyle="--", alpha=0.5)
 
-    vif_data["Status"] = vif_data["VIF"].apply(vif_flag)
-    vif_data["VIF"] = vif_data["VIF"].round(2)
+        for i, v in enumerate(coef_df["Coefficient"]):
+            ax.text(v, i, f"{v:,.0f}", va='center', fontsize=8)
 
-    st.dataframe(vif_data)
+        plt.tight_layout()
+        st.pyplot(fig)
+        plt.close(fig)
 
-    # Identify high-VIF variables (VIF > 10, excluding dummies)
-    high_vif_vars = vif_data[
-        (vif_data["VIF"] > 10) &
-        (vif_data["Variable"].isin(main_vars))
-    ]["Variable"].tolist()
+        # =========================
+        # REGRESSION RESULTS (RANKED BY COEFFICIENT)
+        # =========================
+        st.subheader("Regression Results")
 
-    # Also identify moderate-VIF variables (5-10)
-    moderate_vif_vars = vif_data[
-        (vif_data["VIF"] >= 5) & (vif_data["VIF"] <= 10) &
-        (vif_data["Variable"].isin(main_vars))
-    ]["Variable"].tolist()
+        results_df = pd.DataFrame({
+            "Variable": model.params.index,
+            "Coefficient (USD)": model.params.values,
+            "Std Error": model.bse.values,
+            "P-Value": model.pvalues.values
+        })
 
-    if high_vif_vars:
-        st.warning(f"⚠️ High multicollinearity detected in: **{', '.join(high_vif_vars)}**")
-    elif moderate_vif_vars:
-        st.warning(f"⚠️ Moderate multicollinearity detected in: **{', '.join(moderate_vif_vars)}**. "
-                   f"Combined with the intercept and dummy variables, this contributes to the high Condition Number.")
-    else:
-        st.success("✅ No multicollinearity among core variables.")
+        # Remove constant
+        results_df = results_df[results_df["Variable"] != "const"]
 
+        # Keep only core variables
+        results_df = results_df[results_df["Variable"].isin(main_vars)]
 
+        # Add significance flag
+        results_df["Significant"] = results_df["P-Value"].apply(
+            lambda x: "✅" if x < 0.05 else "❌"
+        )
 
-with tab_causation:
-    # =========================
-    # FIXED MODEL (MULTICOLLINEARITY REMEDIATION)
-    # =========================
-    st.header("Fixed Model — Multicollinearity Remediation")
+        # SORT BY COEFFICIENT (descending)
+        results_df = results_df.sort_values(
+            by="Coefficient (USD)",
+            ascending=False
+        )
 
-    # Determine remediation strategy
-    vars_to_drop = []
-    apply_centering = False
+        # Clean formatting
+        results_df["Coefficient (USD)"] = results_df["Coefficient (USD)"].round(0)
+        results_df["Std Error"] = results_df["Std Error"].round(0)
+        results_df["P-Value"] = results_df["P-Value"].round(4)
+
+        st.dataframe(results_df)
+
+
+
+        # =========================
+        # MODEL DIAGNOSTICS
+        # =========================
+        st.subheader("Model Diagnostics")
+
+        if st.toggle("Show residual diagnostics", key="show_diag_original"):
+            diag = diagnostics(ORIGINAL_SPEC, wait=True)
+
+            diagnostics_df = pd.DataFrame({
+                "Metric": [
+                    "Omnibus",
+                    "Prob(Omnibus)",
+                    "Jarque-Bera",
+                    "Prob(JB)",
+                    "Skew",
+                    "Kurtosis",
+                    "Durbin-Watson",
+                    "Condition Number"
+                ],
+                "Value": [
+                    diag["omnibus"],
+                    diag["omnibus_p"],
+                    diag["jarque_bera"],
+                    diag["jarque_bera_p"],
+                    diag["skew"],
+                    diag["kurtosis"],
+                    diag["durbin_watson"],
+                    model.condition_number
+                ]
+            })
+
+            st.dataframe(diagnostics_df.round(3))
+
+        # =========================
+        # VIF ANALYSIS
+        # =========================
+        st.subheader("VIF (Variance Inflation Factor) Analysis")
+        st.markdown("""
+    **Why VIF?** The Condition Number of **{:.0f}** indicates severe multicollinearity.
+    VIF measures how much each variable's variance is inflated due to correlation with other predictors.
+    - **VIF < 5** → ✅ Acceptable
+    - **VIF 5–10** → ⚠️ Moderate concern
+    - **VIF > 10** → 🔴 High multicollinearity — action needed
+    """.format(model.condition_number))
 
-    # Check if Age and YearsOfExperience are both at least moderate-VIF
-    age_yoe_correlated = (
-        ("Age" in high_vif_vars or "Age" in moderate_vif_vars) and
-        ("YearsOfExperience" in high_vif_vars or "YearsOfExperience" in moderate_vif_vars)
-    )
+        st.dataframe(vif_data)
 
-    if age_yoe_correlated:
-        vars_to_drop = ["Age"]
-        apply_centering = True
-        st.markdown("""
+        st.markdown("**Collinear predictor pairs (|r| ≥ 0.7):**")
+        if vif_report.pairs.empty:
+            st.write("None")
+        else:
+            st.dataframe(vif_report.pairs.round(3), hide_index=True)
+
+        if high_vif_vars:
+            st.warning(f"⚠️ High multicollinearity detected in: **{', '.join(high_vif_vars)}**")
+        elif moderate_vif_vars:
+            st.warning(f"⚠️ Moderate multicollinearity detected in: **{', '.join(moderate_vif_vars)}**. "
+                   f"Combined with the intercept and dummy variables, this contributes to the high Condition Number.")
+        else:
+            st.success("✅ No multicollinearity among core variables.")
+
+
+if tab_causation.open:
+    from dml import DML_TREATMENTS, dml_effects
+    from fixed_effects import absorbed_ols
+    from matching import propensity_match
+    from ols_engine import grouped_ols
+    from quantile_reg import quantile_fits
+    from sensitivity import benchmark_bounds, contour_grid, sensitivity_summary
+
+    with tab_causation:
+        # =========================
+        # FIXED MODEL (MULTICOLLINEARITY REMEDIATION)
+        # =========================
+        st.header("Fixed Model — Multicollinearity Remediation")
+
+        # Continues from the Original model and its VIF screen
+        model, vif_report, vif_data, high_vif_vars, moderate_vif_vars = original_model()
+
+        # Determine remediation strategy
+        vars_to_drop = []
+        apply_centering = False
+
+        # Check if Age and YearsOfExperience are both at least moderate-VIF
+        age_yoe_correlated = (
+            ("Age" in high_vif_vars or "Age" in moderate_vif_vars) and
+            ("YearsOfExperience" in high_vif_vars or "YearsOfExperience" in moderate_vif_vars)
+        )
+
+        if age_yoe_correlated:
+            vars_to_drop = ["Age"]
+            apply_centering = True
+            vif_lookup = vif_data.set_index("Variable")["VIF"]
+            st.markdown(f"""
     **Fixes Applied:**
-    1. **Drop `Age`** — `Age` and `YearsOfExperience` have moderate VIF (~5.4 each), confirming
-       they carry redundant information. Keeping `YearsOfExperience` because it is more directly
+    1. **Drop `Age`** — `Age` and `YearsOfExperience` have VIF {vif_lookup["Age"]:.1f} and
+       {vif_lookup["YearsOfExperience"]:.1f} (r = {vif_report.pair_corr("Age", "YearsOfExperience"):.2f}),
+       confirming they carry redundant information. Keeping `YearsOfExperience` because it is more directly
        relevant to salary determination.
     2. **Mean-center `YearsOfExperience`** — Centering reduces the artificial inflation of the
        Condition Number caused by the interaction between continuous variables and the intercept/dummy
        structure.
     """)
-    elif high_vif_vars:
-        vars_to_drop = high_vif_vars[:1]
-        apply_centering = True
-        st.markdown(f"**Fix Applied:** Dropping `{vars_to_drop[0]}` (highest VIF) and mean-centering continuous variables.")
-    else:
-        apply_centering = True
-        st.info("No core variables have concerning VIF. Applying mean-centering to reduce Condition Number from dummy/intercept structure.")
-
-    # Build fixed model
-    X_fixed = X.drop(columns=vars_to_drop, errors="ignore").copy()
-
-    if apply_centering:
-        for col in ["YearsOfExperience", "Age"]:
-            if col in X_fixed.columns:
-                X_fixed[col] = X_fixed[col] - X_fixed[col].mean()
-
-    y_fixed = y.loc[X_fixed.index]
-
-    model_fixed = sm.OLS(y_fixed, X_fixed).fit()
-
-    # =========================
-    # FIXED MODEL PERFORMANCE
-    # =========================
-    st.subheader("Fixed Model — Performance")
-
-    col1, col2, col3, col4 = st.columns(4)
-    col1.metric("R²", f"{model_fixed.rsquared:.3f}")
-    col2.metric("Adjusted R²", f"{model_fixed.rsquared_adj:.3f}")
-    col3.metric("F-Statistic", f"{model_fixed.fvalue:.1f}")
-    col4.metric("Model p-value", f"{model_fixed.f_pvalue:.4e}")
-
-    # =========================
-    # FIXED MODEL KEY IMPACT FACTORS
-    # =========================
-    st.subheader("Fixed Model — Key Salary Impact Factors")
-
-    coef_fixed = pd.DataFrame({
-        "Variable": model_fixed.params.index,
-        "Coefficient": model_fixed.params.values,
-        "p_value": model_fixed.pvalues.values
-    })
-
-    coef_fixed = coef_fixed[coef_fixed["Variable"] != "const"]
-
-    fixed_main_vars = [v for v in main_vars if v not in vars_to_drop]
-    coef_fixed = coef_fixed[coef_fixed["Variable"].isin(fixed_main_vars)]
-
-    coef_fixed["AbsImpact"] = coef_fixed["Coefficient"].abs()
-    coef_fixed = coef_fixed.sort_values("AbsImpact", ascending=True)
+        elif high_vif_vars:
+            vars_to_drop = high_vif_vars[:1]
+            apply_centering = True
+            st.markdown(f"**Fix Applied:** Dropping `{vars_to_drop[0]}` (highest VIF) and mean-centering continuous variables.")
+        else:
+            apply_centering = True
+            st.info("No core variables have concerning VIF. Applying mean-centering to reduce Condition Number from dummy/intercept structure.")
+
+        # Build fixed model (drop + centering are applied to the cross products)
+        fixed_columns = [c for c in model.params.index if c not in vars_to_drop]
+        fixed_center = ["YearsOfExperience", "Age"] if apply_centering else []
+
+        fixed_spec = ORIGINAL_SPEC.derive("fixed", fixed_columns, fixed_center)
+        model_fixed = fitted_model(fixed_spec, df, snapshot, active_filters)
+
+        # =========================
+        # FIXED MODEL PERFORMANCE
+        # =========================
+        st.subheader("Fixed Model — Performance")
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("R²", f"{model_fixed.rsquared:.3f}")
+        col2.metric("Adjusted R²", f"{model_fixed.rsquared_adj:.3f}")
+        col3.metric("F-Statistic", f"{model_fixed.fvalue:.1f}")
+        col4.metric("Model p-value", f"{model_fixed.f_pvalue:.4e}")
+
+        # =========================
+        # FIXED MODEL KEY IMPACT FACTORS
+        # =========================
+        st.subheader("Fixed Model — Key Salary Impact Factors")
+
+        coef_fixed = pd.DataFrame({
+            "Variable": model_fixed.params.index,
+            "Coefficient": model_fixed.params.values,
+            "p_value": model_fixed.pvalues.values
+        })
 
-    fig, ax = plt.subplots(figsize=(8, 4))
-    ax.barh(coef_fixed["Variable"], coef_fixed["Coefficient"])
-    ax.set_title("Impact on Salary — Fixed Model (Core Variables)")
-    ax.set_xlabel("Salary Impact (USD)")
-    ax.grid(axis="x", linestyle="--", alpha=0.5)
+        coef_fixed = coef_fixed[coef_fixed["Variable"] != "const"]
 
-    for i, v in enumerate(coef_fixed["Coefficient"]):
-        ax.text(v, i, f"{v:,.0f}", va='center', fontsize=8)
+        fixed_main_vars = [v for v in main_vars if v not in vars_to_drop]
+        coef_fixed = coef_fixed[coef_fixed["Variable"].isin(fixed_main_vars)]
 
-    plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
+        coef_fixed["AbsImpact"] = coef_fixed["Coefficient"].abs()
+        coef_fixed = coef_fixed.sort_values("AbsImpact", ascending=True)
 
-    # =========================
-    # FIXED MODEL REGRESSION TABLE
-    # =========================
-    st.subheader("Fixed Model — Regression Results")
+        fig, ax = plt.subplots(figsize=(8, 4))
+        ax.barh(coef_fixed["Variable"], coef_fixed["Coefficient"])
+        ax.set_title("Impact on Salary — Fixed Model (Core Variables)")
+        ax.set_xlabel("Salary Impact (USD)")
+        ax.grid(axis="x", linestyle="--", alpha=0.5)
 
-    results_fixed = pd.DataFrame({
-        "Variable": model_fixed.params.index,
-        "Coefficient (USD)": model_fixed.params.values,
-        "Std Error": model_fixed.bse.values,
-        "P-Value": model_fixed.pvalues.values
-    })
+        for i, v in enumerate(coef_fixed["Coefficient"]):
+            ax.text(v, i, f"{v:,.0f}", va='center', fontsize=8)
 
-    results_fixed = results_fixed[results_fixed["Variable"] != "const"]
-    results_fixed = results_fixed[results_fixed["Variable"].isin(fixed_main_vars)]
+        plt.tight_layout()
+        st.pyplot(fig)
+        plt.close(fig)
 
-    results_fixed["Significant"] = results_fixed["P-Value"].apply(
-        lambda x: "✅" if x < 0.05 else "❌"
-    )
+        # =========================
+        # FIXED MODEL REGRESSION TABLE
+        # =========================
+        st.subheader("Fixed Model — Regression Results")
 
-    results_fixed = results_fixed.sort_values(by="Coefficient (USD)", ascending=False)
-    results_fixed["Coefficient (USD)"] = results_fixed["Coefficient (USD)"].round(0)
-    results_fixed["Std Error"] = results_fixed["Std Error"].round(0)
-    results_fixed["P-Value"] = results_fixed["P-Value"].round(4)
-
-    st.dataframe(results_fixed)
-
-    # =========================
-    # FIXED MODEL DIAGNOSTICS
-    # =========================
-    st.subheader("Fixed Model — Diagnostics")
-
-    residuals_fixed = model_fixed.resid
-    omni_stat_f, omni_p_f = omni_normtest(residuals_fixed)
-    jb_stat_f, jb_p_f, skew_f, kurtosis_f = jarque_bera(residuals_fixed)
-    dw_stat_f = durbin_watson(residuals_fixed)
-
-    diag_fixed = pd.DataFrame({
-        "Metric": [
-            "Omnibus", "Prob(Omnibus)",
-            "Jarque-Bera", "Prob(JB)",
-            "Skew", "Kurtosis",
-            "Durbin-Watson", "Condition Number"
-        ],
-        "Value": [
-            omni_stat_f, omni_p_f,
-            jb_stat_f, jb_p_f,
-            skew_f, kurtosis_f,
-            dw_stat_f, model_fixed.condition_number
-        ]
-    })
+        results_fixed = pd.DataFrame({
+            "Variable": model_fixed.params.index,
+            "Coefficient (USD)": model_fixed.params.values,
+            "Std Error": model_fixed.bse.values,
+            "P-Value": model_fixed.pvalues.values
+        })
 
-    st.dataframe(diag_fixed.round(3))
+        results_fixed = results_fixed[results_fixed["Variable"] != "const"]
+        results_fixed = results_fixed[results_fixed["Variable"].isin(fixed_main_vars)]
 
-    # =========================
-    # VIF ON FIXED MODEL
-    # =========================
-    st.subheader("Fixed Model — VIF Check")
+        results_fixed["Significant"] = results_fixed["P-Value"].apply(
+            lambda x: "✅" if x < 0.05 else "❌"
+        )
 
-    vif_fixed = pd.DataFrame({
-        "Variable": X_fixed.columns,
-        "VIF": [variance_inflation_factor(X_fixed.values, i) for i in range(X_fixed.shape[1])]
-    })
-    vif_fixed = vif_fixed[vif_fixed["Variable"] != "const"]
-    vif_fixed = vif_fixed.sort_values("VIF", ascending=False).reset_index(drop=True)
-    vif_fixed["Status"] = vif_fixed["VIF"].apply(vif_flag)
-    vif_fixed["VIF"] = vif_fixed["VIF"].round(2)
-
-    st.dataframe(vif_fixed)
-
-    # =========================
-    # SIDE-BY-SIDE COMPARISON
-    # =========================
-    st.header("Model Comparison: Original vs Fixed")
-
-    comparison_df = pd.DataFrame({
-        "Metric": [
-            "R²",
-            "Adjusted R²",
-            "F-Statistic",
-            "Condition Number",
-            "Durbin-Watson",
-            "Skew",
-            "Kurtosis"
-        ],
-        "Original Model": [
-            round(model.rsquared, 4),
-            round(model.rsquared_adj, 4),
-            round(model.fvalue, 1),
-            round(model.condition_number, 1),
-            round(dw_stat, 3),
-            round(skew, 3),
-            round(kurtosis, 3)
-        ],
-        "Fixed Model": [
-            round(model_fixed.rsquared, 4),
-            round(model_fixed.rsquared_adj, 4),
-            round(model_fixed.fvalue, 1),
-            round(model_fixed.condition_number, 1),
-            round(dw_stat_f, 3),
-            round(skew_f, 3),
-            round(kurtosis_f, 3)
-        ]
-    })
+        results_fixed = results_fixed.sort_values(by="Coefficient (USD)", ascending=False)
+        results_fixed["Coefficient (USD)"] = results_fixed["Coefficient (USD)"].round(0)
+        results_fixed["Std Error"] = results_fixed["Std Error"].round(0)
+        results_fixed["P-Value"] = results_fixed["P-Value"].round(4)
+
+        st.dataframe(results_fixed)
+
+        # =========================
+        # FIXED MODEL DIAGNOSTICS
+        # =========================
+        st.subheader("Fixed Model — Diagnostics")
+
+        if st.toggle("Show residual diagnostics and VIF check", key="show_diag_fixed"):
+            diag_f = diagnostics(fixed_spec, wait=True)
+
+            diag_fixed = pd.DataFrame({
+                "Metric": [
+                    "Omnibus", "Prob(Omnibus)",
+                    "Jarque-Bera", "Prob(JB)",
+                    "Skew", "Kurtosis",
+                    "Durbin-Watson", "Condition Number"
+                ],
+                "Value": [
+                    diag_f["omnibus"], diag_f["omnibus_p"],
+                    diag_f["jarque_bera"], diag_f["jarque_bera_p"],
+                    diag_f["skew"], diag_f["kurtosis"],
+                    diag_f["durbin_watson"], model_fixed.condition_number
+                ]
+            })
+
+            st.dataframe(diag_fixed.round(3))
+
+            # =========================
+            # VIF ON FIXED MODEL
+            # =========================
+            st.subheader("Fixed Model — VIF Check")
+
+            vif_fixed = model_fixed.vif.table
+            vif_fixed = vif_fixed.sort_values("VIF", ascending=False).reset_index(drop=True)
+            vif_fixed["Status"] = vif_fixed["VIF"].apply(vif_flag)
+            vif_fixed["VIF"] = vif_fixed["VIF"].round(2)
+
+            st.dataframe(vif_fixed)
+
+        # =========================
+        # SIDE-BY-SIDE COMPARISON
+        # =========================
+        st.header("Model Comparison: Original vs Fixed")
+
+        # Residual diagnostics are computed only on request; until then the rows show "pending"
+        compare_diag = st.toggle("Include residual diagnostics (Durbin-Watson, skew, kurtosis)",
+                                 key="compare_diag")
+        diag, diag_f = diagnostics(ORIGINAL_SPEC, compare_diag), diagnostics(fixed_spec, compare_diag)
+
+        comparison_df = pd.DataFrame({
+            "Metric": [
+                "R²",
+                "Adjusted R²",
+                "F-Statistic",
+                "Condition Number",
+                "Durbin-Watson",
+                "Skew",
+                "Kurtosis"
+            ],
+            "Original Model": [
+                round(model.rsquared, 4),
+                round(model.rsquared_adj, 4),
+                round(model.fvalue, 1),
+                round(model.condition_number, 1),
+                diag_value(diag, "durbin_watson"),
+                diag_value(diag, "skew"),
+                diag_value(diag, "kurtosis")
+            ],
+            "Fixed Model": [
+                round(model_fixed.rsquared, 4),
+                round(model_fixed.rsquared_adj, 4),
+                round(model_fixed.fvalue, 1),
+                round(model_fixed.condition_number, 1),
+                diag_value(diag_f, "durbin_watson"),
+                diag_value(diag_f, "skew"),
+                diag_value(diag_f, "kurtosis")
+            ]
+        })
 
-    st.dataframe(comparison_df)
+        st.dataframe(diag_table(comparison_df))
 
-    # Interpretation
-    cond_original = model.condition_number
-    cond_fixed = model_fixed.condition_number
-    improvement = ((cond_original - cond_fixed) / cond_original) * 100
+        # Interpretation
+        cond_original = model.condition_number
+        cond_fixed = model_fixed.condition_number
+        improvement = ((cond_original - cond_fixed) / cond_original) * 100
 
-    if cond_fixed < 30:
-        st.success(f"""✅ **Multicollinearity resolved!**
+        if cond_fixed < 30:
+            st.success(f"""✅ **Multicollinearity resolved!**
     - Condition Number dropped from **{cond_original:,.0f}** → **{cond_fixed:,.0f}** ({improvement:.1f}% reduction)
     - The fixed model is now safe for causal interpretation.""")
-    elif cond_fixed < 100:
-        st.warning(f"""⚠️ **Multicollinearity improved but still elevated.**
+        elif cond_fixed < 100:
+            st.warning(f"""⚠️ **Multicollinearity improved but still elevated.**
     - Condition Number: **{cond_original:,.0f}** → **{cond_fixed:,.0f}** ({improvement:.1f}% reduction)
     - Consider Ridge Regression or further variable reduction.""")
-    else:
-        st.error(f"""🔴 **Multicollinearity still present.**
+        else:
+            st.error(f"""🔴 **Multicollinearity still present.**
     - Condition Number: **{cond_original:,.0f}** → **{cond_fixed:,.0f}** ({improvement:.1f}% reduction)
     - Recommend adding more control variables to improve the model.""")
 
 
-    # ============================================================
+        # ============================================================
 
 
-    # ============================================================
-    # PHASE 2: ENHANCED CAUSATION MODEL
-    # ============================================================
-    st.header("Enhanced Causation Model")
-    st.markdown("""
+        # ============================================================
+        # PHASE 2: ENHANCED CAUSATION MODEL
+        # ============================================================
+        st.header("Enhanced Causation Model")
+        st.markdown("""
     This model adds **more control variables** to reduce omitted variable bias and
     strengthen causal claims. Based on econometric research (Wilms et al., 2021;
     Cinelli & Hazlett, 2020), adding relevant controls is the proper way to improve
     causal inference — not switching to Ridge Regression (which biases coefficients).
     """)
 
-    # =========================
-    # STEP 1: CLEAN & ENCODE NEW VARIABLES
-    # =========================
-
-    # --- Region Grouping from LocationWork ---
-    df_enhanced = df.dropna(subset=[
-        "SalaryUSD", "YearsOfExperience",
-        "LocationWork", "WorkFunction", "ProjectSize"
-    ]).copy()
-
-    def assign_region(loc):
-        loc_upper = str(loc).upper()
-        if "UNITED STATES" in loc_upper or "USA" in loc_upper:
-            return "US"
-        elif "CANADA" in loc_upper:
-            return "Canada"
-        elif any(x in loc_upper for x in [
-            "UNITED ARAB", "SAUDI", "QATAR", "KUWAIT", "OMAN", "BAHRAIN", "IRAQ", "JORDAN", "LEBANON"
-        ]):
-            return "Middle East"
-        elif any(x in loc_upper for x in [
-            "UNITED KINGDOM", "GERMANY", "FRANCE", "NETHERLANDS", "SPAIN", "ITALY",
-            "NORWAY", "SWEDEN", "SWITZERLAND", "BELGIUM", "IRELAND", "AUSTRIA",
-            "DENMARK", "FINLAND", "PORTUGAL", "POLAND", "CZECH", "ROMANIA", "EUROPE"
-        ]):
-            return "Europe"
-        elif any(x in loc_upper for x in [
-            "AUSTRALIA", "INDIA", "CHINA", "JAPAN", "SINGAPORE", "MALAYSIA",
-            "INDONESIA", "PHILIPPINES", "KOREA", "THAILAND", "VIETNAM",
-            "NEW ZEALAND", "PAKISTAN", "BANGLADESH", "HONG KONG", "TAIWAN"
-        ]):
-            return "Asia-Pacific"
-        else:
-            return "Other"
+        # =========================
+        # STEP 1: CLEAN & ENCODE NEW VARIABLES
+        # =========================
 
-    df_enhanced["Region"] = df_enhanced["LocationWork"].apply(assign_region)
+        # Region / work function / project size controls (see salary_models.py)
+        df_enhanced = enhanced_frame(df)
 
-    # --- Clean WorkFunction ---
-    df_enhanced["WorkFunction"] = df_enhanced["WorkFunction"].astype(str).str.strip()
-    df_enhanced["WorkFunction"] = df_enhanced["WorkFunction"].replace({
-        "Other (please specify)": "Other"
-    })
+        # =========================
+        # STEP 2: BUILD ENHANCED MODEL
+        # =========================
+        st.subheader("Variables Added")
 
-    # --- Standardize ProjectSize ---
-    def standardize_project_size(ps):
-        ps_str = str(ps).upper().replace(",", "").strip()
-        if any(x in ps_str for x in ["0-5", "0 - 5"]):
-            return "0-5M"
-        elif any(x in ps_str for x in ["5-20", "5 - 20"]):
-            return "5-20M"
-        elif any(x in ps_str for x in ["20-100", "20 - 100"]):
-            return "20-100M"
-        elif any(x in ps_str for x in ["100-500", "100 - 500"]):
-            return "100-500M"
-        elif any(x in ps_str for x in ["500-1000", "500 - 1000"]):
-            return "500M-1B"
-        elif "1000" in ps_str:
-            return "1B+"
-        else:
-            return ps_str
-
-    df_enhanced["ProjectSizeClean"] = df_enhanced["ProjectSize"].apply(standardize_project_size)
-
-    # --- Numeric columns ---
-    df_enhanced["YearsOfExperience"] = pd.to_numeric(df_enhanced["YearsOfExperience"], errors="coerce")
-    df_enhanced["SalaryUSD"] = pd.to_numeric(df_enhanced["SalaryUSD"], errors="coerce")
-    df_enhanced["WorkHours"] = pd.to_numeric(df_enhanced["WorkHours"], errors="coerce")
-    df_enhanced["YrsWithEmployer"] = pd.to_numeric(df_enhanced["YrsWithEmployer"], errors="coerce")
-    df_enhanced["CompanySize"] = pd.to_numeric(df_enhanced["NumberOfEmployeesInCompany"], errors="coerce")
-    df_enhanced["LogCompanySize"] = np.log1p(df_enhanced["CompanySize"])
-
-    # --- Boolean flags (to int) ---
-    df_enhanced["IsCertified"] = df_enhanced["IsCertified"].astype(int)
-    df_enhanced["IsMember"] = df_enhanced["IsMember"].astype(int)
-    df_enhanced["IsFemale"] = df_enhanced["IsFemale"].astype(int)
-    df_enhanced["IsManager"] = df_enhanced["ManagerialDuties"].astype(str).str.contains("Yes", case=False, na=False).astype(int)
-    df_enhanced["IsConsult"] = df_enhanced["Consult"].astype(str).str.contains("Yes", case=False, na=False).astype(int)
-    df_enhanced["HasPE"] = df_enhanced["PE"].astype(str).str.contains("Yes", case=False, na=False).astype(int)
-    df_enhanced["HasTechDegree"] = df_enhanced["TechnicalDegree"].astype(str).str.contains("Yes", case=False, na=False).astype(int)
-    df_enhanced["HasBizDegree"] = df_enhanced["BusinessDegree"].astype(str).str.contains("Yes", case=False, na=False).astype(int)
-
-    # --- Education grouping (5 → 3 levels) ---
-    df_enhanced["LevelOfEducation"] = df_enhanced["LevelOfEducation"].astype(str).str.strip().str.lower()
-    def group_education(edu):
-        if any(x in edu for x in ["high school", "associate"]):
-            return "Low"
-        elif any(x in edu for x in ["undergraduate", "bachelor"]):
-            return "Mid"
-        elif any(x in edu for x in ["graduate", "master", "doctoral"]):
-            return "High"
-        else:
-            return "Mid"
-
-    df_enhanced["EduGroup"] = df_enhanced["LevelOfEducation"].apply(group_education)
-
-    # =========================
-    # STEP 2: BUILD ENHANCED MODEL
-    # =========================
-    st.subheader("Variables Added")
-
-    region_counts = df_enhanced["Region"].value_counts()
-    st.markdown("**LocationWork → Region Grouping:**")
-    st.dataframe(region_counts.reset_index().rename(columns={"index": "Region", "Region": "Region", "count": "Count"}))
-
-    # Build X matrix
-    enhanced_core_vars = [
-        "YearsOfExperience",
-        "IsCertified", "IsMember", "IsFemale",
-        "IsManager", "IsConsult",
-        "HasPE", "HasTechDegree", "HasBizDegree",
-        "LogCompanySize", "WorkHours"
-    ]
-
-    # Add YrsWithEmployer only if enough data
-    if df_enhanced["YrsWithEmployer"].notna().sum() > len(df_enhanced) * 0.5:
-        enhanced_core_vars.append("YrsWithEmployer")
-
-    X_enh = df_enhanced[enhanced_core_vars].copy()
-
-    # Convert numeric safely
-    for col in X_enh.columns:
-        X_enh[col] = pd.to_numeric(X_enh[col], errors="coerce")
-
-    # Add dummies
-    region_dummies = pd.get_dummies(df_enhanced["Region"], drop_first=True, prefix="Region").astype(int)
-    func_dummies = pd.get_dummies(df_enhanced["WorkFunction"], drop_first=True, prefix="Func").astype(int)
-    proj_dummies = pd.get_dummies(df_enhanced["ProjectSizeClean"], drop_first=True, prefix="ProjSize").astype(int)
-    edu_dummies_enh = pd.get_dummies(df_enhanced["EduGroup"], drop_first=True, prefix="Edu").astype(int)
-
-    X_enh = pd.concat([X_enh, region_dummies, func_dummies, proj_dummies, edu_dummies_enh], axis=1)
-
-    # Clean
-    X_enh = X_enh.dropna()
-    y_enh = pd.to_numeric(df_enhanced.loc[X_enh.index, "SalaryUSD"], errors="coerce")
-
-    # Center YearsOfExperience
-    X_enh["YearsOfExperience"] = X_enh["YearsOfExperience"] - X_enh["YearsOfExperience"].mean()
-
-    # Add constant
-    X_enh = sm.add_constant(X_enh)
-    X_enh = X_enh.astype(float)
-    y_enh = y_enh.astype(float)
-
-    # Fit
-    model_enhanced = sm.OLS(y_enh, X_enh).fit()
-
-    # =========================
-    # ENHANCED MODEL PERFORMANCE
-    # =========================
-    st.subheader("Enhanced Model — Performance")
-
-    col1, col2, col3, col4 = st.columns(4)
-    col1.metric("R²", f"{model_enhanced.rsquared:.3f}")
-    col2.metric("Adjusted R²", f"{model_enhanced.rsquared_adj:.3f}")
-    col3.metric("F-Statistic", f"{model_enhanced.fvalue:.1f}")
-    col4.metric("Model p-value", f"{model_enhanced.f_pvalue:.4e}")
-
-    st.markdown(f"**Observations:** {int(model_enhanced.nobs)}")
-
-    # =========================
-    # ENHANCED MODEL KEY IMPACT FACTORS
-    # =========================
-    st.subheader("Enhanced Model — Key Salary Impact Factors")
-
-    coef_enh = pd.DataFrame({
-        "Variable": model_enhanced.params.index,
-        "Coefficient": model_enhanced.params.values,
-        "p_value": model_enhanced.pvalues.values
-    })
+        region_counts = df_enhanced["Region"].value_counts()
+        st.markdown("**LocationWork → Region Grouping:**")
+        st.dataframe(region_counts.reset_index().rename(columns={"index": "Region", "Region": "Region", "count": "Count"}))
 
-    coef_enh = coef_enh[coef_enh["Variable"] != "const"]
-
-    enhanced_display_vars = [
-        "YearsOfExperience",
-        "IsCertified", "IsMember", "IsFemale",
-        "IsManager", "IsConsult",
-        "HasPE", "HasTechDegree", "HasBizDegree",
-        "LogCompanySize", "WorkHours"
-    ]
-    if "YrsWithEmployer" in enhanced_core_vars:
-        enhanced_display_vars.append("YrsWithEmployer")
-
-    coef_enh_main = coef_enh[coef_enh["Variable"].isin(enhanced_display_vars)].copy()
-    coef_enh_main["AbsImpact"] = coef_enh_main["Coefficient"].abs()
-    coef_enh_main = coef_enh_main.sort_values("AbsImpact", ascending=True)
-
-    fig, ax = plt.subplots(figsize=(8, 5))
-
-    colors = ["#2ecc71" if p < 0.05 else "#95a5a6" for p in coef_enh_main["p_value"]]
-    ax.barh(coef_enh_main["Variable"], coef_enh_main["Coefficient"], color=colors)
-    ax.set_title("Impact on Salary — Enhanced Model (Core Variables)")
-    ax.set_xlabel("Salary Impact (USD)")
-    ax.grid(axis="x", linestyle="--", alpha=0.5)
-
-    for i, (v, p) in enumerate(zip(coef_enh_main["Coefficient"], coef_enh_main["p_value"])):
-        label = f"{v:,.0f}" + (" *" if p < 0.05 else "")
-        ax.text(v, i, label, va='center', fontsize=8)
-
-    ax.legend(
-        handles=[
-            plt.Line2D([0], [0], color="#2ecc71", lw=6, label="Significant (p < 0.05)"),
-            plt.Line2D([0], [0], color="#95a5a6", lw=6, label="Not significant")
-        ],
-        loc="lower right", fontsize=8
-    )
+        # Fit with YearsOfExperience centered (loaded from the model registry)
+        model_enhanced = fitted_model(ENHANCED_SPEC, df, snapshot, active_filters)
 
-    plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
+        # =========================
+        # ENHANCED MODEL PERFORMANCE
+        # =========================
+        st.subheader("Enhanced Model — Performance")
 
-    # =========================
-    # ENHANCED MODEL REGRESSION TABLE
-    # =========================
-    st.subheader("Enhanced Model — Regression Results (Core Variables)")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("R²", f"{model_enhanced.rsquared:.3f}")
+        col2.metric("Adjusted R²", f"{model_enhanced.rsquared_adj:.3f}")
+        col3.metric("F-Statistic", f"{model_enhanced.fvalue:.1f}")
+        col4.metric("Model p-value", f"{model_enhanced.f_pvalue:.4e}")
 
-    results_enh = pd.DataFrame({
-        "Variable": model_enhanced.params.index,
-        "Coefficient (USD)": model_enhanced.params.values,
-        "Std Error": model_enhanced.bse.values,
-        "P-Value": model_enhanced.pvalues.values
-    })
+        st.markdown(f"**Observations:** {int(model_enhanced.nobs)}")
 
-    results_enh = results_enh[results_enh["Variable"] != "const"]
-    results_enh = results_enh[results_enh["Variable"].isin(enhanced_display_vars)]
+        # =========================
+        # ENHANCED MODEL KEY IMPACT FACTORS
+        # =========================
+        st.subheader("Enhanced Model — Key Salary Impact Factors")
 
-    results_enh["Significant"] = results_enh["P-Value"].apply(
-        lambda x: "✅" if x < 0.05 else "❌"
-    )
+        coef_enh = pd.DataFrame({
+            "Variable": model_enhanced.params.index,
+            "Coefficient": model_enhanced.params.values,
+            "p_value": model_enhanced.pvalues.values
+        })
 
-    results_enh = results_enh.sort_values(by="Coefficient (USD)", ascending=False)
-    results_enh["Coefficient (USD)"] = results_enh["Coefficient (USD)"].round(0)
-    results_enh["Std Error"] = results_enh["Std Error"].round(0)
-    results_enh["P-Value"] = results_enh["P-Value"].round(4)
-
-    st.dataframe(results_enh)
-
-    # =========================
-    # ENHANCED MODEL DIAGNOSTICS
-    # =========================
-    st.subheader("Enhanced Model — Diagnostics")
-
-    residuals_enh = model_enhanced.resid
-    omni_stat_e, omni_p_e = omni_normtest(residuals_enh)
-    jb_stat_e, jb_p_e, skew_e, kurtosis_e = jarque_bera(residuals_enh)
-    dw_stat_e = durbin_watson(residuals_enh)
-
-    diag_enh = pd.DataFrame({
-        "Metric": [
-            "Omnibus", "Prob(Omnibus)",
-            "Jarque-Bera", "Prob(JB)",
-            "Skew", "Kurtosis",
-            "Durbin-Watson", "Condition Number"
-        ],
-        "Value": [
-            omni_stat_e, omni_p_e,
-            jb_stat_e, jb_p_e,
-            skew_e, kurtosis_e,
-            dw_stat_e, model_enhanced.condition_number
-        ]
-    })
+        coef_enh = coef_enh[coef_enh["Variable"] != "const"]
 
-    st.dataframe(diag_enh.round(3))
+        enhanced_display_vars = enhanced_core_columns(df_enhanced)
 
-    # =========================
-    # ENHANCED MODEL VIF
-    # =========================
-    st.subheader("Enhanced Model — VIF Check")
+        coef_enh_main = coef_enh[coef_enh["Variable"].isin(enhanced_display_vars)].copy()
+        coef_enh_main["AbsImpact"] = coef_enh_main["Coefficient"].abs()
+        coef_enh_main = coef_enh_main.sort_values("AbsImpact", ascending=True)
 
-    vif_enh = pd.DataFrame({
-        "Variable": X_enh.columns,
-        "VIF": [variance_inflation_factor(X_enh.values, i) for i in range(X_enh.shape[1])]
-    })
-    vif_enh = vif_enh[vif_enh["Variable"] != "const"]
-    vif_enh = vif_enh.sort_values("VIF", ascending=False).reset_index(drop=True)
-    vif_enh["Status"] = vif_enh["VIF"].apply(vif_flag)
-    vif_enh["VIF"] = vif_enh["VIF"].round(2)
-
-    st.dataframe(vif_enh)
-
-
-    # ============================================================
-    # 3-MODEL COMPARISON
-    # ============================================================
-    st.header("Model Comparison: Original → Fixed → Enhanced")
-
-    comparison_3 = pd.DataFrame({
-        "Metric": [
-            "R²",
-            "Adjusted R²",
-            "F-Statistic",
-            "Condition Number",
-            "Durbin-Watson",
-            "Observations"
-        ],
-        "Original Model": [
-            round(model.rsquared, 4),
-            round(model.rsquared_adj, 4),
-            round(model.fvalue, 1),
-            round(model.condition_number, 1),
-            round(dw_stat, 3),
-            int(model.nobs)
-        ],
-        "Fixed Model": [
-            round(model_fixed.rsquared, 4),
-            round(model_fixed.rsquared_adj, 4),
-            round(model_fixed.fvalue, 1),
-            round(model_fixed.condition_number, 1),
-            round(dw_stat_f, 3),
-            int(model_fixed.nobs)
-        ],
-        "Enhanced Model": [
-            round(model_enhanced.rsquared, 4),
-            round(model_enhanced.rsquared_adj, 4),
-            round(model_enhanced.fvalue, 1),
-            round(model_enhanced.condition_number, 1),
-            round(dw_stat_e, 3),
-            int(model_enhanced.nobs)
-        ]
-    })
+        fig, ax = plt.subplots(figsize=(8, 5))
 
-    st.dataframe(comparison_3)
+        colors = ["#2ecc71" if p < 0.05 else "#95a5a6" for p in coef_enh_main["p_value"]]
+        ax.barh(coef_enh_main["Variable"], coef_enh_main["Coefficient"], color=colors)
+        ax.set_title("Impact on Salary — Enhanced Model (Core Variables)")
+        ax.set_xlabel("Salary Impact (USD)")
+        ax.grid(axis="x", linestyle="--", alpha=0.5)
 
-    # Improvement summary
-    cond_enhanced = model_enhanced.condition_number
-    imp_total = ((cond_original - cond_enhanced) / cond_original) * 100
+        for i, (v, p) in enumerate(zip(coef_enh_main["Coefficient"], coef_enh_main["p_value"])):
+            label = f"{v:,.0f}" + (" *" if p < 0.05 else "")
+            ax.text(v, i, label, va='center', fontsize=8)
 
-    st.markdown(f"""
+        ax.legend(
+            handles=[
+                plt.Line2D([0], [0], color="#2ecc71", lw=6, label="Significant (p < 0.05)"),
+                plt.Line2D([0], [0], color="#95a5a6", lw=6, label="Not significant")
+            ],
+            loc="lower right", fontsize=8
+        )
+
+        plt.tight_layout()
+        st.pyplot(fig)
+        plt.close(fig)
+
+        # =========================
+        # ENHANCED MODEL REGRESSION TABLE
+        # =========================
+        st.subheader("Enhanced Model — Regression Results (Core Variables)")
+
+        results_enh = pd.DataFrame({
+            "Variable": model_enhanced.params.index,
+            "Coefficient (USD)": model_enhanced.params.values,
+            "Std Error": model_enhanced.bse.values,
+            "P-Value": model_enhanced.pvalues.values
+        })
+
+        results_enh = results_enh[results_enh["Variable"] != "const"]
+        results_enh = results_enh[results_enh["Variable"].isin(enhanced_display_vars)]
+
+        results_enh["Significant"] = results_enh["P-Value"].apply(
+            lambda x: "✅" if x < 0.05 else "❌"
+        )
+
+        results_enh = results_enh.sort_values(by="Coefficient (USD)", ascending=False)
+        results_enh["Coefficient (USD)"] = results_enh["Coefficient (USD)"].round(0)
+        results_enh["Std Error"] = results_enh["Std Error"].round(0)
+        results_enh["P-Value"] = results_enh["P-Value"].round(4)
+
+        st.dataframe(results_enh)
+
+        # =========================
+        # ENHANCED MODEL DIAGNOSTICS
+        # =========================
+        st.subheader("Enhanced Model — Diagnostics")
+
+        if st.toggle("Show residual diagnostics and VIF check", key="show_diag_enhanced"):
+            diag_e = diagnostics(ENHANCED_SPEC, wait=True)
+
+            diag_enh = pd.DataFrame({
+                "Metric": [
+                    "Omnibus", "Prob(Omnibus)",
+                    "Jarque-Bera", "Prob(JB)",
+                    "Skew", "Kurtosis",
+                    "Durbin-Watson", "Condition Number"
+                ],
+                "Value": [
+                    diag_e["omnibus"], diag_e["omnibus_p"],
+                    diag_e["jarque_bera"], diag_e["jarque_bera_p"],
+                    diag_e["skew"], diag_e["kurtosis"],
+                    diag_e["durbin_watson"], model_enhanced.condition_number
+                ]
+            })
+
+            st.dataframe(diag_enh.round(3))
+
+            # =========================
+            # ENHANCED MODEL VIF
+            # =========================
+            st.subheader("Enhanced Model — VIF Check")
+
+            vif_enh = model_enhanced.vif.table
+            vif_enh = vif_enh.sort_values("VIF", ascending=False).reset_index(drop=True)
+            vif_enh["Status"] = vif_enh["VIF"].apply(vif_flag)
+            vif_enh["VIF"] = vif_enh["VIF"].round(2)
+
+            st.dataframe(vif_enh)
+
+        # =========================
+        # FIXED-EFFECTS VERSION
+        # =========================
+        st.header("Fixed-Effects Model — Absorbed Location, Function, Project Size and Education")
+        st.markdown("""
+    The Enhanced model controls for region, work function, project size and education through
+    dummy columns whose coefficients are never interpreted. Here those controls are **absorbed**
+    as fixed effects instead (salaries and predictors are demeaned within each group), which
+    lets us control for the detailed `LocationWork` (every state/country) rather than
+    6 broad regions. Residual degrees of freedom account for every absorbed group.
+    """)
+
+        fe_absorb = ["LocationWork", "WorkFunction", "ProjectSizeClean", "EduGroup"]
+        fe_vars = enhanced_core_columns(df_enhanced)
+        model_fe = absorbed_ols(df_enhanced[fe_vars + fe_absorb + ["SalaryUSD"]], "SalaryUSD", fe_vars, fe_absorb)
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Observations", f"{model_fe.nobs:,}")
+        col2.metric("Absorbed Groups (rank)", f"{model_fe.absorbed_dof}")
+        col3.metric("Within R²", f"{model_fe.rsquared_within:.3f}")
+        col4.metric("Residual DoF", f"{model_fe.df_resid:,}")
+
+        fe_ci = model_fe.conf_int()
+        fe_rows = []
+        for var in ["IsFemale", "IsCertified", "IsConsult"]:
+            fe_rows.append({
+                "Variable": var,
+                "Enhanced Coef (USD)": model_enhanced.params.get(var),
+                "Enhanced p": model_enhanced.pvalues.get(var),
+                "FE Coef (USD)": model_fe.params[var],
+                "FE Std Error": model_fe.bse[var],
+                "FE p": model_fe.pvalues[var],
+                "FE 95% CI Low": fe_ci.loc[var, "Lower"],
+                "FE 95% CI High": fe_ci.loc[var, "Upper"],
+                "Significant (FE)": "✅" if model_fe.pvalues[var] < 0.05 else "❌"
+            })
+
+        fe_table = pd.DataFrame(fe_rows)
+        for col in ["Enhanced Coef (USD)", "FE Coef (USD)", "FE Std Error", "FE 95% CI Low", "FE 95% CI High"]:
+            fe_table[col] = fe_table[col].round(0)
+        for col in ["Enhanced p", "FE p"]:
+            fe_table[col] = fe_table[col].round(4)
+        st.dataframe(fe_table, hide_index=True)
+
+        if model_fe.dropped_singletons:
+            st.markdown(f"*{model_fe.dropped_singletons} respondents in single-member groups were dropped (they are fitted exactly and carry no information).*")
+
+
+        # ============================================================
+        # 3-MODEL COMPARISON
+        # ============================================================
+        st.header("Model Comparison: Original → Fixed → Enhanced")
+
+        diag_e = diagnostics(ENHANCED_SPEC, compare_diag)
+
+        comparison_3 = pd.DataFrame({
+            "Metric": [
+                "R²",
+                "Adjusted R²",
+                "F-Statistic",
+                "Condition Number",
+                "Durbin-Watson",
+                "Observations"
+            ],
+            "Original Model": [
+                round(model.rsquared, 4),
+                round(model.rsquared_adj, 4),
+                round(model.fvalue, 1),
+                round(model.condition_number, 1),
+                diag_value(diag, "durbin_watson"),
+                int(model.nobs)
+            ],
+            "Fixed Model": [
+                round(model_fixed.rsquared, 4),
+                round(model_fixed.rsquared_adj, 4),
+                round(model_fixed.fvalue, 1),
+                round(model_fixed.condition_number, 1),
+                diag_value(diag_f, "durbin_watson"),
+                int(model_fixed.nobs)
+            ],
+            "Enhanced Model": [
+                round(model_enhanced.rsquared, 4),
+                round(model_enhanced.rsquared_adj, 4),
+                round(model_enhanced.fvalue, 1),
+                round(model_enhanced.condition_number, 1),
+                diag_value(diag_e, "durbin_watson"),
+                int(model_enhanced.nobs)
+            ]
+        })
+
+        # Out-of-sample fit: 5-fold CV repeated 3 times (mean and SD over the 15 folds)
+        cv_specs = {
+            "Original Model": ORIGINAL_SPEC,
+            "Fixed Model": fixed_spec,
+            "Enhanced Model": ENHANCED_SPEC
+        }
+        cv_metrics = [("RMSE", 0), ("MAE", 0), ("R²", 4)]
+        cv_rows = {"Metric": []}
+        for metric, _ in cv_metrics:
+            cv_rows["Metric"] += [f"CV {metric} (mean)", f"CV {metric} (SD)"]
+        for name, spec in cv_specs.items():
+            scores = cv_scores(spec, df, snapshot, active_filters, k=5, repeats=3)
+            cv_rows[name] = []
+            for metric, digits in cv_metrics:
+                cv_rows[name] += [round(scores[metric].mean(), digits), round(scores[metric].std(), digits)]
+
+        comparison_3 = pd.concat([comparison_3, pd.DataFrame(cv_rows)], ignore_index=True)
+
+        st.dataframe(diag_table(comparison_3))
+        st.markdown("*CV rows: out-of-sample metrics from 5-fold cross-validation repeated 3 times; SD is the spread across the 15 folds.*")
+
+        # Improvement summary
+        cond_enhanced = model_enhanced.condition_number
+        imp_total = ((cond_original - cond_enhanced) / cond_original) * 100
+
+        st.markdown(f"""
     **Condition Number progression:**
     - Original: **{cond_original:,.0f}**
     - Fixed (drop Age + center): **{cond_fixed:,.0f}**
@@ -2133,12 +2176,12 @@ with tab_causation:
     """)
 
 
-    # ============================================================
-    # CONSULTANT HYPOTHESIS TEST
-    # ============================================================
-    st.header("Consultant Hypothesis Test")
+        # ============================================================
+        # CONSULTANT HYPOTHESIS TEST
+        # ============================================================
+        st.header("Consultant Hypothesis Test")
 
-    st.markdown("""
+        st.markdown("""
     **Hypothesis:** The supervisor suspects that **consultants' high salaries** are biasing
     the results — making it look like certifications increase salary when it's really the
     consultant premium driving the effect.
@@ -2148,77 +2191,444 @@ with tab_causation:
     adding location, role, and other controls.
     """)
 
-    # Get consultant and certification coefficients across models
-    def get_coef_safe(m, var):
-        if var in m.params.index:
-            return m.params[var], m.pvalues[var]
-        return None, None
-
-    models_to_compare = {
-        "Original Model": model,
-        "Fixed Model": model_fixed,
-        "Enhanced Model": model_enhanced
-    }
-
-    hypothesis_vars = ["IsConsult", "IsCertified", "IsMember", "IsFemale"]
-
-    hyp_rows = []
-    for var in hypothesis_vars:
-        row = {"Variable": var}
-        for name, m in models_to_compare.items():
-            coef, pval = get_coef_safe(m, var)
-            if coef is not None:
-                row[f"{name} Coef"] = round(coef, 0)
-                row[f"{name} p"] = round(pval, 4)
-            else:
-                row[f"{name} Coef"] = "N/A"
-                row[f"{name} p"] = "N/A"
-        hyp_rows.append(row)
-
-    hyp_df = pd.DataFrame(hyp_rows)
-    st.dataframe(hyp_df)
-
-    # Interpretation
-    consult_orig, consult_p_orig = get_coef_safe(model, "IsConsult")
-    consult_enh, consult_p_enh = get_coef_safe(model_enhanced, "IsConsult")
-    cert_orig, cert_p_orig = get_coef_safe(model, "IsCertified")
-    cert_enh, cert_p_enh = get_coef_safe(model_enhanced, "IsCertified")
-
-    st.subheader("Interpretation")
-
-    if consult_orig is not None and consult_enh is not None:
-        consult_change = ((consult_enh - consult_orig) / abs(consult_orig)) * 100
-        st.markdown(f"""
+        # Get consultant and certification coefficients across models
+        def get_coef_safe(m, var):
+            if var in m.params.index:
+                return m.params[var], m.pvalues[var]
+            return None, None
+
+        models_to_compare = {
+            "Original Model": model,
+            "Fixed Model": model_fixed,
+            "Enhanced Model": model_enhanced
+        }
+
+        hypothesis_vars = ["IsConsult", "IsCertified", "IsMember", "IsFemale"]
+
+        hyp_rows = []
+        for var in hypothesis_vars:
+            row = {"Variable": var}
+            for name, m in models_to_compare.items():
+                coef, pval = get_coef_safe(m, var)
+                if coef is not None:
+                    row[f"{name} Coef"] = round(coef, 0)
+                    row[f"{name} p"] = round(pval, 4)
+                else:
+                    row[f"{name} Coef"] = "N/A"
+                    row[f"{name} p"] = "N/A"
+            hyp_rows.append(row)
+
+        hyp_df = pd.DataFrame(hyp_rows)
+        st.dataframe(hyp_df)
+
+        # Interpretation
+        consult_orig, consult_p_orig = get_coef_safe(model, "IsConsult")
+        consult_enh, consult_p_enh = get_coef_safe(model_enhanced, "IsConsult")
+        cert_orig, cert_p_orig = get_coef_safe(model, "IsCertified")
+        cert_enh, cert_p_enh = get_coef_safe(model_enhanced, "IsCertified")
+
+        st.subheader("Interpretation")
+
+        if consult_orig is not None and consult_enh is not None:
+            consult_change = ((consult_enh - consult_orig) / abs(consult_orig)) * 100
+            st.markdown(f"""
     **Consultant Effect (`IsConsult`):**
     - Original model: **${consult_orig:,.0f}** (p={consult_p_orig:.4f})
     - Enhanced model: **${consult_enh:,.0f}** (p={consult_p_enh:.4f})
     - Change: **{consult_change:+.1f}%**
     """)
 
-        if abs(consult_change) > 20:
-            st.warning(f"⚠️ The consultant premium changed by {consult_change:+.1f}% after adding controls. "
+            if abs(consult_change) > 20:
+                st.warning(f"⚠️ The consultant premium changed by {consult_change:+.1f}% after adding controls. "
                        "This suggests the original estimate was partially confounded by other factors.")
-        else:
-            st.info(f"The consultant premium is relatively stable ({consult_change:+.1f}% change). "
+            else:
+                st.info(f"The consultant premium is relatively stable ({consult_change:+.1f}% change). "
                     "Consultants genuinely earn more, independent of location, role, and other factors.")
 
-    if cert_orig is not None and cert_enh is not None:
-        cert_change = ((cert_enh - cert_orig) / abs(cert_orig)) * 100
-        st.markdown(f"""
+        if cert_orig is not None and cert_enh is not None:
+            cert_change = ((cert_enh - cert_orig) / abs(cert_orig)) * 100
+            st.markdown(f"""
     **Certification Effect (`IsCertified`):**
     - Original model: **${cert_orig:,.0f}** (p={cert_p_orig:.4f})
     - Enhanced model: **${cert_enh:,.0f}** (p={cert_p_enh:.4f})
     - Change: **{cert_change:+.1f}%**
     """)
 
-        if cert_p_enh is not None and cert_p_enh > 0.05:
-            st.error("🔴 **Certification is NOT statistically significant** in the enhanced model. "
+            if cert_p_enh is not None and cert_p_enh > 0.05:
+                st.error("🔴 **Certification is NOT statistically significant** in the enhanced model. "
                      "The apparent certification premium may be explained by other factors "
                      "(location, role, company size, etc.).")
-        elif cert_enh is not None and abs(cert_change) > 30:
-            st.warning(f"⚠️ The certification effect changed by {cert_change:+.1f}% after adding controls. "
+            elif cert_enh is not None and abs(cert_change) > 30:
+                st.warning(f"⚠️ The certification effect changed by {cert_change:+.1f}% after adding controls. "
                        "The original estimate was partially confounded.")
-        else:
-            st.success("✅ Certification effect remains significant and stable after adding controls. "
+            else:
+                st.success("✅ Certification effect remains significant and stable after adding controls. "
                        "This strengthens the causal claim.")
 
+
+        # ============================================================
+        # SENSITIVITY TO UNOBSERVED CONFOUNDING
+        # ============================================================
+        st.header("Sensitivity to Unobserved Confounding (Enhanced Model)")
+
+        st.markdown("""
+    How strong would an **unmeasured confounder** have to be to overturn the Enhanced model's
+    estimates? (Cinelli & Hazlett, 2020.) The **robustness value RV** is the share of residual
+    variance a confounder must explain in *both* the variable and salary to bring the estimate to
+    zero; **RV (α=0.05)** is the strength that makes it statistically insignificant. Benchmarks show
+    what a confounder as strong as each observed control would do.
+    """)
+
+        sens_vars = ["IsCertified", "IsConsult", "IsFemale"]
+        sens_table = sensitivity_summary(model_enhanced, sens_vars)
+        sens_table["Estimate"] = sens_table["Estimate"].round(0)
+        st.dataframe(sens_table.round(4), hide_index=True)
+
+        col1, col2 = st.columns(2)
+        sens_var = col1.selectbox("Variable", list(sens_table["Variable"]), key="sensitivity_variable")
+        sens_k = col2.selectbox("Confounder strength (× benchmark)", [1, 2, 3], key="sensitivity_strength")
+
+        bounds = benchmark_bounds(model_enhanced, sens_var, kd=sens_k)
+        bounds = bounds.sort_values("R² Y~Z|D,X", ascending=False).head(10)
+        bounds["Still Significant"] = np.where(
+            np.sign(bounds["95% CI Low"]) == np.sign(bounds["95% CI High"]), "✅", "❌"
+        )
+        st.markdown(f"**{sens_k}× as strong as … (10 strongest benchmarks for `{sens_var}`)**")
+        st.dataframe(bounds.round(4), hide_index=True)
+
+        grid = contour_grid(model_enhanced, sens_var, lim=max(0.1, 1.5 * bounds["R² Y~Z|D,X"].max()))
+        fig, ax = plt.subplots(figsize=(7, 5))
+        levels = ax.contour(grid.columns, grid.index, grid.to_numpy(), levels=10, colors="grey", linewidths=0.8)
+        ax.clabel(levels, fmt="%.0f", fontsize=8)
+        ax.contour(grid.columns, grid.index, grid.to_numpy(), levels=[0], colors="red", linestyles="--")
+        ax.scatter(bounds["R² D~Z|X"], bounds["R² Y~Z|D,X"], color="black", s=12)
+        for _, b in bounds.head(5).iterrows():
+            ax.annotate(b["Benchmark"], (b["R² D~Z|X"], b["R² Y~Z|D,X"]), fontsize=7,
+                        xytext=(4, 2), textcoords="offset points")
+        ax.set_xlim(grid.columns.min(), grid.columns.max())
+        ax.set_ylim(grid.index.min(), grid.index.max())
+        ax.set_xlabel("Partial R² of confounder with the variable")
+        ax.set_ylabel("Partial R² of confounder with salary")
+        ax.set_title(f"Bias-adjusted {sens_var} coefficient (USD)")
+        st.pyplot(fig)
+        plt.close(fig)
+
+
+        # ============================================================
+        # PROPENSITY-SCORE MATCHING
+        # ============================================================
+        st.header("Propensity-Score Matching")
+
+        st.markdown("""
+    A check on the regression estimates that does not assume a linear salary model: each
+    certified (or consulting) respondent is matched to the **most similar non-certified respondent
+    of the same survey year and region**, using the predicted probability of being certified
+    (logistic model on the Enhanced controls). The effect on the treated (ATT) is the average
+    salary difference across matched pairs. A standardized mean difference (SMD) below 0.1
+    after matching indicates good balance.
+    """)
+
+        col1, col2, col3 = st.columns(3)
+        match_var = col1.selectbox("Treatment", ["IsCertified", "IsConsult"], key="match_treatment")
+        match_caliper = col2.selectbox("Caliper (SD of logit)", [0.1, 0.2, 0.5, None], index=1, key="match_caliper")
+        match_replace = col3.toggle("Match with replacement", value=False, key="match_replace")
+
+        match_covariates = [c for c in enhanced_core_columns(df_enhanced) if c != match_var]
+        matched = propensity_match(
+            df_enhanced[match_covariates + [match_var, "SalaryUSD", "WorkFunction", "ProjectSizeClean",
+                                            "EduGroup", "SurveyYear", "Region"]],
+            match_var, match_covariates,
+            categorical=["WorkFunction", "ProjectSizeClean", "EduGroup"],
+            strata=["SurveyYear", "Region"],
+            caliper=match_caliper,
+            replace=match_replace
+        )
+        att_low, att_high = matched.conf_int()
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("ATT (USD)", f"${matched.att:,.0f}")
+        col2.metric("95% CI", f"${att_low:,.0f} to ${att_high:,.0f}")
+        col3.metric("Matched Treated", f"{matched.n_matched:,} of {matched.n_treated:,}")
+        col4.metric("Controls Used", f"{matched.n_controls_used:,} of {matched.n_controls:,}")
+
+        enh_coef = model_enhanced.params.get(match_var)
+        st.markdown(f"""
+    - Matching ATT: **${matched.att:,.0f}** (p={matched.pvalue:.4f}) {"✅" if matched.pvalue < 0.05 else "❌"}
+    - Enhanced OLS coefficient: **${enh_coef:,.0f}** (p={model_enhanced.pvalues.get(match_var):.4f})
+    """)
+
+        balance = matched.balance.copy()
+        balance["Balanced"] = np.where(balance["SMD After"].abs() < 0.1, "✅", "❌")
+        st.markdown("**Covariate Balance (before vs after matching)**")
+        st.dataframe(balance.round(3), hide_index=True)
+
+
+        # ============================================================
+        # DOUBLE MACHINE LEARNING
+        # ============================================================
+        st.header("Double Machine Learning (Non-Linear Controls)")
+
+        st.markdown("""
+    The Enhanced model assumes every control affects salary **linearly**. Double machine learning
+    instead predicts salary and each selected variable from the controls with gradient-boosted trees
+    (5-fold cross-fitting, so no respondent is predicted by a model trained on them), then
+    regresses the unexplained part of salary on the unexplained part of the variables.
+    """)
+
+        dml_selected = st.multiselect("Variables", DML_TREATMENTS, default=DML_TREATMENTS, key="dml_treatments")
+
+        if dml_selected:
+            dml_controls = [c for c in enhanced_core_columns(df_enhanced) if c not in DML_TREATMENTS]
+            dml_fit = dml_effects(
+                df_enhanced, treatments=dml_selected, controls=dml_controls,
+                snapshot=snapshot, filters=active_filters
+            )
+            dml_ci = dml_fit.conf_int()
+
+            dml_rows = []
+            for var in dml_selected:
+                dml_rows.append({
+                    "Variable": var,
+                    "Enhanced Coef (USD)": model_enhanced.params.get(var),
+                    "Enhanced p": model_enhanced.pvalues.get(var),
+                    "DML Effect (USD)": dml_fit.params[var],
+                    "DML Std Error": dml_fit.bse[var],
+                    "DML p": dml_fit.pvalues[var],
+                    "DML 95% CI Low": dml_ci.loc[var, "Lower"],
+                    "DML 95% CI High": dml_ci.loc[var, "Upper"],
+                    "Significant (DML)": "✅" if dml_fit.pvalues[var] < 0.05 else "❌"
+                })
+
+            dml_table = pd.DataFrame(dml_rows)
+            for col in ["Enhanced Coef (USD)", "DML Effect (USD)", "DML Std Error", "DML 95% CI Low", "DML 95% CI High"]:
+                dml_table[col] = dml_table[col].round(0)
+            for col in ["Enhanced p", "DML p"]:
+                dml_table[col] = dml_table[col].round(4)
+            st.dataframe(dml_table, hide_index=True)
+
+            st.markdown(f"*Out-of-fold R² of the salary model: {dml_fit.nuisance_r2['SalaryUSD']:.3f} "
+                    f"({dml_fit.nobs:,} respondents). Standard errors are heteroskedasticity-robust.*")
+
+
+        # ============================================================
+        # QUANTILE REGRESSION
+        # ============================================================
+        st.header("Effects Across the Salary Distribution (Quantile Regression)")
+
+        st.markdown("""
+    Salaries are right-skewed, and the models above estimate effects on the **mean** salary.
+    Quantile regression fits the Enhanced model at the 10th, 25th, 50th (median), 75th and
+    90th percentile of salary (conditional on the controls). A line that rises with the
+    quantile means the variable matters more for top earners. Shaded bands are 95% intervals;
+    the dashed line is the Enhanced (mean) coefficient.
+    """)
+
+        qr_fits = quantile_fits(df)
+        qr_vars = ["IsFemale", "IsCertified", "IsConsult"]
+
+        fig, axes = plt.subplots(1, len(qr_vars), figsize=(15, 4.5))
+        for ax, var in zip(axes, qr_vars):
+            fits_var = qr_fits[qr_fits["Variable"] == var]
+            ax.fill_between(fits_var["Quantile"], fits_var["95% CI Low"], fits_var["95% CI High"],
+                            color="steelblue", alpha=0.2)
+            ax.plot(fits_var["Quantile"], fits_var["Coefficient"], marker="o", color="steelblue")
+            ax.axhline(model_enhanced.params[var], color="darkorange", linestyle="--", label="Enhanced (mean)")
+            ax.axhline(0, color="grey", linewidth=0.8)
+            ax.set_title(var)
+            ax.set_xlabel("Salary quantile")
+            ax.set_ylabel("Coefficient (USD)")
+            ax.set_xticks(fits_var["Quantile"])
+        axes[0].legend()
+        plt.tight_layout()
+        st.pyplot(fig)
+        plt.close(fig)
+
+        qr_table = qr_fits[qr_fits["Variable"].isin(qr_vars)].pivot(
+            index="Variable", columns="Quantile", values="Coefficient"
+        ).loc[qr_vars]
+        qr_table.columns = [f"τ = {q:g}" for q in qr_table.columns]
+        qr_table.insert(0, "Enhanced (mean)", [model_enhanced.params[v] for v in qr_vars])
+        st.dataframe(qr_table.round(0))
+
+
+        # ============================================================
+        # SUBGROUP COEFFICIENTS
+        # ============================================================
+        st.header("Key Coefficients by Subgroup (Enhanced Model)")
+
+        st.markdown("""
+    The Enhanced model re-estimated separately inside each survey year, region or industry
+    (all subgroups are solved in one batched call). Controls that do not vary inside a subgroup
+    — e.g. the region dummies when splitting by region — drop out of that subgroup's fit.
+    Subgroups with fewer than 30 respondents are not shown.
+    """)
+
+        design_enh = ENHANCED_SPEC.builder(df)
+        subgroup_labels = {
+            "Survey Year": df_enhanced["SurveyYear"],
+            "Region": df_enhanced["Region"],
+            "Industry": df_enhanced["Industry"].str.strip().str.lower(),
+        }
+        subgroup_by = st.selectbox("Split by", list(subgroup_labels), key="subgroup_split_by")
+
+        subgroup_fits = grouped_ols(
+            design_enh,
+            subgroup_labels[subgroup_by].reindex(design_enh.index),
+            center=ENHANCED_SPEC.center
+        )
+        subgroup_fits = subgroup_fits[subgroup_fits["Variable"].isin(hypothesis_vars)]
+
+        subgroup_rows = []
+        for group, fits in subgroup_fits.groupby("Group", sort=False):
+            row = {subgroup_by: str(group), "Observations": int(fits["Observations"].iloc[0])}
+            for var in hypothesis_vars:
+                fit_row = fits[fits["Variable"] == var]
+                if len(fit_row):
+                    row[f"{var} Coef"] = round(fit_row["Coefficient"].iloc[0], 0)
+                    row[f"{var} p"] = round(fit_row["P-Value"].iloc[0], 4)
+                else:
+                    row[f"{var} Coef"] = None
+                    row[f"{var} p"] = None
+            subgroup_rows.append(row)
+
+        st.dataframe(pd.DataFrame(subgroup_rows), hide_index=True)
+
+
+if tab_boosting.open:
+    from boosting import boosted_model
+
+    with tab_boosting:
+        # =========================
+        # GRADIENT-BOOSTED SALARY MODEL
+        # =========================
+        st.header("Non-Linear Salary Model (Gradient Boosting)")
+
+        st.markdown("""
+    The OLS models assume straight-line effects (the scatter plots fit a cubic curve in experience
+    only). This model lets **every variable act non-linearly and interact** — gradient-boosted
+    decision trees on the Enhanced variables plus age and industry, with region, work function,
+    project size, education and industry used directly as categories. If it predicts unseen
+    respondents much better than the Enhanced OLS model, the linear model is missing structure.
+    """)
+
+        booster = boosted_model(df, snapshot, active_filters)
+        enhanced_cv = cv_scores(ENHANCED_SPEC, df, snapshot, active_filters, k=5, repeats=3)
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Holdout R² (Boosting)", f"{booster.metrics['Holdout R²']:.3f}")
+        col2.metric("CV R² (Enhanced OLS)", f"{enhanced_cv['R²'].mean():.3f}")
+        col3.metric("Holdout RMSE", f"${booster.metrics['Holdout RMSE']:,.0f}")
+        col4.metric("Trees", f"{booster.metrics['Trees']}")
+
+        st.markdown(f"*Trained on {booster.metrics['Rows']:,} respondents (20% held out) "
+                f"in {booster.metrics['Training Seconds']:.1f} s.*")
+
+        # =========================
+        # PERMUTATION IMPORTANCE
+        # =========================
+        st.subheader("Which Variables Matter? (Permutation Importance)")
+        st.markdown("Drop in holdout R² when a variable's values are shuffled across respondents.")
+
+        importance = booster.importance.iloc[::-1]
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.barh(importance["Feature"], importance["R² Drop"], xerr=importance["Std"], color="steelblue")
+        ax.set_xlabel("Drop in R²")
+        plt.tight_layout()
+        st.pyplot(fig)
+        plt.close(fig)
+
+        # =========================
+        # PARTIAL DEPENDENCE
+        # =========================
+        st.subheader("Shape of Each Effect (Partial Dependence)")
+        st.markdown("Average predicted salary when every respondent is assigned the value on the x-axis.")
+
+        pdp_default = booster.features.index("YearsOfExperience")
+        pdp_feature = st.selectbox("Variable", booster.features, index=pdp_default, key="pdp_feature")
+        curve = booster.pdp[pdp_feature]
+
+        fig, ax = plt.subplots(figsize=(10, 4.5))
+        if pdp_feature in booster.categorical:
+            ax.bar(curve[pdp_feature].astype(str), curve["Predicted Salary"], color="steelblue")
+            plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+        else:
+            ax.plot(curve[pdp_feature], curve["Predicted Salary"], marker="o", color="steelblue")
+        ax.set_xlabel(pdp_feature)
+        ax.set_ylabel("Predicted Salary (USD)")
+        ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda v, _: f"${v:,.0f}"))
+        plt.tight_layout()
+        st.pyplot(fig)
+        plt.close(fig)
+
+
+if tab_predict.open:
+    from predict import predict_salary, profile_template
+
+    with tab_predict:
+        # =========================
+        # SALARY PREDICTOR
+        # =========================
+        st.header("Salary Predictor (Enhanced Model)")
+
+        st.markdown("""
+    Predicted salary of a profile from the **Enhanced OLS model** fitted on the current filters.
+    The **confidence interval** covers the average salary of everyone with this profile; the
+    **prediction interval** covers an individual respondent's salary and is much wider, because
+    the model explains only part of the variation between people.
+    """)
+
+        predictor = fitted_model(ENHANCED_SPEC, df, snapshot, active_filters)
+        template = profile_template(predictor)
+        choices = {source: predictor.levels[prefix] for prefix, source in ENHANCED_CATEGORICAL.items()
+                   if prefix in predictor.levels}
+
+        with st.form("predict_form"):
+            form_cols = st.columns(3)
+            profile = {}
+            for i, (col, default) in enumerate(template.iloc[0].items()):
+                with form_cols[i % 3]:
+                    if col in choices:
+                        profile[col] = st.selectbox(col, choices[col], index=choices[col].index(default),
+                                                    key=f"predict_{col}")
+                    elif col.startswith(("Is", "Has")):
+                        profile[col] = int(st.checkbox(col, value=bool(default), key=f"predict_{col}"))
+                    else:
+                        profile[col] = st.number_input(col, min_value=0.0, value=float(default),
+                                                       key=f"predict_{col}")
+            submitted = st.form_submit_button("Predict Salary")
+
+        if submitted:
+            single = predict_salary(predictor, pd.DataFrame([profile])).iloc[0]
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Predicted Salary", f"${single['Predicted Salary']:,.0f}")
+            col2.metric("95% Confidence Interval",
+                        f"${single['95% CI Low']:,.0f} – ${single['95% CI High']:,.0f}")
+            col3.metric("95% Prediction Interval",
+                        f"${single['95% PI Low']:,.0f} – ${single['95% PI High']:,.0f}")
+
+        # =========================
+        # BATCH PREDICTIONS
+        # =========================
+        st.subheader("Predict Many Profiles (CSV Upload)")
+        st.markdown("""
+    Upload a CSV with one profile per row and the columns of the template below. The raw survey
+    fields (LocationWork, ProjectSize, LevelOfEducation) may be given instead of Region,
+    ProjectSizeClean and EduGroup.
+    """)
+
+        st.download_button("Download template CSV", template.to_csv(index=False),
+                           file_name="salary_profiles_template.csv", mime="text/csv")
+        uploaded = st.file_uploader("Profiles CSV", type="csv", key="predict_upload")
+
+        if uploaded is not None:
+            profiles = pd.read_csv(uploaded)
+            try:
+                batch = predict_salary(predictor, profiles)
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                scored = pd.concat([profiles, batch], axis=1)
+                st.markdown(f"*{len(scored):,} profiles scored.*")
+                st.dataframe(scored.head(1000).round(0), hide_index=True)
+                st.download_button("Download predictions CSV", scored.to_csv(index=False),
+                                   file_name="salary_predictions.csv", mime="text/csv")
@@ -0,0 +1,240 @@
+"""
+matching.py
+===========
+Propensity-score matching estimate of the effect of a 0/1 flag
+(IsCertified, IsConsult, ...) on salary, as a check on the OLS coefficients:
+  1. a logistic propensity model on numeric + categorical covariates
+     (categoricals as sparse dummies, see design_matrix.py)
+  2. 1:1 nearest-neighbour matching on the logit of the propensity, inside
+     exact strata (survey year, region, ...), with a caliper, with or
+     without replacement
+  3. ATT = mean(treated − matched control) with the Abadie–Imbens standard
+     error, and a covariate balance table
+
+Neighbours come from a KD-tree per stratum (scipy cKDTree) queried with the
+caliper as distance bound, so the cost is O(n log n) rather than O(n²)
+pairwise distances. Matching without replacement is greedy in rounds: every
+unmatched treated row proposes its nearest free control, and a contested
+control goes to the treated row with the highest propensity.
+
+With replacement a control can serve many treated rows, so the pairs are not
+independent: the Abadie–Imbens variance adds K(K − 1)·σ²(x) for a control
+used K times, σ²(x) estimated from its nearest other control in the stratum.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse, stats
+from scipy.spatial import cKDTree
+from sklearn.linear_model import LogisticRegression
+
+from caching import memoize
+from design_matrix import sparse_dummies
+
+MATCH_CANDIDATES = 8
+
+
+class MatchResult:
+    """ATT, matched pairs and covariate balance of one propensity matching."""
+
+    def __init__(self, treatment, pairs, se, balance, propensity, n_treated, n_controls, caliper):
+        diff = pairs["Treated Salary"] - pairs["Control Salary"]
+        self.treatment = treatment
+        self.pairs = pairs
+        self.balance = balance
+        self.propensity = propensity
+        self.n_treated = n_treated
+        self.n_controls = n_controls
+        self.n_matched = len(pairs)
+        self.n_controls_used = pairs["Control Row"].nunique()
+        self.caliper = caliper
+        self.att = float(diff.mean()) if len(diff) else np.nan
+        # Abadie–Imbens SE (conditional on the estimated propensity scores)
+        self.se = se
+        self.pvalue = float(2 * stats.t.sf(abs(self.att / self.se), len(diff) - 1)) if self.se > 0 else np.nan
+
+    def conf_int(self, alpha=0.05):
+        q = stats.t.ppf(1 - alpha / 2, max(self.n_matched - 1, 1))
+        return self.att - q * self.se, self.att + q * self.se
+
+
+# ============================================================
+# PROPENSITY MODEL
+# ============================================================
+def _covariate_matrix(d, covariates, categorical):
+    dense = d[covariates].to_numpy(dtype=float)
+    std = dense.std(axis=0)
+    dense = dense / np.where(std > 0, std, 1.0)
+    blocks = [sparse_dummies(d[col], prefix=col) for col in categorical]
+    mats = [sparse.csr_matrix(dense)] + [m for m, _ in blocks]
+    names = list(covariates) + [name for _, names in blocks for name in names]
+    return sparse.hstack(mats, format="csr"), names
+
+
+def _propensity_logit(X, treated):
+    model = LogisticRegression(C=np.inf, max_iter=1000)
+    model.fit(X, treated)
+    return model.decision_function(X)
+
+
+# ============================================================
+# NEAREST-NEIGHBOUR MATCHING
+# ============================================================
+def _match_stratum(t_score, c_score, caliper, replace):
+    # Returns (treated positions, control positions) of the matched pairs
+    if t_score.size == 0 or c_score.size == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    tree = cKDTree(c_score[:, None])
+
+    if replace:
+        dist, idx = tree.query(t_score[:, None], k=1, distance_upper_bound=caliper)
+        ok = np.isfinite(dist)
+        return np.flatnonzero(ok), idx[ok]
+
+    # Greedy in rounds against the tree of the free controls, rebuilt only
+    # when some row finds all of its k nearest candidates taken
+    free = np.arange(c_score.size)
+    used = np.zeros(c_score.size, dtype=bool)
+    pending = np.argsort(-t_score, kind="stable")   # highest propensity first
+    out_t, out_c = [], []
+    while pending.size and free.size:
+        k = min(MATCH_CANDIDATES, free.size)
+        dist, idx = tree.query(t_score[pending, None], k=k, distance_upper_bound=caliper)
+        dist, idx = dist.reshape(pending.size, k), idx.reshape(pending.size, k)
+        within = np.isfinite(dist)
+        cand = free[np.minimum(idx, free.size - 1)]
+        open_ = within & ~used[cand]
+        has_open = open_.any(axis=1)
+
+        # Every row proposes its nearest open candidate; a contested control
+        # goes to the first (highest-propensity) proposer
+        proposers = np.flatnonzero(has_open)
+        choice = cand[proposers, open_[proposers].argmax(axis=1)]
+        _, first = np.unique(choice, return_index=True)
+        winners = proposers[first]
+        out_t.append(pending[winners])
+        out_c.append(choice[first])
+        used[choice[first]] = True
+
+        # Rows with a candidate outside the caliper and none open are done
+        exhausted = ~has_open & within.all(axis=1)
+        retry = has_open
+        retry[winners] = False
+        pending = pending[retry | exhausted]
+        if exhausted.any():
+            free = free[~used[free]]
+            if free.size:
+                tree = cKDTree(c_score[free, None])
+
+    return np.concatenate(out_t), np.concatenate(out_c)
+
+
+# ============================================================
+# STANDARD ERROR
+# ============================================================
+def _control_variance(score, y):
+    # σ²(x) of each control: half the squared salary difference to its
+    # nearest other control on the logit (Abadie–Imbens with J = 1)
+    if score.size < 2:
+        return np.full(score.size, np.nan)
+    _, idx = cKDTree(score[:, None]).query(score[:, None], k=2)
+    # With tied scores the row itself need not come first
+    nearest = np.where(idx[:, 0] == np.arange(score.size), idx[:, 1], idx[:, 0])
+    return 0.5 * (y - y[nearest]) ** 2
+
+
+def _abadie_imbens_se(y, t_rows, c_rows, sigma2):
+    # V = [Σ_pairs (diff − ATT)² + Σ_controls K(K − 1)·σ²] / N1²
+    n = len(t_rows)
+    if n < 2:
+        return np.nan
+    diff = y[t_rows] - y[c_rows]
+    uses = np.bincount(c_rows, minlength=len(y)).astype(float)
+    reuse = uses * (uses - 1)
+    var = (((diff - diff.mean()) ** 2).sum() + (reuse[reuse > 0] * sigma2[reuse > 0]).sum()) / n ** 2
+    return float(np.sqrt(var))
+
+
+# ============================================================
+# BALANCE
+# ============================================================
+def _weighted_moments(X, w):
+    w = w / w.sum()
+    mean = np.asarray(X.T @ w).ravel()
+    sq = np.asarray(X.multiply(X).T @ w).ravel()
+    return mean, np.maximum(sq - mean ** 2, 0.0)
+
+
+def _balance_table(X, names, treated, control_weights):
+    t_mean, t_var = _weighted_moments(X, treated.astype(float))
+    c_mean, c_var = _weighted_moments(X, (~treated).astype(float))
+    m_mean, _ = _weighted_moments(X, control_weights)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pooled = np.sqrt((t_var + c_var) / 2)
+        smd_before = np.where(pooled > 0, (t_mean - c_mean) / pooled, 0.0)
+        smd_after = np.where(pooled > 0, (t_mean - m_mean) / pooled, 0.0)
+    return pd.DataFrame({
+        "Covariate": names,
+        "Treated Mean": t_mean,
+        "Control Mean (All)": c_mean,
+        "Control Mean (Matched)": m_mean,
+        "SMD Before": smd_before,
+        "SMD After": smd_after,
+    })
+
+
+@memoize(maxsize=32)
+def propensity_match(df, treatment, covariates, categorical=(), strata=(), outcome="SalaryUSD",
+                     caliper=0.2, replace=False):
+    """Match every ``treatment`` row to its nearest control on the propensity logit.
+
+    Controls are searched inside the same ``strata`` cell only; ``caliper`` is
+    in standard deviations of the logit (None for no caliper). Rows with a
+    missing value in any used column are dropped. Returns a MatchResult; the
+    balance table covers the covariates, every dummy and the logit itself.
+    """
+    covariates, categorical, strata = list(covariates), list(categorical), list(strata)
+    d = df.dropna(subset=[treatment, outcome] + covariates + categorical + strata)
+    treated = d[treatment].astype(bool).to_numpy()
+    y = d[outcome].to_numpy(dtype=float)
+
+    X, names = _covariate_matrix(d, covariates, categorical)
+    logit = _propensity_logit(X, treated)
+    radius = np.inf if caliper is None else caliper * logit.std()
+
+    codes = d.groupby(strata, sort=False).ngroup().to_numpy() if strata else np.zeros(len(d), dtype=int)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    t_rows, c_rows = [], []
+    sigma2 = np.full(len(d), np.nan)
+    for rows in np.split(order, bounds):
+        t_pos, c_pos = rows[treated[rows]], rows[~treated[rows]]
+        ti, ci = _match_stratum(logit[t_pos], logit[c_pos], radius, replace)
+        t_rows.append(t_pos[ti])
+        c_rows.append(c_pos[ci])
+        sigma2[c_pos] = _control_variance(logit[c_pos], y[c_pos])
+    t_rows, c_rows = np.concatenate(t_rows), np.concatenate(c_rows)
+    # A control alone in its stratum falls back to the variance of all controls
+    sigma2[np.isnan(sigma2)] = y[~treated].var(ddof=1) if (~treated).sum() > 1 else 0.0
+    se = _abadie_imbens_se(y, t_rows, c_rows, sigma2)
+
+    pairs = pd.DataFrame({
+        "Treated Row": d.index[t_rows],
+        "Control Row": d.index[c_rows],
+        "Treated Salary": y[t_rows],
+        "Control Salary": y[c_rows],
+        "Logit Distance": np.abs(logit[t_rows] - logit[c_rows]),
+    })
+
+    # Controls weighted by how often they were used; the logit is balanced too
+    weights = np.bincount(c_rows, minlength=len(d)).astype(float)
+    X_bal = sparse.hstack([X, sparse.csr_matrix(logit[:, None])], format="csr")
+    balance = _balance_table(X_bal, names + ["Propensity (logit)"], treated, weights)
+    # Report the dense covariates on their original scale
+    scale = d[covariates].to_numpy(dtype=float).std(axis=0)
+    scale = np.where(scale > 0, scale, 1.0)
+    for col in ["Treated Mean", "Control Mean (All)", "Control Mean (Matched)"]:
+        balance.loc[:len(covariates) - 1, col] *= scale
+
+    propensity = pd.Series(1 / (1 + np.exp(-logit)), index=d.index, name="Propensity")
+    return MatchResult(treatment, pairs, se, balance, propensity, int(treated.sum()), int((~treated).sum()), caliper)
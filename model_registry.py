@@ -0,0 +1,193 @@
+"""
+model_registry.py
+=================
+On-disk store of fitted OLS models shared by the dashboard (main.py), the
+Download Center and the PowerPoint generator.
+
+A fit is keyed by:
+  1. the model spec (design builder, columns, centering, SPEC_VERSION)
+  2. the data snapshot — content hash of the survey file
+  3. the active filters (employment status, location, ...)
+
+and stores coefficients, covariance, fit statistics, VIFs and the dummy
+category levels (plus, on request, k-fold CV scores). A warm start loads the pickle instead of
+rebuilding the design and refitting; a new survey file or a spec change
+gives a new key.
+
+Residual diagnostics (omnibus, Jarque-Bera, skew/kurtosis, Durbin-Watson)
+need a pass over the rows, so they are computed only on request, on a
+background thread, once per fit key, and persisted alongside the fit;
+ready_diagnostics() reads them without starting that work.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from caching import ARTIFACT_DIR, fingerprint
+from ols_engine import CrossProducts
+
+MODEL_DIR = os.path.join(ARTIFACT_DIR, "models")
+
+_snapshots = {}
+_loaded = {}
+
+_diag_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="diagnostics")
+_diag_futures = OrderedDict()
+_diag_lock = threading.Lock()
+
+
+# ============================================================
+# KEYS
+# ============================================================
+def data_snapshot(path):
+    """Content hash of a data file (re-hashed only when mtime/size change)."""
+    info = os.stat(path)
+    stamp = (os.path.abspath(path), info.st_mtime_ns, info.st_size)
+    if stamp not in _snapshots:
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        _snapshots[stamp] = h.hexdigest()
+    return _snapshots[stamp]
+
+
+def model_key(spec, snapshot, filters=None):
+    return f"{spec.name}-{fingerprint(spec.key_parts(), snapshot, filters)}"
+
+
+# ============================================================
+# STORAGE
+# ============================================================
+def _path(key):
+    return os.path.join(MODEL_DIR, f"{key}.pkl")
+
+
+def load_model(key):
+    if key in _loaded:
+        return _loaded[key]
+    try:
+        fit = pd.read_pickle(_path(key))
+    except (OSError, EOFError, ValueError, AttributeError, ImportError):
+        return None
+    _loaded[key] = fit
+    return fit
+
+
+def save_model(key, fit):
+    # Write to a temp file and rename, so a concurrent reader never sees half a pickle
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=MODEL_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        pd.to_pickle(fit, tmp)
+        os.replace(tmp, _path(key))
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    _loaded[key] = fit
+
+
+# ============================================================
+# FIT OR LOAD
+# ============================================================
+def residual_diagnostics(resid):
+    # Imported here: statsmodels is only needed once a fit's diagnostics are read
+    from statsmodels.stats.stattools import durbin_watson, jarque_bera, omni_normtest
+
+    omnibus, omnibus_p = omni_normtest(resid)
+    jb, jb_p, skew, kurtosis = jarque_bera(resid)
+    return {
+        "omnibus": float(omnibus),
+        "omnibus_p": float(omnibus_p),
+        "jarque_bera": float(jb),
+        "jarque_bera_p": float(jb_p),
+        "skew": float(skew),
+        "kurtosis": float(kurtosis),
+        "durbin_watson": float(durbin_watson(resid)),
+    }
+
+
+def fitted_model(spec, df, snapshot, filters=None):
+    """Return the fit of ``spec`` on ``df``, fitting and persisting it on a miss.
+
+    ``df`` must be the data identified by (snapshot, filters); it is only
+    touched when no stored fit exists.
+    """
+    key = model_key(spec, snapshot, filters)
+    fit = load_model(key)
+    if fit is not None:
+        return fit
+
+    design = spec.builder(df)
+    columns = design.columns if spec.columns is None else spec.columns
+    xp = CrossProducts.from_design(design)
+    fit = xp.fit(columns, center=spec.center)
+    fit.vif = xp.vif(columns, center=spec.center)
+    fit.levels = design.levels
+    fit.cache_key = key
+    save_model(key, fit)
+    return fit
+
+
+def _compute_diagnostics(spec, df, key):
+    diag = load_model(f"{key}-diag")
+    if diag is None:
+        design = spec.builder(df)
+        columns = design.columns if spec.columns is None else spec.columns
+        fit = CrossProducts.from_design(design).fit(columns, center=spec.center)
+        diag = residual_diagnostics(fit.resid)
+        save_model(f"{key}-diag", diag)
+    return diag
+
+
+def diagnostics_future(spec, df, snapshot, filters=None):
+    """Future of the residual diagnostics of ``spec`` (a dict, see residual_diagnostics).
+
+    The computation is submitted to a background thread the first time a
+    fit key is requested; later calls return the same future.
+    """
+    key = model_key(spec, snapshot, filters)
+    with _diag_lock:
+        future = _diag_futures.get(key)
+        if future is None:
+            future = _diag_pool.submit(_compute_diagnostics, spec, df, key)
+            _diag_futures[key] = future
+            if len(_diag_futures) > 64:
+                _diag_futures.popitem(last=False)
+        else:
+            _diag_futures.move_to_end(key)
+    return future
+
+
+def ready_diagnostics(spec, snapshot, filters=None):
+    """Residual diagnostics of ``spec`` if already computed (this session or
+    persisted), else None; never starts the computation."""
+    key = model_key(spec, snapshot, filters)
+    with _diag_lock:
+        future = _diag_futures.get(key)
+    if future is not None and future.done() and future.exception() is None:
+        return future.result()
+    return load_model(f"{key}-diag")
+
+
+def cv_scores(spec, df, snapshot, filters=None, k=5, repeats=3, seed=0):
+    """Per-fold out-of-sample metrics of ``spec`` (see CrossProducts.cross_validate)."""
+    key = f"{model_key(spec, snapshot, filters)}-cv{k}x{repeats}-{seed}"
+    scores = load_model(key)
+    if scores is not None:
+        return scores
+
+    design = spec.builder(df)
+    columns = design.columns if spec.columns is None else spec.columns
+    scores = CrossProducts.from_design(design).cross_validate(
+        columns, center=spec.center, k=k, repeats=repeats, seed=seed
+    )
+    save_model(key, scores)
+    return scores
@@ -0,0 +1,115 @@
+"""
+ppt_batch.py
+============
+Batch builds of the PowerPoint deck, one deck per segment (region, industry,
+survey year, ...), into a single zip on disk:
+  1. generate_batch() — build every segment's deck (survey_segments.segments)
+     and stream it into the zip, with a manifest of per-deck respondents, size
+     and build time
+
+The survey is loaded and normalized once, in the calling process. Each pool
+worker receives it once (through the pool initializer) and only filters its
+segments, renders their charts and assembles their slides. Decks are written
+into the zip as they finish, so the parent holds at most one finished deck
+per worker in memory.
+"""
+
+import os
+import re
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from generate_ppt import DATA_FILE, _load, generate_presentation
+from resampling import process_context
+from survey_segments import segment_label, segment_rows
+
+_worker = {}
+
+
+# ============================================================
+# WORKERS
+# ============================================================
+def _deck_name(i, segment):
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", segment_label(segment)).strip("_")
+    return f"{i:02d}_{slug}.pptx"
+
+
+def _init_worker(df, data_file):
+    _worker["df"] = df
+    _worker["data_file"] = data_file
+
+
+def _build_deck(segment):
+    # Nested process pools inside a pool worker would oversubscribe the CPUs
+    df = _worker["df"]
+    start = time.perf_counter()
+    buf = generate_presentation(_worker["data_file"], segment=segment, df=df, workers=1)
+    return buf.getvalue(), len(segment_rows(df, segment)), time.perf_counter() - start
+
+
+# ============================================================
+# BATCH
+# ============================================================
+def generate_batch(segment_list, path, data_file=DATA_FILE, workers=None, progress=None):
+    """Build the deck of every segment in ``segment_list`` into a zip at ``path``.
+
+    The zip holds one .pptx per segment plus manifest.csv; the manifest is
+    also returned. A segment whose deck fails is recorded in the manifest's
+    Error column instead of aborting the batch. ``progress(done, total,
+    label)`` is called after each deck.
+    """
+    df = _load(data_file)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(segment_list)))
+
+    rows = []
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        # .pptx files are already deflated, so the zip only stores them
+        with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_STORED) as zf:
+            def _write(i, segment, result=None, error=None):
+                name = _deck_name(i, segment)
+                row = {"Deck": name, "Segment": segment_label(segment), "Respondents": None,
+                       "Seconds": None, "Bytes": None, "Error": error}
+                if result is not None:
+                    data, row["Respondents"], row["Seconds"] = result
+                    row["Bytes"] = len(data)
+                    zf.writestr(name, data)
+                rows.append(row)
+                if progress is not None:
+                    progress(len(rows), len(segment_list), row["Segment"])
+
+            if workers == 1:
+                _init_worker(df, data_file)
+                for i, segment in enumerate(segment_list, 1):
+                    try:
+                        _write(i, segment, _build_deck(segment))
+                    except Exception as e:
+                        _write(i, segment, error=f"{type(e).__name__}: {e}")
+            else:
+                with ProcessPoolExecutor(max_workers=workers, mp_context=process_context(),
+                                         initializer=_init_worker, initargs=(df, data_file)) as pool:
+                    futures = {pool.submit(_build_deck, segment): (i, segment)
+                               for i, segment in enumerate(segment_list, 1)}
+                    for future in as_completed(futures):
+                        i, segment = futures[future]
+                        try:
+                            _write(i, segment, future.result())
+                        except Exception as e:
+                            _write(i, segment, error=f"{type(e).__name__}: {e}")
+
+            manifest = pd.DataFrame(rows).sort_values("Deck", ignore_index=True)
+            zf.writestr("manifest.csv", manifest.to_csv(index=False))
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return manifest
@@ -0,0 +1,157 @@
+"""
+ppt_jobs.py
+===========
+Background builds of the PowerPoint deck for the Download Center:
+  1. submit_deck()   — queue a build, or attach to the identical build that is
+     already queued, running or finished
+  2. submit_batch()  — the same for a zip of per-segment decks (ppt_batch)
+  3. submit_charts() — the same for a zip of every chart (download_charts)
+  4. DeckJob         — status and per-section (per-deck, per-chart) progress
+
+A build is keyed by the data snapshot and the generator options (segments),
+so every session asking for the same deck shares one build and one file in
+the artifact cache (which also survives restarts). Builds run on a single
+worker thread: pyplot keeps global figure state, so two decks must not draw
+at the same time.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from caching import ARTIFACT_DIR, fingerprint
+from download_charts import CHARTS, export_charts
+from generate_ppt import DATA_FILE, SLIDE_COUNT, _load, generate_presentation
+from model_registry import data_snapshot
+from ppt_batch import generate_batch
+
+DECK_DIR = os.path.join(ARTIFACT_DIR, "decks")
+DECK_VERSION = 1
+
+_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="deck")
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+class DeckJob:
+    """One build writing ``path``: status is queued, running, done or failed."""
+
+    def __init__(self, key, path, total, unit, status="queued"):
+        self.key = key
+        self.path = path
+        self.status = status
+        self.done = total if status == "done" else 0
+        self.total = total
+        self.unit = unit
+        self.label = "Finished" if status == "done" else "Waiting for a free worker"
+        self.error = None
+        self.submitted = time.time()
+        self.seconds = None
+
+    @property
+    def fraction(self):
+        return min(self.done / self.total, 1.0) if self.total else 0.0
+
+    def _progress(self, done, total, label):
+        self.done, self.total, self.label = done, total, label
+
+
+# ============================================================
+# STORAGE
+# ============================================================
+def deck_key(data_file=DATA_FILE, **options):
+    return f"deck-{fingerprint(DECK_VERSION, data_snapshot(data_file), options)}"
+
+
+def deck_path(key):
+    return os.path.join(DECK_DIR, f"{key}.pptx")
+
+
+def batch_key(segment_list, data_file=DATA_FILE):
+    return f"batch-{fingerprint(DECK_VERSION, data_snapshot(data_file), segment_list)}"
+
+
+def batch_path(key):
+    return os.path.join(DECK_DIR, f"{key}.zip")
+
+
+def _save(path, buf):
+    # Write to a temp file and rename, so a concurrent download never sees half a deck
+    os.makedirs(DECK_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=DECK_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(buf.getvalue())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+# ============================================================
+# JOBS
+# ============================================================
+def _run(job, render):
+    job.status = "running"
+    start = time.perf_counter()
+    try:
+        render(job._progress)
+    except Exception as e:
+        job.error = f"{type(e).__name__}: {e}"
+        job.status = "failed"
+    else:
+        job._progress(job.total, job.total, "Finished")
+        job.status = "done"
+    job.seconds = time.perf_counter() - start
+
+
+def _submit(key, path, total, unit, render):
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is not None and job.status != "failed":
+            if job.status != "done" or os.path.exists(job.path):
+                return job
+        if os.path.exists(path):
+            job = DeckJob(key, path, total, unit, status="done")
+        else:
+            job = DeckJob(key, path, total, unit)
+            _pool.submit(_run, job, render)
+        _jobs[key] = job
+    return job
+
+
+def submit_deck(data_file=DATA_FILE, **options):
+    """Return the job building the deck of ``data_file`` with ``options``.
+
+    An identical queued or running build is joined instead of starting a new
+    one, and a deck already in the cache is returned as a finished job. A
+    failed build is retried on the next submit.
+    """
+    key = deck_key(data_file, **options)
+    path = deck_path(key)
+
+    def render(progress):
+        _save(path, generate_presentation(data_file, progress=progress, **options))
+
+    return _submit(key, path, SLIDE_COUNT, "slides", render)
+
+
+def submit_batch(segment_list, data_file=DATA_FILE, workers=None):
+    """Return the job building the zip of one deck per segment (see submit_deck)."""
+    key = batch_key(segment_list, data_file)
+    path = batch_path(key)
+    return _submit(key, path, len(segment_list), "decks",
+                   lambda progress: generate_batch(segment_list, path, data_file, workers, progress))
+
+
+def submit_charts(segment_list=(None,), tier="png", data_file=DATA_FILE, workers=None):
+    """Return the job exporting every chart of every segment into a zip (see export_charts)."""
+    segment_list = list(segment_list)
+    snapshot = data_snapshot(data_file)
+    key = f"charts-{fingerprint(DECK_VERSION, snapshot, segment_list, tier)}"
+    path = os.path.join(DECK_DIR, f"{key}.zip")
+    return _submit(key, path, len(segment_list) * len(CHARTS), "charts",
+                   lambda progress: export_charts(_load(data_file), snapshot, path, segment_list, tier,
+                                                  workers, progress))
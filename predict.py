@@ -0,0 +1,181 @@
+"""
+predict.py
+==========
+Salary predictions from the fitted Enhanced model (loaded from the model
+registry), for a single profile typed into the dashboard or a CSV of many
+profiles:
+  1. encode_profiles()  — profiles → rows of the model's design, using the
+     fit's own column order, centering and dummy categories
+  2. predict_salary()   — prediction, confidence interval of the mean and
+     prediction interval for every profile, in one matrix product
+  3. profile_template() — an example profile with every expected column
+
+Profiles may give the raw survey fields instead of the encoded ones
+(LocationWork for Region, ProjectSize for ProjectSizeClean, LevelOfEducation
+for EduGroup, CompanySize for LogCompanySize); they are cleaned with the
+same helpers as the training data.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from salary_models import (
+    ENHANCED_CATEGORICAL,
+    assign_region,
+    group_education,
+    map_unique,
+    standardize_project_size,
+)
+
+_FLAG_TRUE = {"1", "1.0", "true", "yes", "y"}
+_FLAG_FALSE = {"0", "0.0", "false", "no", "n"}
+_MISSING_TEXT = {"", "nan"}
+
+
+# ============================================================
+# ENCODING
+# ============================================================
+def _is_flag(name):
+    # Binary 0/1 columns, the same naming rule as the dashboard's predictor form
+    return name.startswith(("Is", "Has"))
+
+
+def _invalid(values, parsed, name):
+    text = values.astype(str).str.strip()
+    missing = values.isna() | text.str.lower().isin(_MISSING_TEXT)
+    bad = sorted(set(text[parsed.isna() & ~missing]))
+    if bad:
+        raise ValueError(f"Non-numeric {name} value(s): {', '.join(bad[:10])}"
+                         f"{' ...' if len(bad) > 10 else ''}")
+
+
+def _flag(values, name):
+    """0/1 flag from numbers or yes/no text; missing cells become NaN."""
+    if values.dtype != object and not pd.api.types.is_string_dtype(values):
+        return pd.to_numeric(values, errors="coerce").astype(float)
+    text = values.astype(str).str.strip().str.lower()
+    parsed = pd.Series(np.nan, index=values.index)
+    parsed[text.isin(_FLAG_TRUE)] = 1.0
+    parsed[text.isin(_FLAG_FALSE)] = 0.0
+    _invalid(values, parsed, name)
+    return parsed
+
+
+def _number(values, name):
+    """Continuous column as float; missing cells become NaN, other text is an error."""
+    parsed = pd.to_numeric(values, errors="coerce").astype(float)
+    _invalid(values, parsed, name)
+    return parsed
+
+
+def _derive(profiles):
+    # Fill encoded columns from the raw survey fields when only those are given
+    p = profiles.copy()
+    if "Region" not in p and "LocationWork" in p:
+        p["Region"] = map_unique(p["LocationWork"], assign_region)
+    if "ProjectSizeClean" not in p and "ProjectSize" in p:
+        p["ProjectSizeClean"] = map_unique(p["ProjectSize"], standardize_project_size)
+    if "EduGroup" not in p and "LevelOfEducation" in p:
+        p["EduGroup"] = map_unique(p["LevelOfEducation"].astype(str).str.strip().str.lower(), group_education)
+    if "LogCompanySize" not in p and "CompanySize" in p:
+        p["LogCompanySize"] = np.log1p(_number(p["CompanySize"], "CompanySize"))
+    if "WorkFunction" in p:
+        p["WorkFunction"] = p["WorkFunction"].astype(str).str.strip().replace({
+            "Other (please specify)": "Other"
+        })
+    return p
+
+
+def _dummy_prefix(name, levels):
+    return next((prefix for prefix in levels if name.startswith(f"{prefix}_")), None)
+
+
+def _numeric_columns(fit):
+    return [n for n in fit.params.index if n != "const" and _dummy_prefix(n, fit.levels) is None]
+
+
+def encode_profiles(fit, profiles):
+    """Design rows (n × k, in ``fit.params`` order) for a frame of profiles.
+
+    Raises ValueError for missing columns, non-numeric entries and categories
+    the model has not seen. Missing numeric values give NaN rows (and NaN
+    predictions). Only the Is*/Has* flags accept yes/no text.
+    """
+    p = _derive(profiles)
+    names = list(fit.params.index)
+    position = {name: j for j, name in enumerate(names)}
+    numeric = _numeric_columns(fit)
+    categorical = {prefix: ENHANCED_CATEGORICAL[prefix] for prefix in fit.levels}
+
+    missing = [c for c in numeric + list(categorical.values()) if c not in p]
+    if missing:
+        raise ValueError(f"Missing profile column(s): {', '.join(missing)}")
+
+    X = np.zeros((len(p), len(names)))
+    if "const" in position:
+        X[:, position["const"]] = 1.0
+    for name in numeric:
+        parse = _flag if _is_flag(name) else _number
+        X[:, position[name]] = parse(p[name], name).to_numpy() - fit.centers.get(name, 0.0)
+
+    rows = np.arange(len(p))
+    for prefix, source in categorical.items():
+        levels = fit.levels[prefix]
+        codes = pd.Index(levels).get_indexer(p[source])
+        unknown = sorted(set(p[source][codes < 0].astype(str)))
+        if unknown:
+            raise ValueError(f"Unknown {source} value(s): {', '.join(unknown)} "
+                             f"(expected one of: {', '.join(map(str, levels))})")
+        # The baseline level (and any level dropped from the fit) has no column
+        target = np.array([position.get(f"{prefix}_{level}", -1) for level in levels])[codes]
+        hit = target >= 0
+        X[rows[hit], target[hit]] = 1.0
+    return X
+
+
+# ============================================================
+# PREDICTION
+# ============================================================
+def predict_salary(fit, profiles, alpha=0.05):
+    """Predicted salary of every profile with confidence / prediction intervals.
+
+    ``fit`` is the Enhanced OLSFit from the model registry; ``profiles`` a
+    DataFrame with one row per profile. Returns a frame aligned with it.
+    """
+    X = encode_profiles(fit, profiles)
+    beta = fit.params.to_numpy()
+    cov = fit.cov_params().to_numpy()
+
+    pred = X @ beta
+    var_mean = np.einsum("ij,ij->i", X @ cov, X)
+    q = stats.t.ppf(1 - alpha / 2, fit.df_resid)
+    se_mean = np.sqrt(var_mean)
+    se_obs = np.sqrt(var_mean + fit.scale)
+
+    level = f"{100 * (1 - alpha):.0f}%"
+    return pd.DataFrame({
+        "Predicted Salary": pred,
+        f"{level} CI Low": pred - q * se_mean,
+        f"{level} CI High": pred + q * se_mean,
+        f"{level} PI Low": pred - q * se_obs,
+        f"{level} PI High": pred + q * se_obs,
+    }, index=profiles.index)
+
+
+def profile_template(fit):
+    """One example profile with every column predict_salary() expects."""
+    numeric = _numeric_columns(fit)
+    defaults = {
+        "YearsOfExperience": 12, "IsCertified": 1, "IsMember": 1, "IsFemale": 0,
+        "IsManager": 1, "IsConsult": 0, "HasPE": 0, "HasTechDegree": 1, "HasBizDegree": 0,
+        "CompanySize": 1000, "WorkHours": 45, "YrsWithEmployer": 5,
+    }
+    profile = {k: v for k, v in defaults.items()
+               if k in numeric or (k == "CompanySize" and "LogCompanySize" in numeric)}
+
+    example = {"Region": "Middle East", "WorkFunction": "Project Control"}
+    for prefix, levels in fit.levels.items():
+        source = ENHANCED_CATEGORICAL[prefix]
+        profile[source] = example[source] if example.get(source) in levels else levels[0]
+    return pd.DataFrame([profile])
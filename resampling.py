@@ -0,0 +1,281 @@
+"""
+resampling.py
+=============
+Resampling inference for the salary comparisons in the dashboard and deck:
+  1. gap_bootstrap()    — percentile and BCa intervals for the gender pay gap
+     (Women − Men) / Men of every cell of a breakdown at once
+  2. permutation_test() — p-values for a group salary difference (members,
+     certified, consultants, ...) in every segment at once
+
+Resamples are drawn as B × n matrices within strata: bootstrap row indices
+reduced with one weighted bincount, permuted group labels reduced with one
+matrix product against the per-segment salary columns. Replicates are split
+into fixed-size chunks with independent seeds (SeedSequence.spawn), so
+results do not depend on the number of workers. Chunks run on one shared,
+lazily started process pool (forkserver, so workers are never forked from
+the threaded Streamlit server); small runs stay in-process.
+"""
+
+import multiprocessing
+import os
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+
+from caching import memoize
+
+CHUNK_SIZE = 250
+# Below this many replicates, shipping the data to the pool costs more than it saves
+PARALLEL_MIN_REPLICATES = 1000
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+# ============================================================
+# PARALLEL CHUNKS
+# ============================================================
+def process_context():
+    """Start method for worker pools: forkserver (spawn where unavailable),
+    never fork, since the Streamlit server process is multi-threaded."""
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def _pool(workers):
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=process_context())
+            _pools[workers] = pool
+        return pool
+
+
+def _run_chunks(func, tasks, workers, min_parallel=PARALLEL_MIN_REPLICATES):
+    # Every task starts with its chunk's replicate count (see _chunk_plan);
+    # callers with costlier replicates lower ``min_parallel``
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(tasks))
+    if workers <= 1 or sum(task[0] for task in tasks) < min_parallel:
+        return [func(*task) for task in tasks]
+    pool = _pool(workers)
+    try:
+        return list(pool.map(func, *zip(*tasks)))
+    except BrokenProcessPool:
+        # A worker died: start a fresh pool on the next call
+        with _pools_lock:
+            if _pools.get(workers) is pool:
+                del _pools[workers]
+        raise
+
+
+def _chunk_plan(n_rep, seed, chunk_size=CHUNK_SIZE):
+    sizes = [chunk_size] * (n_rep // chunk_size)
+    if n_rep % chunk_size:
+        sizes.append(n_rep % chunk_size)
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    return sizes, streams
+
+
+# ============================================================
+# BOOTSTRAP
+# ============================================================
+def _strata_draws(rng, strata_rows, n_boot):
+    # B × n row indices, each stratum resampled with replacement inside itself
+    return np.concatenate([
+        rows[rng.integers(0, rows.size, size=(n_boot, rows.size))]
+        for rows in strata_rows
+    ], axis=1)
+
+
+def _cell_gaps(sums, counts):
+    # sums/counts: (..., n_cells, 2) with sex 0 = men, 1 = women
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+        return (means[..., 1] - means[..., 0]) / means[..., 0] * 100
+
+
+def _boot_chunk(n_boot, seed_seq, strata_rows, slot, values, n_slots):
+    rng = np.random.default_rng(seed_seq)
+    rows = _strata_draws(rng, strata_rows, n_boot)
+    # Offset every replicate's slots so one bincount covers the whole chunk
+    keys = slot[rows] + n_slots * np.arange(n_boot)[:, None]
+    sums = np.bincount(keys.ravel(), weights=values[rows].ravel(), minlength=n_boot * n_slots)
+    counts = np.bincount(keys.ravel(), minlength=n_boot * n_slots)
+    shape = (n_boot, n_slots // 2, 2)
+    return _cell_gaps(sums.reshape(shape), counts.reshape(shape))
+
+
+def _jackknife_acceleration(values, cell, sex, n_cells):
+    # Delete-one gaps in closed form: dropping a man (woman) only moves the
+    # men's (women's) mean of that observation's cell
+    accel = np.full(n_cells, np.nan)
+    for c in range(n_cells):
+        in_cell = cell == c
+        men, women = values[in_cell & ~sex], values[in_cell & sex]
+        if men.size < 2 or women.size < 2:
+            continue
+        s_m, s_w = men.sum(), women.sum()
+        mean_m, mean_w = s_m / men.size, s_w / women.size
+        mean_m_drop = (s_m - men) / (men.size - 1)
+        mean_w_drop = (s_w - women) / (women.size - 1)
+        theta = np.concatenate([
+            (mean_w - mean_m_drop) / mean_m_drop,
+            (mean_w_drop - mean_m) / mean_m,
+        ])
+        dev = theta.mean() - theta
+        denom = 6 * (dev ** 2).sum() ** 1.5
+        accel[c] = (dev ** 3).sum() / denom if denom > 0 else 0.0
+    return accel
+
+
+def _bca_interval(boot, theta_hat, accel, alpha):
+    # boot: (B, n_cells); returns (low, high) per cell
+    low = np.full(theta_hat.shape, np.nan)
+    high = np.full(theta_hat.shape, np.nan)
+    z_alpha = ndtri([alpha / 2, 1 - alpha / 2])
+    for c in range(theta_hat.size):
+        draws = boot[:, c]
+        draws = draws[np.isfinite(draws)]
+        if draws.size == 0 or not np.isfinite(theta_hat[c]) or not np.isfinite(accel[c]):
+            continue
+        prop = np.clip((draws < theta_hat[c]).mean(), 1 / (draws.size + 1), draws.size / (draws.size + 1))
+        z0 = ndtri(prop)
+        levels = ndtr(z0 + (z0 + z_alpha) / (1 - accel[c] * (z0 + z_alpha)))
+        low[c], high[c] = np.quantile(draws, levels)
+    return low, high
+
+
+@memoize(maxsize=64)
+def gap_bootstrap(df, cells=(), strata=("SurveyYear",), value="SalaryUSD", sex="IsFemale",
+                  n_boot=2000, alpha=0.05, seed=0, workers=None):
+    """Bootstrap the gender gap % of every ``cells`` combination at once.
+
+    Rows are resampled within ``strata`` × sex, so each replicate keeps the
+    year/sex composition of the sample. Returns one row per cell with the
+    point estimate, percentile and BCa intervals and the group sizes.
+    """
+    cells, strata = list(cells), list(strata)
+    d = df.dropna(subset=[value, sex] + cells + strata)
+    values = d[value].to_numpy(dtype=float)
+    is_female = d[sex].astype(bool).to_numpy()
+
+    if cells:
+        grouped = d.groupby(cells, sort=True)
+        cell_codes = grouped.ngroup().to_numpy()
+        cell_index = grouped.size().index
+    else:
+        cell_codes = np.zeros(len(d), dtype=int)
+        cell_index = pd.Index(["All"], name="Cell")
+    n_cells = len(cell_index)
+    slot = 2 * cell_codes + is_female
+    n_slots = 2 * n_cells
+
+    strata_codes = d.groupby(strata + [sex], sort=True).ngroup().to_numpy()
+    strata_rows = [np.flatnonzero(strata_codes == g) for g in np.unique(strata_codes)]
+
+    sums = np.bincount(slot, weights=values, minlength=n_slots).reshape(n_cells, 2)
+    counts = np.bincount(slot, minlength=n_slots).reshape(n_cells, 2)
+    theta_hat = _cell_gaps(sums, counts)
+
+    sizes, streams = _chunk_plan(n_boot, seed)
+    tasks = [(size, ss, strata_rows, slot, values, n_slots) for size, ss in zip(sizes, streams)]
+    boot = np.vstack(_run_chunks(_boot_chunk, tasks, workers))
+
+    with warnings.catch_warnings():
+        # Cells with a sex missing in every replicate stay NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        pct_low, pct_high = np.nanquantile(boot, [alpha / 2, 1 - alpha / 2], axis=0)
+    accel = _jackknife_acceleration(values, cell_codes, is_female, n_cells)
+    bca_low, bca_high = _bca_interval(boot, theta_hat, accel, alpha)
+
+    level = f"{100 * (1 - alpha):.0f}%"
+    return pd.DataFrame({
+        "Men (n)": counts[:, 0],
+        "Women (n)": counts[:, 1],
+        "Gap %": theta_hat,
+        f"{level} CI Low (Percentile)": pct_low,
+        f"{level} CI High (Percentile)": pct_high,
+        f"{level} CI Low (BCa)": bca_low,
+        f"{level} CI High (BCa)": bca_high,
+    }, index=cell_index)
+
+
+# ============================================================
+# PERMUTATION TESTS
+# ============================================================
+def _perm_chunk(n_perm, seed_seq, strata_rows, labels, seg_values):
+    rng = np.random.default_rng(seed_seq)
+    # B × n label matrix, labels shuffled only inside their stratum
+    perm = np.empty((n_perm, labels.size))
+    for rows in strata_rows:
+        perm[:, rows] = rng.permuted(np.broadcast_to(labels[rows], (n_perm, rows.size)), axis=1)
+    # Column s of seg_values holds the salaries of segment s (0 elsewhere)
+    return perm @ seg_values
+
+
+@memoize(maxsize=64)
+def permutation_test(df, group, by=(), strata=("SurveyYear",), value="SalaryUSD",
+                     n_perm=5000, seed=0, workers=None):
+    """Permutation test of mean(value | group) − mean(value | ~group).
+
+    One test per ``by`` segment plus an "All" row. Labels are shuffled within
+    segment × ``strata``, so every test holds the year mix of the two groups
+    fixed. p-values are two-sided, (1 + #{|T*| ≥ |T|}) / (B + 1).
+    """
+    by, strata = list(by), list(strata)
+    d = df.dropna(subset=[value, group] + by + strata)
+    values = d[value].to_numpy(dtype=float)
+    labels = d[group].astype(bool).to_numpy(dtype=float)
+
+    if by:
+        grouped = d.groupby(by, sort=True)
+        seg_codes = grouped.ngroup().to_numpy()
+        seg_index = grouped.size().index.tolist() + ["All"]
+    else:
+        seg_codes = np.zeros(len(d), dtype=int)
+        seg_index = ["All"]
+    n_segs = len(seg_index)
+
+    seg_values = np.zeros((len(d), n_segs))
+    seg_values[np.arange(len(d)), seg_codes] = values
+    seg_values[:, -1] = values
+
+    strata_codes = d.groupby(by + strata, sort=True).ngroup().to_numpy()
+    strata_rows = [np.flatnonzero(strata_codes == g) for g in np.unique(strata_codes)]
+
+    # Group sizes and segment totals are invariant under the shuffles
+    seg_members = np.zeros((len(d), n_segs))
+    seg_members[np.arange(len(d)), seg_codes] = 1.0
+    seg_members[:, -1] = 1.0
+    n_in = labels @ seg_members
+    n_all = seg_members.sum(axis=0)
+    total = seg_values.sum(axis=0)
+
+    def diff(sum_in):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return sum_in / n_in - (total - sum_in) / (n_all - n_in)
+
+    observed = diff(labels @ seg_values)
+
+    sizes, streams = _chunk_plan(n_perm, seed)
+    tasks = [(size, ss, strata_rows, labels, seg_values) for size, ss in zip(sizes, streams)]
+    null = diff(np.vstack(_run_chunks(_perm_chunk, tasks, workers)))
+
+    exceed = (np.abs(null) >= np.abs(observed) - 1e-9).sum(axis=0)
+    p_value = (1 + exceed) / (n_perm + 1)
+    p_value[~np.isfinite(observed)] = np.nan
+
+    return pd.DataFrame({
+        "Segment": seg_index,
+        "In Group (n)": n_in.astype(int),
+        "Out of Group (n)": (n_all - n_in).astype(int),
+        "Difference (USD)": observed,
+        "p-value": p_value,
+    })
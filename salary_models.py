@@ -0,0 +1,294 @@
+"""
+salary_models.py
+================
+Regression designs and model specifications shared by the dashboard
+(main.py), the Download Center and the PowerPoint generator:
+  1. KEY_IMPACT_SPEC — six-predictor OLS behind the coefficient bar charts
+  2. ORIGINAL_SPEC   — Advanced Multivariate model (Fixed model derives from it)
+  3. ENHANCED_SPEC   — Enhanced Causation model with region/function/project controls
+"""
+
+import numpy as np
+import pandas as pd
+
+from design_matrix import HybridDesign, sparse_dummies
+
+
+# Bump when a design builder changes, so persisted fits are not reused
+SPEC_VERSION = 3
+
+
+# ============================================================
+# CLEANING HELPERS
+# ============================================================
+def assign_region(loc):
+    loc_upper = str(loc).upper()
+    if "UNITED STATES" in loc_upper or "USA" in loc_upper:
+        return "US"
+    elif "CANADA" in loc_upper:
+        return "Canada"
+    elif any(x in loc_upper for x in [
+        "UNITED ARAB", "SAUDI", "QATAR", "KUWAIT", "OMAN", "BAHRAIN", "IRAQ", "JORDAN", "LEBANON"
+    ]):
+        return "Middle East"
+    elif any(x in loc_upper for x in [
+        "UNITED KINGDOM", "GERMANY", "FRANCE", "NETHERLANDS", "SPAIN", "ITALY",
+        "NORWAY", "SWEDEN", "SWITZERLAND", "BELGIUM", "IRELAND", "AUSTRIA",
+        "DENMARK", "FINLAND", "PORTUGAL", "POLAND", "CZECH", "ROMANIA", "EUROPE"
+    ]):
+        return "Europe"
+    elif any(x in loc_upper for x in [
+        "AUSTRALIA", "INDIA", "CHINA", "JAPAN", "SINGAPORE", "MALAYSIA",
+        "INDONESIA", "PHILIPPINES", "KOREA", "THAILAND", "VIETNAM",
+        "NEW ZEALAND", "PAKISTAN", "BANGLADESH", "HONG KONG", "TAIWAN"
+    ]):
+        return "Asia-Pacific"
+    else:
+        return "Other"
+
+
+def standardize_project_size(ps):
+    ps_str = str(ps).upper().replace(",", "").strip()
+    if any(x in ps_str for x in ["0-5", "0 - 5"]):
+        return "0-5M"
+    elif any(x in ps_str for x in ["5-20", "5 - 20"]):
+        return "5-20M"
+    elif any(x in ps_str for x in ["20-100", "20 - 100"]):
+        return "20-100M"
+    elif any(x in ps_str for x in ["100-500", "100 - 500"]):
+        return "100-500M"
+    elif any(x in ps_str for x in ["500-1000", "500 - 1000"]):
+        return "500M-1B"
+    elif "1000" in ps_str:
+        return "1B+"
+    else:
+        return ps_str
+
+
+def group_education(edu):
+    if any(x in edu for x in ["high school", "associate"]):
+        return "Low"
+    elif any(x in edu for x in ["undergraduate", "bachelor"]):
+        return "Mid"
+    elif any(x in edu for x in ["graduate", "master", "doctoral"]):
+        return "High"
+    else:
+        return "Mid"
+
+
+def map_unique(values, func):
+    """``values.apply(func)``, with ``func`` called once per distinct value."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    mapped = pd.Series([func(u) for u in uniques], dtype=object)
+    return pd.Series(mapped.to_numpy()[codes], index=values.index).infer_objects()
+
+
+# ============================================================
+# KEY IMPACT MODEL (dashboard charts + deck slide)
+# ============================================================
+KEY_IMPACT_VARS = ["YearsOfExperience", "IsCertified", "IsMember", "IsFemale", "IsManager", "IsConsult"]
+
+
+def key_impact_design(df):
+    dr = df.dropna(subset=["SalaryUSD", "YearsOfExperience", "Age"]).copy()
+    dr["IsManager"] = dr["ManagerialDuties"].astype(str).str.contains("Yes", case=False, na=False).astype(int)
+    dr["IsConsult"] = dr["Consult"].astype(str).str.contains("Yes", case=False, na=False).astype(int)
+    for c in ["IsCertified", "IsMember", "IsFemale"]:
+        dr[c] = dr[c].astype(int)
+
+    X = dr[KEY_IMPACT_VARS].astype(float)
+    X.insert(0, "const", 1.0)
+    return HybridDesign(X, dr["SalaryUSD"])
+
+
+# ============================================================
+# ORIGINAL MODEL (Advanced Multivariate Salary Model)
+# ============================================================
+ORIGINAL_CORE_VARS = [
+    "YearsOfExperience",
+    "Age",
+    "IsCertified",
+    "IsMember",
+    "IsFemale",
+    "IsManager",
+    "IsConsult"
+]
+
+
+def original_design(df):
+    df_reg = df.dropna(subset=[
+        "SalaryUSD",
+        "YearsOfExperience",
+        "Age",
+        "LevelOfEducation",
+        "Industry"
+    ]).copy()
+
+    # Clean education
+    df_reg["LevelOfEducation"] = df_reg["LevelOfEducation"].astype(str).str.strip().str.lower()
+
+    # Manager / consultant flags
+    df_reg["IsManager"] = df_reg["ManagerialDuties"].astype(str).str.contains("Yes", case=False, na=False)
+    df_reg["IsConsult"] = df_reg["Consult"].astype(str).str.contains("Yes", case=False, na=False)
+
+    # Convert booleans to int explicitly
+    for col in ["IsCertified", "IsMember", "IsFemale", "IsManager", "IsConsult"]:
+        df_reg[col] = df_reg[col].astype(int)
+
+    X = df_reg[ORIGINAL_CORE_VARS].copy()
+
+    # Convert numeric safely
+    X["YearsOfExperience"] = pd.to_numeric(X["YearsOfExperience"], errors="coerce")
+    X["Age"] = pd.to_numeric(X["Age"], errors="coerce")
+
+    # Dummy variables (sparse; categories taken before the NaN filter, as before)
+    edu_dummies = sparse_dummies(df_reg["LevelOfEducation"])
+    ind_dummies = sparse_dummies(df_reg["Industry"])
+
+    # Remove any leftover NaNs
+    keep = X.notna().all(axis=1).to_numpy()
+    X = X[keep]
+    y = pd.to_numeric(df_reg.loc[X.index, "SalaryUSD"], errors="coerce")
+
+    X.insert(0, "const", 1)
+    return HybridDesign(X, y, [(m[keep], names) for m, names in (edu_dummies, ind_dummies)])
+
+
+# ============================================================
+# ENHANCED CAUSATION MODEL
+# ============================================================
+ENHANCED_DISPLAY_VARS = [
+    "YearsOfExperience",
+    "IsCertified", "IsMember", "IsFemale",
+    "IsManager", "IsConsult",
+    "HasPE", "HasTechDegree", "HasBizDegree",
+    "LogCompanySize", "WorkHours"
+]
+
+# Dummy prefix → categorical column of enhanced_frame (first category is the baseline)
+ENHANCED_CATEGORICAL = {
+    "Region": "Region",
+    "Func": "WorkFunction",
+    "ProjSize": "ProjectSizeClean",
+    "Edu": "EduGroup",
+}
+
+
+def enhanced_frame(df):
+    """Clean and encode the extra controls used by the Enhanced model."""
+    df_enhanced = df.dropna(subset=[
+        "SalaryUSD", "YearsOfExperience",
+        "LocationWork", "WorkFunction", "ProjectSize"
+    ]).copy()
+
+    # --- Region Grouping from LocationWork ---
+    df_enhanced["Region"] = map_unique(df_enhanced["LocationWork"], assign_region)
+
+    # --- Clean WorkFunction ---
+    df_enhanced["WorkFunction"] = df_enhanced["WorkFunction"].astype(str).str.strip()
+    df_enhanced["WorkFunction"] = df_enhanced["WorkFunction"].replace({
+        "Other (please specify)": "Other"
+    })
+
+    # --- Standardize ProjectSize ---
+    df_enhanced["ProjectSizeClean"] = map_unique(df_enhanced["ProjectSize"], standardize_project_size)
+
+    # --- Numeric columns ---
+    df_enhanced["YearsOfExperience"] = pd.to_numeric(df_enhanced["YearsOfExperience"], errors="coerce")
+    df_enhanced["SalaryUSD"] = pd.to_numeric(df_enhanced["SalaryUSD"], errors="coerce")
+    df_enhanced["WorkHours"] = pd.to_numeric(df_enhanced["WorkHours"], errors="coerce")
+    df_enhanced["YrsWithEmployer"] = pd.to_numeric(df_enhanced["YrsWithEmployer"], errors="coerce")
+    df_enhanced["CompanySize"] = pd.to_numeric(df_enhanced["NumberOfEmployeesInCompany"], errors="coerce")
+    df_enhanced["LogCompanySize"] = np.log1p(df_enhanced["CompanySize"])
+
+    # --- Boolean flags (to int) ---
+    df_enhanced["IsCertified"] = df_enhanced["IsCertified"].astype(int)
+    df_enhanced["IsMember"] = df_enhanced["IsMember"].astype(int)
+    df_enhanced["IsFemale"] = df_enhanced["IsFemale"].astype(int)
+    df_enhanced["IsManager"] = df_enhanced["ManagerialDuties"].astype(str).str.contains("Yes", case=False, na=False).astype(int)
+    df_enhanced["IsConsult"] = df_enhanced["Consult"].astype(str).str.contains("Yes", case=False, na=False).astype(int)
+    df_enhanced["HasPE"] = df_enhanced["PE"].astype(str).str.contains("Yes", case=False, na=False).astype(int)
+    df_enhanced["HasTechDegree"] = df_enhanced["TechnicalDegree"].astype(str).str.contains("Yes", case=False, na=False).astype(int)
+    df_enhanced["HasBizDegree"] = df_enhanced["BusinessDegree"].astype(str).str.contains("Yes", case=False, na=False).astype(int)
+
+    # --- Education grouping (5 → 3 levels) ---
+    df_enhanced["LevelOfEducation"] = df_enhanced["LevelOfEducation"].astype(str).str.strip().str.lower()
+    df_enhanced["EduGroup"] = map_unique(df_enhanced["LevelOfEducation"], group_education)
+
+    return df_enhanced
+
+
+def enhanced_core_columns(df_enhanced):
+    core_vars = list(ENHANCED_DISPLAY_VARS)
+
+    # Add YrsWithEmployer only if enough data
+    if df_enhanced["YrsWithEmployer"].notna().sum() > len(df_enhanced) * 0.5:
+        core_vars.append("YrsWithEmployer")
+    return core_vars
+
+
+def enhanced_design(df):
+    df_enhanced = enhanced_frame(df)
+
+    X_enh = df_enhanced[enhanced_core_columns(df_enhanced)].copy()
+
+    # Convert numeric safely
+    for col in X_enh.columns:
+        X_enh[col] = pd.to_numeric(X_enh[col], errors="coerce")
+
+    # Add dummies (sparse)
+    dummies = [
+        sparse_dummies(df_enhanced[col], prefix=prefix)
+        for prefix, col in ENHANCED_CATEGORICAL.items()
+    ]
+    levels = {
+        prefix: list(pd.Categorical(df_enhanced[col]).categories)
+        for prefix, col in ENHANCED_CATEGORICAL.items()
+    }
+
+    # Clean
+    keep = X_enh.notna().all(axis=1).to_numpy()
+    X_enh = X_enh[keep]
+    y_enh = pd.to_numeric(df_enhanced.loc[X_enh.index, "SalaryUSD"], errors="coerce")
+
+    X_enh.insert(0, "const", 1)
+    return HybridDesign(X_enh, y_enh, [(m[keep], names) for m, names in dummies], levels)
+
+
+def decomposition_design(df):
+    """Enhanced design plus industry dummies (Oaxaca–Blinder decomposition)."""
+    design = enhanced_design(df)
+    # A missing industry gets its own level rather than the baseline's all-zero row
+    industry = df.loc[design.index, "Industry"].str.strip().str.lower().fillna("unknown")
+    return HybridDesign(design.dense, design.y, [
+        (design.sparse, design.sparse_names),
+        sparse_dummies(industry, prefix="Industry"),
+    ])
+
+
+# ============================================================
+# MODEL SPECIFICATIONS
+# ============================================================
+class ModelSpec:
+    """A named design builder plus the column subset / centering to fit.
+
+    ``columns=None`` fits every column the builder produces.
+    """
+
+    def __init__(self, name, builder, columns=None, center=()):
+        self.name = name
+        self.builder = builder
+        self.columns = None if columns is None else list(columns)
+        self.center = tuple(center)
+
+    def derive(self, name, columns=None, center=()):
+        """Same design, different column subset / centering."""
+        return ModelSpec(name, self.builder, columns, center)
+
+    def key_parts(self):
+        return (self.name, self.builder.__name__, self.columns, self.center, SPEC_VERSION)
+
+
+KEY_IMPACT_SPEC = ModelSpec("key_impact", key_impact_design)
+ORIGINAL_SPEC = ModelSpec("original", original_design)
+ENHANCED_SPEC = ModelSpec("enhanced", enhanced_design, center=["YearsOfExperience"])
@@ -0,0 +1,163 @@
+"""
+sensitivity.py
+==============
+Omitted-variable sensitivity analysis for OLS coefficients (Cinelli & Hazlett,
+2020, "Making sense of sensitivity"):
+  1. partial R² of the treatment with the outcome
+  2. robustness values RV_q (estimate reduced by 100·q %) and RV_{q,α}
+     (estimate no longer significant at level α)
+  3. bias-adjusted estimate / t for a hypothetical confounder Z, given its
+     partial R² with the treatment (R²_{D~Z|X}) and the outcome (R²_{Y~Z|D,X})
+  4. benchmark bounds: a confounder k times as strong as an observed covariate
+
+Everything is computed from an already fitted model: t-values, residual
+degrees of freedom and the (X'X)⁻¹ matrix. The partial correlation of the
+treatment with a covariate given the other regressors is read off the
+precision matrix, −P_dj / √(P_dd P_jj), so no auxiliary regression is refit.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+# ============================================================
+# ROBUSTNESS VALUES
+# ============================================================
+def partial_r2(t, dof):
+    """Partial R² of a regressor with the outcome, from its t-statistic."""
+    t = np.asarray(t, dtype=float)
+    return t ** 2 / (t ** 2 + dof)
+
+
+def robustness_value(t, dof, q=1.0, alpha=None):
+    """RV_q (alpha=None) or RV_{q,α}: the partial R² a confounder needs with both
+    the treatment and the outcome to reduce the estimate by 100·q % (or to make
+    the reduced-by-q estimate insignificant at level α)."""
+    fq = q * np.abs(np.asarray(t, dtype=float)) / np.sqrt(dof)
+    if alpha is None:
+        return 0.5 * (np.sqrt(fq ** 4 + 4 * fq ** 2) - fq ** 2)
+
+    f_crit = abs(stats.t.ppf(alpha / 2, dof - 1)) / np.sqrt(dof - 1)
+    fqa = np.maximum(fq - f_crit, 0.0)
+    rv = 0.5 * (np.sqrt(fqa ** 4 + 4 * fqa ** 2) - fqa ** 2)
+    # Beyond 1 / f_crit the solution sits on the R²_{D~Z|X} = 1 boundary
+    extreme = (fqa > 0) & (fq > 1 / f_crit)
+    return np.where(extreme, (fq ** 2 - f_crit ** 2) / (1 + fq ** 2), rv)
+
+
+# ============================================================
+# BIAS ADJUSTMENT
+# ============================================================
+def bias(se, dof, r2dz_x, r2yz_dx):
+    """Largest |bias| of a confounder with the given partial R²s."""
+    r2dz_x, r2yz_dx = np.asarray(r2dz_x, dtype=float), np.asarray(r2yz_dx, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return se * np.sqrt(r2yz_dx * r2dz_x / (1 - r2dz_x)) * np.sqrt(dof)
+
+
+def adjusted_estimate(estimate, se, dof, r2dz_x, r2yz_dx):
+    """Estimate moved towards zero by the maximal bias."""
+    return np.sign(estimate) * (np.abs(estimate) - bias(se, dof, r2dz_x, r2yz_dx))
+
+
+def adjusted_se(se, dof, r2dz_x, r2yz_dx):
+    r2dz_x, r2yz_dx = np.asarray(r2dz_x, dtype=float), np.asarray(r2yz_dx, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return se * np.sqrt((1 - r2yz_dx) / (1 - r2dz_x)) * np.sqrt(dof / (dof - 1))
+
+
+def _treatment_stats(fit, treatment):
+    return (float(fit.params[treatment]), float(fit.bse[treatment]),
+            float(fit.tvalues[treatment]), float(fit.df_resid))
+
+
+# ============================================================
+# BENCHMARKS
+# ============================================================
+def _covariates(fit, treatment):
+    return [c for c in fit.params.index if c not in ("const", treatment)]
+
+
+def treatment_partial_r2(fit, treatment):
+    """Partial R² of the treatment with every other regressor, given the rest.
+
+    Read off (X'X)⁻¹ of the fitted outcome model: the partial correlation of
+    columns d and j given all remaining columns is −P_dj / √(P_dd P_jj).
+    """
+    prec = fit.normalized_cov_params
+    cols = _covariates(fit, treatment)
+    p_dj = prec.loc[treatment, cols].to_numpy()
+    p_jj = np.diag(prec.loc[cols, cols].to_numpy())
+    corr = -p_dj / np.sqrt(prec.loc[treatment, treatment] * p_jj)
+    return pd.Series(corr ** 2, index=cols)
+
+
+def benchmark_bounds(fit, treatment, kd=1.0, ky=None, alpha=0.05):
+    """Bounds on a confounder kd (ky) times as strong as each observed covariate.
+
+    One row per covariate: the implied R²_{D~Z|X} and R²_{Y~Z|D,X} and the
+    bias-adjusted estimate, t and confidence interval. Covariates for which
+    the bound is undefined (kd · R²_{D~Xj|X} ≥ 1 − R²_{D~Xj|X}) are dropped.
+    """
+    ky = kd if ky is None else ky
+    estimate, se, _, dof = _treatment_stats(fit, treatment)
+    r2dxj_x = treatment_partial_r2(fit, treatment)
+    cols = list(r2dxj_x.index)
+    r2yxj_dx = partial_r2(fit.tvalues[cols].to_numpy(), dof)
+    r2dxj_x = r2dxj_x.to_numpy()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2dz_x = kd * r2dxj_x / (1 - r2dxj_x)
+        r2zxj_xd = kd * r2dxj_x ** 2 / ((1 - kd * r2dxj_x) * (1 - r2dxj_x))
+        r2yz_dx = ((np.sqrt(ky) + np.sqrt(r2zxj_xd)) / np.sqrt(1 - r2zxj_xd)) ** 2 * (r2yxj_dx / (1 - r2yxj_dx))
+    r2yz_dx = np.minimum(r2yz_dx, 1.0)
+
+    est = adjusted_estimate(estimate, se, dof, r2dz_x, r2yz_dx)
+    adj_se = adjusted_se(se, dof, r2dz_x, r2yz_dx)
+    q = stats.t.ppf(1 - alpha / 2, dof - 1)
+    level = f"{100 * (1 - alpha):.0f}%"
+    out = pd.DataFrame({
+        "Benchmark": cols,
+        "R² D~Z|X": r2dz_x,
+        "R² Y~Z|D,X": r2yz_dx,
+        "Adjusted Estimate": est,
+        "Adjusted t": est / adj_se,
+        f"{level} CI Low": est - q * adj_se,
+        f"{level} CI High": est + q * adj_se,
+    })
+    return out[(r2dz_x < 1) & (r2zxj_xd < 1)].reset_index(drop=True)
+
+
+# ============================================================
+# SUMMARY / CONTOURS
+# ============================================================
+def sensitivity_summary(fit, treatments, q=1.0, alpha=0.05):
+    """One row per treatment: estimate, t, partial R², RV_q and RV_{q,α}."""
+    rows = []
+    for treatment in treatments:
+        if treatment not in fit.params.index:
+            continue
+        estimate, se, t, dof = _treatment_stats(fit, treatment)
+        rows.append({
+            "Variable": treatment,
+            "Estimate": estimate,
+            "t": t,
+            "Partial R² (Y~D|X)": float(partial_r2(t, dof)),
+            f"RV (q={q:g})": float(robustness_value(t, dof, q)),
+            f"RV (q={q:g}, α={alpha:g})": float(robustness_value(t, dof, q, alpha)),
+        })
+    return pd.DataFrame(rows)
+
+
+def contour_grid(fit, treatment, lim=0.3, n=31, statistic="estimate"):
+    """Bias-adjusted ``statistic`` ("estimate" or "t") on an n × n grid of
+    R²_{D~Z|X} (columns) × R²_{Y~Z|D,X} (rows), both in [0, lim]."""
+    estimate, se, _, dof = _treatment_stats(fit, treatment)
+    grid = np.linspace(0, lim, n)
+    r2dz, r2yz = np.meshgrid(grid, grid)
+    values = adjusted_estimate(estimate, se, dof, r2dz, r2yz)
+    if statistic == "t":
+        values = values / adjusted_se(se, dof, r2dz, r2yz)
+    return pd.DataFrame(values, index=pd.Index(grid, name="R² Y~Z|D,X"),
+                        columns=pd.Index(grid, name="R² D~Z|X"))
@@ -0,0 +1,56 @@
+"""
+survey_segments.py
+==================
+Segments of the survey (region, industry, survey year, ...) shared by the
+Download Center, the PowerPoint generator and the chart export:
+  1. add_segment_columns() — the normalized columns a survey can be segmented on
+  2. segments()            — the segments with enough respondents
+  3. segment_rows()        — the rows of one segment
+  4. segment_label()       — its display name
+
+A segment is a {column: value} dict such as {"Region": "Europe"}. Kept apart
+from generate_ppt so pages can list segments without importing python-pptx.
+"""
+
+import numpy as np
+
+from salary_models import assign_region, map_unique
+
+DATA_FILE = "salary_usd_cleaned.csv"
+SEGMENT_COLUMNS = ("Region", "Industry", "SurveyYear")
+MIN_SEGMENT_ROWS = 100
+
+
+# ============================================================
+# SEGMENTS
+# ============================================================
+def add_segment_columns(df):
+    """A copy of ``df`` with the normalized columns the survey can be segmented
+    on (see segment_rows); ``df`` itself is left unchanged."""
+    return df.assign(
+        Region=map_unique(df["LocationWork"], assign_region),
+        Industry=df["Industry"].str.strip().str.lower(),
+    )
+
+
+def segments(df, columns=SEGMENT_COLUMNS, min_rows=MIN_SEGMENT_ROWS):
+    """One {column: value} segment per value of each of ``columns`` with at
+    least ``min_rows`` respondents (``df`` with add_segment_columns applied)."""
+    out = []
+    for col in columns:
+        counts = df[col].value_counts()
+        for value in sorted(counts.index[counts >= min_rows]):
+            out.append({col: value.item() if hasattr(value, "item") else value})
+    return out
+
+
+def segment_rows(df, segment):
+    """Rows of ``df`` in ``segment``, a {column: value} dict such as {"Region": "Europe"}."""
+    keep = np.ones(len(df), dtype=bool)
+    for col, value in segment.items():
+        keep &= (df[col] == value).to_numpy()
+    return df[keep]
+
+
+def segment_label(segment):
+    return "  |  ".join(str(v).title() if str(v).islower() else str(v) for v in segment.values())
@@ -0,0 +1,73 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from design_matrix import HybridDesign, sparse_dummies  # noqa: E402
+
+DATA_FILE = os.path.join(ROOT, "salary_usd_cleaned.csv")
+
+
+@pytest.fixture(scope="session")
+def frame():
+    """Synthetic respondents: numeric columns, 0/1 flags, categoricals and a salary."""
+    rng = np.random.default_rng(42)
+    n = 600
+    df = pd.DataFrame({
+        "YearsOfExperience": rng.uniform(0, 40, n),
+        "WorkHours": rng.normal(45, 5, n),
+        "IsCertified": rng.integers(0, 2, n),
+        "IsFemale": rng.integers(0, 2, n),
+        "Region": rng.choice(["Asia", "Canada", "Europe", "US"], n),
+        "Industry": rng.choice(["construction", "consulting", "government", "mining", "oil"], n),
+        "SurveyYear": rng.choice([2015, 2023], n),
+    })
+    region = df["Region"].map({"Asia": 0, "Canada": 8000, "Europe": 4000, "US": 15000})
+    df["SalaryUSD"] = (
+        60000 + 1500 * df["YearsOfExperience"] + 300 * df["WorkHours"]
+        + 6000 * df["IsCertified"] - 8000 * df["IsFemale"] + region
+        + 5000 * (df["SurveyYear"] == 2023) + rng.normal(0, 12000, n)
+    )
+    return df
+
+
+@pytest.fixture(scope="session")
+def survey():
+    """The cleaned survey, prepared as the Download Center loads it."""
+    df = pd.read_csv(DATA_FILE)
+    df["YearsOfExperience"] = pd.to_numeric(df["YearsOfExperience"], errors="coerce")
+    df["SalaryUSD"] = pd.to_numeric(df["Salary_USD"], errors="coerce")
+    df["Age"] = pd.to_numeric(df["Age"], errors="coerce")
+    df["IsCertified"] = df["AACECertified"].astype(str).str.contains("Yes", case=False, na=False)
+    df["IsMember"] = df["Member"].astype(str).str.contains("Yes", case=False, na=False)
+    df["IsFemale"] = df["Sex"].astype(str).str.contains("Female", case=False, na=False)
+    return df
+
+
+def _design(frame):
+    numeric = ["YearsOfExperience", "WorkHours", "IsCertified", "IsFemale"]
+    dense = frame[numeric].astype(float)
+    dense.insert(0, "const", 1.0)
+    blocks = [sparse_dummies(frame[col], prefix=col) for col in ("Region", "Industry")]
+    hybrid = HybridDesign(dense, frame["SalaryUSD"], blocks)
+    full = pd.concat([
+        dense,
+        *[pd.DataFrame(m.toarray(), index=frame.index, columns=names) for m, names in blocks],
+    ], axis=1)
+    return hybrid, full
+
+
+@pytest.fixture(scope="session")
+def make_design():
+    """Builder of (HybridDesign, the same design as one dense DataFrame) of a frame."""
+    return _design
+
+
+@pytest.fixture(scope="session")
+def design(frame):
+    return _design(frame)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from caching import fingerprint, memoize
+
+
+def test_fingerprint_follows_content(frame):
+    assert fingerprint(frame, "a", 1) == fingerprint(frame.copy(), "a", 1)
+    changed = frame.copy()
+    changed.iloc[0, 0] += 1
+    assert fingerprint(changed) != fingerprint(frame)
+    # Same values, different rows
+    head = frame.iloc[:10]
+    assert fingerprint(head) != fingerprint(head.set_axis(head.index + 1000))
+    assert fingerprint(np.arange(4)) != fingerprint(np.arange(4).reshape(2, 2))
+    assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+
+
+def test_memoize_is_bounded():
+    calls = []
+
+    @memoize(maxsize=2)
+    def square(x):
+        calls.append(x)
+        return x ** 2
+
+    assert [square(2), square(2), square(3), square(4), square(2)] == [4, 4, 9, 16, 4]
+    # 2 was evicted by 3 and 4, so it is computed again
+    assert calls == [2, 3, 4, 2]
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from design_matrix import sparse_dummies
+
+
+def test_sparse_dummies_match_get_dummies(frame):
+    values = frame["Industry"].where(frame.index % 17 != 0)
+    matrix, names = sparse_dummies(values, prefix="Industry")
+    expected = pd.get_dummies(values, prefix="Industry", drop_first=True, dtype=float)
+    assert names == list(expected.columns)
+    np.testing.assert_array_equal(matrix.toarray(), expected.to_numpy())
+    # Missing values encode as all-zero rows
+    assert matrix[np.flatnonzero(values.isna())].nnz == 0
+
+
+def test_sparse_dummies_keep_every_level(frame):
+    matrix, names = sparse_dummies(frame["Region"], drop_first=False)
+    assert names == sorted(frame["Region"].unique())
+    np.testing.assert_array_equal(matrix.sum(axis=1).A.ravel(), 1)
+
+
+def test_hybrid_design_columns(design):
+    hybrid, full = design
+    assert hybrid.columns == list(full.columns)
+    assert len(hybrid) == len(full)
+    np.testing.assert_array_equal(hybrid.dense.to_numpy(), full[hybrid.dense.columns].to_numpy())
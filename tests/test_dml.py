@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+
+import model_registry
+from dml import cross_fit, dml_effects
+
+TREATMENTS = ["IsCertified", "IsFemale"]
+CONTROLS = ["YearsOfExperience", "WorkHours", "SurveyYear"]
+CATEGORICAL = ["Region", "Industry"]
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_registry, "MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(model_registry, "_loaded", {})
+
+
+def _cross_fit(d, **kwargs):
+    return cross_fit(d, ["SalaryUSD"] + TREATMENTS, CONTROLS, CATEGORICAL, **kwargs)
+
+
+def test_final_stage_is_robust_ols_on_residuals(frame):
+    fit = dml_effects(frame, TREATMENTS, CONTROLS, CATEGORICAL, workers=1)
+    preds = _cross_fit(frame, workers=1)
+    u = frame["SalaryUSD"] - preds["SalaryUSD"]
+    V = frame[TREATMENTS].astype(float) - preds[TREATMENTS]
+    ref = sm.OLS(u, V).fit(cov_type="HC0")
+    np.testing.assert_allclose(fit.params, ref.params, rtol=1e-8)
+    np.testing.assert_allclose(fit.bse, ref.bse, rtol=1e-8)
+
+
+def test_cross_fitting_is_seeded(frame):
+    a = _cross_fit(frame, seed=2, workers=1)
+    b = _cross_fit(frame, seed=2, workers=2)
+    c = _cross_fit(frame, seed=3, workers=1)
+    pd.testing.assert_frame_equal(a, b)
+    assert not np.allclose(a, c)
+
+
+def test_stored_predictions_are_keyed_on_the_rows(frame, registry):
+    first, second = frame.iloc[:300], frame.iloc[300:]
+    stored = _cross_fit(first, snapshot="survey", workers=1)
+    pd.testing.assert_frame_equal(_cross_fit(first, snapshot="survey", workers=1), stored)
+    # Same size, same snapshot, different rows: fitted afresh, not reused
+    other = _cross_fit(second, snapshot="survey", workers=1)
+    pd.testing.assert_frame_equal(other, _cross_fit(second, workers=1))
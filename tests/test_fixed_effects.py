@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+
+from fixed_effects import absorbed_ols
+
+X_COLS = ["YearsOfExperience", "WorkHours", "IsCertified", "IsFemale"]
+ABSORB = ["Region", "Industry", "SurveyYear"]
+
+
+def _dummy_ols(df):
+    X = pd.get_dummies(df[X_COLS + ABSORB], columns=ABSORB, drop_first=True, dtype=float)
+    return sm.OLS(df["SalaryUSD"], sm.add_constant(X)).fit()
+
+
+def test_absorbed_slopes_match_dummy_regression(frame):
+    fit = absorbed_ols(frame, "SalaryUSD", X_COLS, ABSORB)
+    ref = _dummy_ols(frame)
+
+    np.testing.assert_allclose(fit.params, ref.params[X_COLS], rtol=1e-6)
+    np.testing.assert_allclose(fit.bse, ref.bse[X_COLS], rtol=1e-6)
+    assert fit.df_resid == ref.df_resid
+    assert fit.rsquared == pytest.approx(ref.rsquared, rel=1e-8)
+    assert fit.dropped_singletons == 0
+
+
+def test_singletons_are_dropped(frame):
+    df = frame.copy()
+    df.loc[df.index[0], "Industry"] = "only one respondent"
+    fit = absorbed_ols(df, "SalaryUSD", X_COLS, ABSORB)
+    ref = _dummy_ols(df.iloc[1:])
+
+    assert fit.dropped_singletons == 1
+    assert fit.nobs == len(df) - 1
+    np.testing.assert_allclose(fit.params, ref.params[X_COLS], rtol=1e-6)
+    np.testing.assert_allclose(fit.bse, ref.bse[X_COLS], rtol=1e-6)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from group_stats import RunningStats, group_fit, shape_stats
+
+
+def test_running_stats_merge_matches_numpy():
+    values = np.random.default_rng(0).normal(90000, 25000, 1000)
+    running = RunningStats()
+    for chunk in np.array_split(values, 7):
+        running.update(chunk)
+    assert running.n == values.size
+    assert running.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert running.std == pytest.approx(values.std(ddof=1), rel=1e-12)
+
+
+def test_group_fit_matches_polyfit(frame):
+    x, y = frame["YearsOfExperience"].to_numpy(), frame["SalaryUSD"].to_numpy()
+    fit = group_fit.__wrapped__(x, y)
+
+    keep = (y >= 10000) & (y <= 500000)
+    x, y = x[keep], y[keep]
+    ucl = y.mean() + 3 * y.std(ddof=1)
+    x, y = x[y <= ucl], y[y <= ucl]
+    assert fit.ucl == pytest.approx(ucl, rel=1e-12)
+    np.testing.assert_allclose(fit.coeffs, np.polyfit(x, y, 3), rtol=1e-6)
+    assert fit.corr == pytest.approx(np.corrcoef(x, y)[0, 1], rel=1e-9)
+
+
+def test_shape_stats_match_scipy(frame):
+    values = frame["SalaryUSD"].to_numpy().copy()
+    values[::50] = np.nan
+    skew, kurt = shape_stats(values)
+    assert skew == pytest.approx(stats.skew(values, nan_policy="omit"), rel=1e-10)
+    assert kurt == pytest.approx(stats.kurtosis(values, nan_policy="omit"), rel=1e-10)
+    assert np.isnan(shape_stats([5.0, 5.0, 5.0])).all()
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from matching import _abadie_imbens_se, propensity_match
+
+_propensity_match = propensity_match.__wrapped__
+COVARIATES = ["YearsOfExperience", "WorkHours", "IsFemale"]
+
+
+def _match(frame, replace):
+    return _propensity_match(frame, "IsCertified", COVARIATES, categorical=["Industry"],
+                             strata=["SurveyYear", "Region"], caliper=0.2, replace=replace)
+
+
+def test_abadie_imbens_variance_by_hand():
+    y = np.array([10.0, 14.0, 20.0, 3.0, 5.0, 8.0])
+    t_rows, c_rows = np.array([0, 1, 2]), np.array([3, 3, 5])
+    sigma2 = np.array([0, 0, 0, 4.0, 1.0, 9.0])
+    diff = np.array([7.0, 11.0, 12.0])
+    # Control 3 serves two pairs: K(K − 1) = 2
+    expected = np.sqrt((((diff - diff.mean()) ** 2).sum() + 2 * 4.0) / 9)
+    assert _abadie_imbens_se(y, t_rows, c_rows, sigma2) == pytest.approx(expected)
+
+
+def test_matching_without_replacement(frame):
+    m = _match(frame, replace=False)
+    pairs = m.pairs
+    assert pairs["Control Row"].is_unique
+    treated, control = frame.loc[pairs["Treated Row"]], frame.loc[pairs["Control Row"]]
+    for col in ("SurveyYear", "Region"):
+        np.testing.assert_array_equal(treated[col].to_numpy(), control[col].to_numpy())
+
+    # No control is reused, so the SE is the paired-difference one
+    diff = pairs["Treated Salary"] - pairs["Control Salary"]
+    assert m.se == pytest.approx(diff.std(ddof=0) / np.sqrt(len(diff)))
+    # Certification is randomized in the fixture with a +6,000 effect
+    assert abs(m.att - 6000) < 3 * m.se
+
+
+def test_reused_controls_widen_the_standard_error(frame):
+    m = _match(frame, replace=True)
+    diff = m.pairs["Treated Salary"] - m.pairs["Control Salary"]
+    assert m.n_controls_used < m.n_matched
+    assert m.se > diff.std(ddof=0) / np.sqrt(len(diff))
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+import model_registry
+from model_registry import fitted_model, load_model, model_key
+from salary_models import KEY_IMPACT_SPEC
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_registry, "MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(model_registry, "_loaded", {})
+    return tmp_path
+
+
+def test_fit_is_persisted_and_reloaded(survey, registry, monkeypatch):
+    fit = fitted_model(KEY_IMPACT_SPEC, survey, "snapshot-a")
+    assert (registry / f"{model_key(KEY_IMPACT_SPEC, 'snapshot-a')}.pkl").exists()
+
+    # A fresh process reads the pickle and never touches the data
+    monkeypatch.setattr(model_registry, "_loaded", {})
+    stored = fitted_model(KEY_IMPACT_SPEC, None, "snapshot-a")
+    np.testing.assert_allclose(stored.params, fit.params)
+    np.testing.assert_allclose(stored.bse, fit.bse)
+    with pytest.raises(ValueError):
+        stored.resid
+
+
+def test_keys_separate_snapshots_and_filters(survey, registry):
+    fit = fitted_model(KEY_IMPACT_SPEC, survey, "snapshot-a")
+    subset = survey[survey["SurveyYear"] == 2015]
+    filtered = fitted_model(KEY_IMPACT_SPEC, subset, "snapshot-a", {"SurveyYear": 2015})
+    assert filtered.nobs < fit.nobs
+    assert load_model(model_key(KEY_IMPACT_SPEC, "snapshot-b")) is None
+    assert len(list(registry.iterdir())) == 2
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+
+from oaxaca import oaxaca_blinder
+from salary_models import decomposition_design, enhanced_frame
+
+_oaxaca_blinder = oaxaca_blinder.__wrapped__
+
+
+@pytest.fixture(scope="module")
+def decomposition(survey):
+    return _oaxaca_blinder(survey, n_boot=100, workers=1)
+
+
+def _total(out, year, decomposition, component):
+    rows = out[(out["SurveyYear"] == year) & (out["Decomposition"] == decomposition)
+               & (out["Component"] == component) & (out["Factor"] == "Total")]
+    return rows["Estimate"].item()
+
+
+def test_components_add_up_to_the_raw_gap(decomposition):
+    for year in decomposition["SurveyYear"].unique():
+        gap = _total(decomposition, year, "Raw gap", "Gap")
+        for name in ("Twofold (men's coefficients)", "Twofold (women's coefficients)",
+                     "Twofold (pooled coefficients)"):
+            parts = _total(decomposition, year, name, "Explained") + _total(decomposition, year, name, "Unexplained")
+            assert parts == pytest.approx(gap, rel=1e-8)
+        threefold = sum(_total(decomposition, year, "Threefold", c)
+                        for c in ("Endowments", "Coefficients", "Interaction"))
+        assert threefold == pytest.approx(gap, rel=1e-8)
+
+
+@pytest.mark.filterwarnings("ignore")
+def test_explained_part_matches_statsmodels(survey, decomposition):
+    design = decomposition_design(survey)
+    year = enhanced_frame(survey).loc[design.index, "SurveyYear"].to_numpy()
+    columns = [c for c in design.columns if c != "IsFemale"]
+    X = pd.concat([design.dense, pd.DataFrame(design.sparse.toarray(), index=design.index,
+                                              columns=design.sparse_names)], axis=1)[columns]
+    female = design.dense["IsFemale"].to_numpy().astype(bool)
+
+    for y in decomposition["SurveyYear"].unique():
+        men, women = (year == y) & ~female, (year == y) & female
+        b_men = sm.OLS(design.y[men], X[men]).fit().params
+        explained = (X[men].mean() - X[women].mean()) @ b_men
+        assert _total(decomposition, y, "Twofold (men's coefficients)", "Explained") == pytest.approx(explained, rel=1e-6)
+
+
+def test_bootstrap_is_seeded(survey, decomposition):
+    again = _oaxaca_blinder(survey, n_boot=100, workers=1)
+    pooled = _oaxaca_blinder(survey, n_boot=100, workers=2)
+    pd.testing.assert_frame_equal(decomposition, again)
+    pd.testing.assert_frame_equal(decomposition, pooled)
+    other = _oaxaca_blinder(survey, n_boot=100, seed=1, workers=1)
+    assert not np.allclose(decomposition["Std Error"], other["Std Error"], equal_nan=True)
+
+
+def test_missing_industry_gets_its_own_level(survey):
+    df = survey.copy()
+    df.loc[df.index[:40], "Industry"] = np.nan
+    design = decomposition_design(df)
+    missing = df.loc[design.index, "Industry"].isna().to_numpy()
+    unknown = design.sparse[:, design.sparse_names.index("Industry_unknown")].toarray().ravel()
+    assert missing.any()
+    np.testing.assert_array_equal(unknown, missing)
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+
+from ols_engine import CrossProducts, grouped_ols
+
+
+# ============================================================
+# FITS FROM CROSS PRODUCTS
+# ============================================================
+def test_fit_matches_statsmodels(design, frame):
+    hybrid, full = design
+    xp = CrossProducts.from_design(hybrid)
+    fit = xp.fit(full.columns)
+    ref = sm.OLS(frame["SalaryUSD"], full).fit()
+
+    np.testing.assert_allclose(fit.params, ref.params, rtol=1e-8)
+    np.testing.assert_allclose(fit.bse, ref.bse, rtol=1e-8)
+    np.testing.assert_allclose(fit.pvalues, ref.pvalues, rtol=1e-6, atol=1e-12)
+    np.testing.assert_allclose(fit.resid, ref.resid, rtol=1e-6, atol=1e-6)
+    for attr in ("rsquared", "rsquared_adj", "fvalue", "ssr", "df_model", "df_resid"):
+        assert getattr(fit, attr) == pytest.approx(getattr(ref, attr), rel=1e-8)
+
+
+def test_column_subset_with_centering(design, frame):
+    hybrid, full = design
+    columns = ["const", "YearsOfExperience", "IsFemale", "Region_US"]
+    fit = CrossProducts.from_design(hybrid).fit(columns, center=["YearsOfExperience"])
+
+    X = full[columns].copy()
+    X["YearsOfExperience"] -= X["YearsOfExperience"].mean()
+    ref = sm.OLS(frame["SalaryUSD"], X).fit()
+    np.testing.assert_allclose(fit.params, ref.params, rtol=1e-8)
+    np.testing.assert_allclose(fit.bse, ref.bse, rtol=1e-8)
+    assert fit.centers["YearsOfExperience"] == pytest.approx(full["YearsOfExperience"].mean())
+
+
+def test_dense_frame_matches_hybrid(design):
+    hybrid, full = design
+    a = CrossProducts.from_design(hybrid).fit(full.columns)
+    b = CrossProducts.from_frame(full, hybrid.y).fit(full.columns)
+    np.testing.assert_allclose(a.params, b.params, rtol=1e-9)
+
+
+@pytest.mark.filterwarnings("ignore")
+def test_rank_deficient_design_matches_statsmodels(design, frame):
+    _, full = design
+    X = full.assign(Hours2=2 * full["WorkHours"])
+    fit = CrossProducts.from_frame(X, frame["SalaryUSD"]).fit(X.columns)
+    ref = sm.OLS(frame["SalaryUSD"], X).fit()
+    assert fit.df_resid == ref.df_resid
+    np.testing.assert_allclose(fit.params, ref.params, rtol=1e-6)
+
+
+# ============================================================
+# VIF
+# ============================================================
+def test_vif_matches_statsmodels(design):
+    from statsmodels.stats.outliers_influence import variance_inflation_factor
+
+    hybrid, full = design
+    columns = list(full.columns)
+    report = CrossProducts.from_design(hybrid).vif(columns)
+
+    X = full[columns].to_numpy()
+    expected = [variance_inflation_factor(X, i) for i in range(1, X.shape[1])]
+    assert list(report.table["Variable"]) == columns[1:]
+    np.testing.assert_allclose(report.table["VIF"], expected, rtol=1e-8)
+    np.testing.assert_allclose(report.corr, full[columns[1:]].corr(), atol=1e-10)
+
+
+# ============================================================
+# CROSS-VALIDATION
+# ============================================================
+def test_cross_validation_matches_refits(design):
+    hybrid, full = design
+    columns = ["const", "YearsOfExperience", "WorkHours", "IsFemale", "Region_US", "Industry_mining"]
+    cv = CrossProducts.from_design(hybrid).cross_validate(
+        columns, center=["YearsOfExperience"], k=5, repeats=2, seed=7, workers=2
+    )
+
+    X, y = full[columns].to_numpy(), hybrid.y.to_numpy()
+    rng = np.random.default_rng(7)
+    rows = []
+    for r in range(2):
+        for f, test in enumerate(np.array_split(rng.permutation(len(y)), 5)):
+            train = np.setdiff1d(np.arange(len(y)), test)
+            Xc = X.copy()
+            # Centered on the training rows' mean, as a refit would
+            Xc[:, 1] -= X[train, 1].mean()
+            beta = np.linalg.lstsq(Xc[train], y[train], rcond=None)[0]
+            err = y[test] - Xc[test] @ beta
+            rows.append({
+                "Repeat": r + 1, "Fold": f + 1, "n": len(test),
+                "RMSE": np.sqrt(np.mean(err ** 2)),
+                "MAE": np.mean(np.abs(err)),
+                "R²": 1 - (err @ err) / ((y[test] - y[test].mean()) ** 2).sum(),
+            })
+    pd.testing.assert_frame_equal(cv, pd.DataFrame(rows), check_exact=False, rtol=1e-8)
+
+
+# ============================================================
+# BATCHED SUBGROUP FITS
+# ============================================================
+def _group_reference(full, y, groups, out):
+    # sm.OLS of every group on the columns grouped_ols kept for it
+    for group, rows in out.groupby("Group"):
+        mask = (groups == group).to_numpy()
+        yield rows, sm.OLS(y[mask], full.loc[mask, rows["Variable"]]).fit()
+
+
+def test_grouped_fits_match_statsmodels(design, frame):
+    hybrid, full = design
+    out = grouped_ols(hybrid, frame["Region"])
+
+    # Each region's own dummy has no variation inside it and drops out
+    assert sorted(out["Group"].unique()) == ["Asia", "Canada", "Europe", "US"]
+    assert not ((out["Group"] == "US") & (out["Variable"] == "Region_US")).any()
+    for rows, ref in _group_reference(full, hybrid.y, frame["Region"], out):
+        np.testing.assert_allclose(rows["Coefficient"], ref.params, rtol=1e-7)
+        np.testing.assert_allclose(rows["Std Error"], ref.bse, rtol=1e-7)
+        np.testing.assert_allclose(rows["P-Value"], ref.pvalues, rtol=1e-6, atol=1e-12)
+        assert (rows["Observations"] == ref.nobs).all()
+
+
+@pytest.mark.filterwarnings("ignore")
+def test_grouped_rank_deficient_group(make_design, frame):
+    # In 2015 certification coincides with the mining industry: rank k − 1
+    df = frame.copy()
+    in_2015 = df["SurveyYear"] == 2015
+    df.loc[in_2015, "IsCertified"] = (df.loc[in_2015, "Industry"] == "mining").astype(int)
+    hybrid, full = make_design(df)
+    out = grouped_ols(hybrid, df["SurveyYear"])
+
+    collinear = ["IsCertified", "Industry_mining"]
+    for rows, ref in _group_reference(full, hybrid.y, df["SurveyYear"], out):
+        identified = ~rows["Variable"].isin(collinear).to_numpy()
+        np.testing.assert_allclose(rows["Coefficient"][identified], ref.params[identified], rtol=1e-6)
+        np.testing.assert_allclose(rows["Std Error"][identified], ref.bse[identified], rtol=1e-6)
+        # Same residual dof: the p-values use nobs − rank
+        np.testing.assert_allclose(rows["P-Value"][identified], ref.pvalues[identified], rtol=1e-5, atol=1e-12)
+        np.testing.assert_allclose(full.loc[(df["SurveyYear"] == rows["Group"].iloc[0]).to_numpy(),
+                                            rows["Variable"]] @ rows["Coefficient"].to_numpy(),
+                                   ref.fittedvalues, rtol=1e-6)
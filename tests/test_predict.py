@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+
+from ols_engine import CrossProducts
+from predict import encode_profiles, predict_salary, profile_template
+from salary_models import ENHANCED_SPEC, enhanced_frame
+
+
+@pytest.fixture(scope="module")
+def enhanced(survey):
+    # The Enhanced fit as the model registry stores it
+    design = ENHANCED_SPEC.builder(survey)
+    fit = CrossProducts.from_design(design).fit(design.columns, center=ENHANCED_SPEC.center)
+    fit.levels = design.levels
+    X = pd.concat([design.dense, pd.DataFrame(design.sparse.toarray(), index=design.index,
+                                              columns=design.sparse_names)], axis=1)
+    X["YearsOfExperience"] -= fit.centers["YearsOfExperience"]
+    profiles = enhanced_frame(survey).loc[design.index]
+    return fit, X, design.y, profiles
+
+
+def test_training_profiles_encode_to_the_design(enhanced):
+    fit, X, _, profiles = enhanced
+    np.testing.assert_allclose(encode_profiles(fit, profiles), X.to_numpy(), atol=1e-12)
+
+
+def test_intervals_match_statsmodels(enhanced):
+    fit, X, y, profiles = enhanced
+    ours = predict_salary(fit, profiles.iloc[:50])
+    ref = sm.OLS(y, X).fit().get_prediction(X.iloc[:50]).summary_frame(alpha=0.05)
+    np.testing.assert_allclose(ours["Predicted Salary"], ref["mean"], rtol=1e-8)
+    np.testing.assert_allclose(ours["95% CI Low"], ref["mean_ci_lower"], rtol=1e-8)
+    np.testing.assert_allclose(ours["95% PI High"], ref["obs_ci_upper"], rtol=1e-8)
+
+
+def test_profile_parsing(enhanced):
+    fit = enhanced[0]
+    template = profile_template(fit)
+    base = predict_salary(fit, template)["Predicted Salary"].item()
+
+    text = template.astype(object)
+    text["IsCertified"] = "Yes"
+    text["WorkHours"] = str(template["WorkHours"].item())
+    assert predict_salary(fit, text)["Predicted Salary"].item() == pytest.approx(base)
+
+    blank = template.astype(object).assign(WorkHours="")
+    assert np.isnan(predict_salary(fit, blank)["Predicted Salary"].item())
+    with pytest.raises(ValueError, match="Non-numeric WorkHours"):
+        encode_profiles(fit, template.astype(object).assign(WorkHours="N/A"))
+    with pytest.raises(ValueError, match="Non-numeric IsCertified"):
+        encode_profiles(fit, template.astype(object).assign(IsCertified="maybe"))
+    with pytest.raises(ValueError, match="Unknown Region"):
+        encode_profiles(fit, template.assign(Region="Atlantis"))
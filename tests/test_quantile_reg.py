@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+
+from quantile_reg import quantile_fits
+from salary_models import ENHANCED_SPEC
+
+
+def _check_loss(resid, tau):
+    return np.sum(resid * (tau - (resid < 0)))
+
+
+@pytest.fixture(scope="module")
+def fits(survey):
+    return quantile_fits.__wrapped__(survey, quantiles=(0.25, 0.5, 0.75))
+
+
+@pytest.mark.filterwarnings("ignore")
+@pytest.mark.parametrize("tau", [0.25, 0.5, 0.75])
+def test_close_to_exact_quantile_regression(survey, fits, tau):
+    design = ENHANCED_SPEC.builder(survey)
+    X = pd.concat([design.dense, pd.DataFrame(design.sparse.toarray(), index=design.index,
+                                              columns=design.sparse_names)], axis=1)
+    X["YearsOfExperience"] -= X["YearsOfExperience"].mean()
+    y = design.y
+    exact = sm.QuantReg(y, X).fit(q=tau, max_iter=5000)
+    ours = fits[fits["Quantile"] == tau].set_index("Variable")
+
+    # The smoothed loss is minimized, so the check loss is near (never below) the exact minimum
+    loss, best = _check_loss(y - X @ ours["Coefficient"], tau), _check_loss(exact.resid, tau)
+    assert best - 1e-6 * best <= loss < 1.005 * best
+    # Main effects within a standard error of the exact estimates
+    for var in ("YearsOfExperience", "IsCertified", "IsFemale", "IsManager"):
+        assert abs(ours.loc[var, "Coefficient"] - exact.params[var]) < ours.loc[var, "Std Error"]
+
+
+def test_quantiles_are_sorted_and_converged(fits):
+    assert list(fits["Quantile"].unique()) == [0.25, 0.5, 0.75]
+    assert (fits["Iterations"] < 100).all()
+    assert (fits["Std Error"] > 0).all()
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+import resampling
+from resampling import gap_bootstrap, permutation_test
+
+# The memo would hand a repeated call its earlier result; test the computation
+_gap_bootstrap = gap_bootstrap.__wrapped__
+_permutation_test = permutation_test.__wrapped__
+
+
+# ============================================================
+# BOOTSTRAP
+# ============================================================
+def test_gap_point_estimates(frame):
+    out = _gap_bootstrap(frame, cells=["Region"], n_boot=200)
+    means = frame.groupby(["Region", "IsFemale"])["SalaryUSD"].mean().unstack()
+    expected = (means[1] - means[0]) / means[0] * 100
+    np.testing.assert_allclose(out["Gap %"], expected, rtol=1e-12)
+    assert (out["Men (n)"] + out["Women (n)"]).sum() == len(frame)
+
+
+def test_bootstrap_is_seeded(frame):
+    a = _gap_bootstrap(frame, cells=["Region"], n_boot=300, seed=3)
+    b = _gap_bootstrap(frame, cells=["Region"], n_boot=300, seed=3)
+    c = _gap_bootstrap(frame, cells=["Region"], n_boot=300, seed=4)
+    pd.testing.assert_frame_equal(a, b)
+    assert not np.allclose(a.iloc[:, 3:], c.iloc[:, 3:])
+
+
+def test_bootstrap_does_not_depend_on_workers(frame):
+    # 1000 replicates reach the process pool
+    serial = _gap_bootstrap(frame, cells=["Region"], n_boot=1000, seed=5, workers=1)
+    pooled = _gap_bootstrap(frame, cells=["Region"], n_boot=1000, seed=5, workers=2)
+    assert 2 in resampling._pools
+    pd.testing.assert_frame_equal(serial, pooled)
+
+
+def test_bootstrap_intervals_are_ordered(frame):
+    out = _gap_bootstrap(frame, cells=["Industry"], n_boot=500)
+    for method in ("Percentile", "BCa"):
+        low, high = out[f"95% CI Low ({method})"], out[f"95% CI High ({method})"]
+        assert (low < high).all()
+        assert ((low < out["Gap %"]) & (out["Gap %"] < high)).all()
+
+
+# ============================================================
+# PERMUTATION TESTS
+# ============================================================
+def test_permutation_observed_differences(frame):
+    out = _permutation_test(frame, "IsCertified", by=["Region"], n_perm=200)
+    means = frame.groupby(["Region", "IsCertified"])["SalaryUSD"].mean().unstack()
+    overall = frame.groupby("IsCertified")["SalaryUSD"].mean()
+    expected = list(means[1] - means[0]) + [overall[1] - overall[0]]
+    assert list(out["Segment"]) == ["Asia", "Canada", "Europe", "US", "All"]
+    np.testing.assert_allclose(out["Difference (USD)"], expected, rtol=1e-10)
+
+
+def test_permutation_is_seeded(frame):
+    a = _permutation_test(frame, "IsCertified", by=["Region"], n_perm=500, seed=1)
+    b = _permutation_test(frame, "IsCertified", by=["Region"], n_perm=500, seed=1)
+    pd.testing.assert_frame_equal(a, b)
+    pooled = _permutation_test(frame, "IsCertified", by=["Region"], n_perm=1000, seed=1, workers=2)
+    serial = _permutation_test(frame, "IsCertified", by=["Region"], n_perm=1000, seed=1, workers=1)
+    pd.testing.assert_frame_equal(serial, pooled)
+
+
+def test_permutation_p_values(frame):
+    df = frame.assign(Coin=np.random.default_rng(0).integers(0, 2, len(frame)))
+    real = _permutation_test(df, "IsCertified", n_perm=999)
+    noise = _permutation_test(df, "Coin", n_perm=999)
+    # Certification carries a salary effect; a coin flip does not
+    assert real["p-value"].iloc[0] == 1 / 1000
+    assert noise["p-value"].iloc[0] > 0.05
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+import statsmodels.api as sm
+
+from sensitivity import adjusted_se, bias, partial_r2, robustness_value, treatment_partial_r2
+
+
+@pytest.fixture(scope="module")
+def regressions(design):
+    # Omitting WorkHours from the salary model, and WorkHours as the "confounder"
+    hybrid, X = design
+    y = hybrid.y
+    short = sm.OLS(y, X.drop(columns="WorkHours")).fit()
+    long = sm.OLS(y, X).fit()
+    treatment = sm.OLS(X["IsCertified"], X.drop(columns="IsCertified")).fit()
+    return short, long, treatment
+
+
+def test_bias_of_an_omitted_covariate_is_exact(regressions):
+    short, long, treatment = regressions
+    r2dz = partial_r2(treatment.tvalues["WorkHours"], treatment.df_resid)
+    r2yz = partial_r2(long.tvalues["WorkHours"], long.df_resid)
+
+    d = "IsCertified"
+    assert bias(short.bse[d], short.df_resid, r2dz, r2yz) == pytest.approx(abs(short.params[d] - long.params[d]))
+    assert adjusted_se(short.bse[d], short.df_resid, r2dz, r2yz) == pytest.approx(long.bse[d])
+
+
+def test_robustness_value_explains_away_the_estimate(regressions):
+    short = regressions[0]
+    t, dof = short.tvalues["IsCertified"], short.df_resid
+    rv = robustness_value(t, dof)
+    assert bias(short.bse["IsCertified"], dof, rv, rv) == pytest.approx(abs(short.params["IsCertified"]))
+    assert robustness_value(t, dof, alpha=0.05) < rv
+
+
+def test_treatment_partial_r2_from_the_outcome_fit(regressions):
+    long, treatment = regressions[1], regressions[2]
+    r2 = treatment_partial_r2(long, "IsCertified")
+    expected = partial_r2(treatment.tvalues[r2.index], treatment.df_resid)
+    np.testing.assert_allclose(r2, expected, rtol=1e-8)